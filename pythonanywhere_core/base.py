@@ -1,12 +1,27 @@
+import codecs
 import getpass
+import json
 import os
 import platform
-from typing import Dict
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from urllib.parse import urlparse
 
 import requests
 
 from pythonanywhere_core import __version__
-from pythonanywhere_core.exceptions import AuthenticationError, NoTokenError
+from pythonanywhere_core.exceptions import (
+    AuthenticationError,
+    CircuitOpenError,
+    DeadlineExceededError,
+    NoTokenError,
+    PythonAnywhereApiException,
+)
 
 PYTHON_VERSIONS: Dict[str, str] = {
     "3.6": "python36",
@@ -21,6 +36,409 @@ PYTHON_VERSIONS: Dict[str, str] = {
 }
 
 
+def _json_default(obj: Any) -> str:
+    if isinstance(obj, (date, datetime)):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _default_json_backend():
+    try:
+        import orjson
+    except ImportError:
+        return json.loads, lambda obj: json.dumps(obj, default=_json_default).encode()
+    return orjson.loads, orjson.dumps
+
+
+_json_loads, _json_dumps = _default_json_backend()
+
+
+def set_json_backend(loads: Callable[[bytes], Any], dumps: Callable[[Any], bytes]) -> None:
+    """Sets functions used to decode API responses and encode ``json``
+    request bodies.  By default :mod:`orjson` is used when installed
+    (``pip install pythonanywhere-core[orjson]``), falling back to
+    :mod:`json` from the standard library; both encode dates and
+    datetimes as ISO 8601 strings.
+
+    :param loads: function decoding bytes to Python objects
+    :param dumps: function encoding Python objects to bytes
+    """
+
+    global _json_loads, _json_dumps
+    _json_loads, _json_dumps = loads, dumps
+
+
+def decode_json(response: requests.Response) -> Any:
+    """Decodes JSON body of ``response`` with the configured JSON backend."""
+
+    return _json_loads(response.content)
+
+
+_WHITESPACE = re.compile(r"[ \t\r\n]*")
+_WHITESPACE_AND_COMMAS = re.compile(r"[ \t\r\n,]*")
+
+
+def _iter_json_list_items(chunks: Iterable[bytes], key: Optional[str] = None) -> Iterator[Any]:
+    """Yields items of JSON list streamed as `chunks`, or of the list
+    stored under `key` of a streamed JSON object, decoding one item at a
+    time.  Other members of the object are decoded and skipped.  Raises
+    :exc:`PythonAnywhereApiException` if the stream ends before the list
+    does."""
+
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    state = "list" if key is None else "object"
+    name_of_list = "JSON list" if key is None else f"{key!r} list"
+
+    def decode_next(pos):
+        # a value is only complete once something follows it, otherwise
+        # e.g. a number could continue in the next chunk
+        try:
+            value, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            return None, 0
+        return (value, end) if end < len(buffer) else (None, 0)
+
+    for chunk in chunks:
+        # decoding moves `pos` along the buffer, which is only trimmed
+        # once per chunk, so that items aren't copied over and over
+        buffer += text_decoder.decode(chunk)
+        pos = 0
+        while True:
+            pos = _WHITESPACE.match(buffer, pos).end()
+            if pos == len(buffer):
+                break
+            if state == "object":
+                if buffer[pos] != "{":
+                    raise PythonAnywhereApiException(
+                        f"Expected JSON object with {key!r} list, got {buffer[pos:pos + 20]!r}"
+                    )
+                pos, state = pos + 1, "key"
+            elif state == "key":
+                pos = _WHITESPACE_AND_COMMAS.match(buffer, pos).end()
+                if buffer.startswith("}", pos):
+                    return
+                name, end = decode_next(pos)
+                if not end:
+                    break
+                colon = _WHITESPACE.match(buffer, end).end()
+                if colon < len(buffer) and buffer[colon] != ":":
+                    raise PythonAnywhereApiException(f"Malformed JSON object near {buffer[pos:pos + 20]!r}")
+                if _WHITESPACE.match(buffer, colon + 1).end() >= len(buffer):
+                    break
+                pos = colon + 1
+                state = "list" if name == key else "value"
+            elif state == "value":
+                _, end = decode_next(pos)
+                if not end:
+                    break
+                pos, state = end, "key"
+            elif state == "list":
+                if buffer[pos] != "[":
+                    raise PythonAnywhereApiException(f"Expected {name_of_list}, got {buffer[pos:pos + 20]!r}")
+                pos, state = pos + 1, "items"
+            else:
+                pos = _WHITESPACE_AND_COMMAS.match(buffer, pos).end()
+                if buffer.startswith("]", pos):
+                    return
+                item, end = decode_next(pos)
+                if not end:
+                    break
+                yield item
+                pos = end
+        buffer = buffer[pos:]
+    raise PythonAnywhereApiException(f"Response ended before the end of {name_of_list}")
+
+
+def iter_decode_json(response: requests.Response, key: Optional[str] = None, chunk_size: int = 64 * 1024) -> Iterator[Any]:
+    """Yields items of the JSON list in the body of ``response``, or of
+    the list under ``key`` of a JSON object, decoding one item at a time.
+    Make the request with ``stream=True`` so that the whole body is never
+    held in memory.
+
+    :param response: response with JSON body
+    :param key: name of the member holding the list, if the body is an object
+    :param chunk_size: number of bytes to read from the response at once
+    :raises PythonAnywhereApiException: if the body ends before the list does
+    """
+
+    yield from _iter_json_list_items(response.iter_content(chunk_size=chunk_size), key)
+
+
+_hooks: List[Callable[[str, Dict[str, Any]], None]] = []
+
+
+def add_instrumentation_hook(hook: Callable[[str, Dict[str, Any]], None]) -> None:
+    """Registers `hook` to be called as ``hook(event, info)`` on
+    instrumentation events.  Hooks are called synchronously, from the
+    thread that triggered the event, so they should be quick and must not
+    raise.
+
+    Events:
+        - ``"circuit_state_changed"``: a circuit breaker changed state; ``info``
+          has ``host``, ``flavor``, ``previous`` and ``state`` keys.
+        - ``"archive_upload_failed"``: :meth:`Files.tree_post` fell back to
+          uploading files one by one; ``info`` has ``remote_path`` (of the
+          archive) and ``error`` keys.
+        - ``"archive_delete_failed"``: :meth:`Files.tree_post` couldn't delete
+          the uploaded archive, which is left at ``remote_path``; ``info`` has
+          ``remote_path`` and ``error`` keys.
+    """
+
+    _hooks.append(hook)
+
+
+def remove_instrumentation_hook(hook: Callable[[str, Dict[str, Any]], None]) -> None:
+    """Unregisters `hook` added with :func:`add_instrumentation_hook`."""
+
+    _hooks.remove(hook)
+
+
+def emit_event(event: str, **info: Any) -> None:
+    """Calls hooks registered with :func:`add_instrumentation_hook` with
+    `event` and `info`.
+
+    :param event: name of the event
+    :param info: details of the event passed to hooks as a dictionary
+    """
+    for hook in list(_hooks):
+        hook(event, info)
+
+
+class CircuitBreaker:
+    """Tracks failures of calls to one API endpoint flavor on one host.
+
+    Opens after `failure_threshold` consecutive failures (connection
+    errors, timeouts and other request errors, or 5xx responses); calls fail fast with
+    :exc:`CircuitOpenError` while it's open.  After `recovery_timeout`
+    seconds it half-opens, letting a single probe call through: the
+    breaker closes if it succeeds and opens again if it fails.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        host: str,
+        flavor: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.host = host
+        self.flavor = flavor
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.failures = 0
+        self._clock = clock
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.RLock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == self.OPEN and self._clock() - self._opened_at >= self.recovery_timeout:
+            self._set_state(self.HALF_OPEN)
+        return self._state
+
+    def _set_state(self, state: str) -> None:
+        previous, self._state = self._state, state
+        if state == self.OPEN:
+            self._opened_at = self._clock()
+        if previous != state:
+            emit_event("circuit_state_changed", host=self.host, flavor=self.flavor, previous=previous, state=state)
+
+    def retry_after(self) -> float:
+        """Returns seconds until the breaker half-opens, 0 unless it is open."""
+
+        with self._lock:
+            if self._current_state() != self.OPEN:
+                return 0.0
+            return max(self.recovery_timeout - (self._clock() - self._opened_at), 0.0)
+
+    def before_call(self) -> bool:
+        """Raises :exc:`CircuitOpenError` if the call should not be made.
+
+        :returns: True if the call is the probe of a half-open breaker
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return False
+            if state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+        raise CircuitOpenError(
+            f"Circuit breaker for {self.flavor or 'API'} on {self.host} is open after "
+            f"{self.failures} consecutive failures, not calling API"
+        )
+
+    def cancel_probe(self) -> None:
+        """Lets another probe through after the probe call ended without
+        a success or failure being recorded (e.g. it was interrupted)."""
+
+        with self._lock:
+            self._probing = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self._probing = False
+            self._set_state(self.CLOSED)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self._probing or self.failures >= self.failure_threshold:
+                self._set_state(self.OPEN)
+            self._probing = False
+
+
+CIRCUIT_BREAKER_FAILURE_THRESHOLD = 5
+CIRCUIT_BREAKER_RECOVERY_TIMEOUT = 30.0
+
+_circuit_breakers: Dict[Tuple[str, str], CircuitBreaker] = {}
+_circuit_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(url: str) -> CircuitBreaker:
+    """Returns circuit breaker for host and API flavor (``files``,
+    ``webapps``, ``schedule``...) of `url`."""
+
+    parsed = urlparse(url)
+    parts = parsed.path.split("/")
+    flavor = parts[5] if len(parts) > 5 and parts[1] == "api" and parts[3] == "user" else ""
+    key = (parsed.netloc, flavor)
+    with _circuit_breakers_lock:
+        if key not in _circuit_breakers:
+            _circuit_breakers[key] = CircuitBreaker(
+                parsed.netloc,
+                flavor,
+                failure_threshold=CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+                recovery_timeout=CIRCUIT_BREAKER_RECOVERY_TIMEOUT,
+            )
+        return _circuit_breakers[key]
+
+
+def circuit_breaker_states() -> Dict[Tuple[str, str], str]:
+    """Returns states of circuit breakers keyed by (host, flavor)."""
+
+    with _circuit_breakers_lock:
+        breakers = dict(_circuit_breakers)
+    return {key: breaker.state for key, breaker in breakers.items()}
+
+
+def reset_circuit_breakers() -> None:
+    """Forgets all circuit breakers, closing them."""
+
+    with _circuit_breakers_lock:
+        _circuit_breakers.clear()
+
+
+DEFAULT_TIMEOUT: Tuple[float, float] = (10.0, 60.0)
+
+Timeout = Union[None, float, Tuple[float, float]]
+
+
+def get_default_timeout() -> Tuple[float, float]:
+    """Returns (connect, read) timeout in seconds used by :func:`call_api`
+    when no timeout is given.  Taken from ``PYTHONANYWHERE_API_TIMEOUT``
+    environment variable (``"read"`` or ``"connect,read"``), falling back
+    to :data:`DEFAULT_TIMEOUT`."""
+
+    value = os.environ.get("PYTHONANYWHERE_API_TIMEOUT")
+    if not value:
+        return DEFAULT_TIMEOUT
+    parts = [float(part) for part in value.split(",")]
+    return (parts[0], parts[-1]) if len(parts) > 1 else (DEFAULT_TIMEOUT[0], parts[0])
+
+
+class Deadline:
+    """Point in time by which an operation has to finish."""
+
+    def __init__(self, seconds: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self.expires_at = clock() + seconds
+
+    def remaining(self) -> float:
+        """Returns seconds left, negative once the deadline has passed."""
+
+        return self.expires_at - self._clock()
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+
+_current_deadline: ContextVar[Optional[Deadline]] = ContextVar("pythonanywhere_deadline", default=None)
+
+
+@contextmanager
+def deadline(seconds: float) -> Iterator[Deadline]:
+    """Limits total time of all API calls made inside the ``with`` block.
+
+    Every :func:`call_api` call inside the block gets its timeouts clamped
+    to the time left and raises :exc:`DeadlineExceededError` without
+    calling the API once it's up, so an operation made of many calls
+    (e.g. :meth:`Webapp.create` or :meth:`Files.tree_post`) respects an
+    overall budget.  Nested deadlines can only make it shorter.  Bulk
+    operations (see :mod:`bulk`) propagate it to their worker threads.
+
+    :param seconds: time budget in seconds
+    """
+
+    new = Deadline(seconds)
+    outer = _current_deadline.get()
+    if outer is not None and outer.expires_at < new.expires_at:
+        new = outer
+    token = _current_deadline.set(new)
+    try:
+        yield new
+    finally:
+        _current_deadline.reset(token)
+
+
+_response_observer: ContextVar[Optional[Callable[[Optional[int], float], None]]] = ContextVar(
+    "pythonanywhere_response_observer", default=None
+)
+
+
+@contextmanager
+def observe_responses(observer: Callable[[Optional[int], float], None]) -> Iterator[None]:
+    """Calls ``observer(status_code, elapsed_seconds)`` after every
+    :func:`call_api` call made inside the ``with`` block (in the current
+    context only).  ``status_code`` is None when the request failed
+    without a response."""
+
+    token = _response_observer.set(observer)
+    try:
+        yield
+    finally:
+        _response_observer.reset(token)
+
+
+def _effective_timeout(timeout: Timeout, url: str) -> Tuple[float, float]:
+    if timeout is None:
+        timeout = get_default_timeout()
+    elif not isinstance(timeout, tuple):
+        timeout = (timeout, timeout)
+    current = _current_deadline.get()
+    if current is None:
+        return timeout
+    remaining = current.remaining()
+    if remaining <= 0:
+        raise DeadlineExceededError(f"Deadline exceeded before calling {url}")
+    return (min(timeout[0], remaining), min(timeout[1], remaining))
+
+
 def get_username() -> str:
     """Returns PythonAnywhere username from ``PYTHONANYWHERE_USERNAME``
     environment variable, falling back to :func:`getpass.getuser`."""
@@ -55,16 +473,25 @@ def helpful_token_error_message() -> str:
         )
 
 
-def call_api(url: str, method: str, **kwargs) -> requests.Response:
+def call_api(
+    url: str, method: str, timeout: Timeout = None, **kwargs
+) -> requests.Response:
     """Calls PythonAnywhere API with given url and method.
 
     :param url: url to call
     :param method: HTTP method to use
-    :param kwargs: additional keyword arguments to pass to requests.request
+    :param timeout: connect and read timeout in seconds, or a (connect, read)
+        tuple; defaults to :func:`get_default_timeout`.  Clamped to the time
+        left when called inside a :func:`deadline` block
+    :param kwargs: additional keyword arguments to pass to requests.request;
+        ``json`` is encoded with the configured JSON backend
     :returns: requests.Response object
 
     :raises AuthenticationError: if API returns 401
     :raises NoTokenError: if API_TOKEN environment variable is not set
+    :raises CircuitOpenError: if recent calls to the same host and API
+        flavor kept failing, see :class:`CircuitBreaker`
+    :raises DeadlineExceededError: if the current :func:`deadline` has passed
 
     Client identification can be provided via PYTHONANYWHERE_CLIENT environment
     variable (e.g., "pa/1.0.0" or "mcp-server/0.5.0") to help with usage analytics.
@@ -86,15 +513,43 @@ def call_api(url: str, method: str, **kwargs) -> requests.Response:
         "Authorization": f"Token {token}",
         "User-Agent": user_agent
     }
+    if kwargs.get("json") is not None:
+        kwargs["data"] = _json_dumps(kwargs.pop("json"))
+        headers["Content-Type"] = "application/json"
     if "headers" in kwargs:
         headers.update(kwargs.pop("headers"))
 
-    response = requests.request(
-        method=method,
-        url=url,
-        headers=headers,
-        **kwargs,
-    )
+    timeout = _effective_timeout(timeout, url)
+    breaker = get_circuit_breaker(url)
+    probe = breaker.before_call()
+    recorded = False
+    observer = _response_observer.get()
+    started = time.monotonic()
+    try:
+        try:
+            response = requests.request(
+                method=method,
+                url=url,
+                headers=headers,
+                timeout=timeout,
+                **kwargs,
+            )
+        except requests.RequestException:
+            breaker.record_failure()
+            recorded = True
+            if observer is not None:
+                observer(None, time.monotonic() - started)
+            raise
+        if response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        recorded = True
+    finally:
+        if probe and not recorded:
+            breaker.cancel_probe()
+    if observer is not None:
+        observer(response.status_code, time.monotonic() - started)
     if response.status_code == 401:
         print(response, response.text)
         raise AuthenticationError(f"Authentication error {response.status_code} calling API: {response.text}")
@@ -0,0 +1,272 @@
+import contextvars
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, Optional, Sequence, TypeVar
+
+from pythonanywhere_core.base import observe_responses
+from pythonanywhere_core.journal import OperationJournal
+
+K = TypeVar("K", bound=Hashable)
+
+DEFAULT_MAX_WORKERS = 8
+
+DEFAULT_QUEUE_SIZE = 16
+
+THROTTLING_STATUS_CODES = (429, 503)
+
+
+class AdaptiveConcurrencyLimiter:
+    """Limits number of concurrent calls using AIMD (additive increase,
+    multiplicative decrease).
+
+    The limit grows by roughly one for every `limit` healthy API responses
+    and is multiplied by `backoff` when the API throttles (429 or 503),
+    fails (other 5xx or no response) or, if `latency_threshold` is set,
+    responds slower than that.  It backs off at most once per epoch:
+    unhealthy responses to calls which were already in flight when the
+    limit was last decreased don't decrease it again, so a burst of
+    throttled concurrent calls only halves it once.
+
+    :param initial: starting limit
+    :param minimum: the limit never goes below that
+    :param maximum: the limit never goes above that
+    :param backoff: factor applied to the limit on unhealthy responses
+    :param latency_threshold: seconds above which a response counts as unhealthy
+    """
+
+    def __init__(
+        self,
+        initial: float = 2,
+        minimum: float = 1,
+        maximum: float = DEFAULT_MAX_WORKERS,
+        backoff: float = 0.5,
+        latency_threshold: Optional[float] = None,
+    ) -> None:
+        self.minimum = minimum
+        self.maximum = maximum
+        self.backoff = backoff
+        self.latency_threshold = latency_threshold
+        self._limit = max(minimum, min(initial, maximum))
+        self._in_flight = 0
+        self._responses_to_ignore = 0
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def acquire(self) -> None:
+        """Blocks until a call is allowed to start."""
+
+        with self._condition:
+            while self._in_flight >= int(self._limit):
+                self._condition.wait()
+            self._in_flight += 1
+
+    def release(self) -> None:
+        """Marks a call started with :meth:`acquire` as finished."""
+
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+    def record(self, status_code: Optional[int], elapsed: float) -> None:
+        """Adjusts the limit after an API response.
+
+        :param status_code: response status code, None if there was no response
+        :param elapsed: seconds the call took
+        """
+        unhealthy = (
+            status_code is None
+            or status_code in THROTTLING_STATUS_CODES
+            or status_code >= 500
+            or (self.latency_threshold is not None and elapsed > self.latency_threshold)
+        )
+        with self._condition:
+            previous_epoch = self._responses_to_ignore > 0
+            if previous_epoch:
+                self._responses_to_ignore -= 1
+            if unhealthy:
+                if not previous_epoch:
+                    self._limit = max(self.minimum, self._limit * self.backoff)
+                    self._responses_to_ignore = max(self._in_flight - 1, 0)
+            else:
+                self._limit = min(self.maximum, self._limit + 1 / self._limit)
+            self._condition.notify_all()
+
+
+def call_limited(limiter: AdaptiveConcurrencyLimiter, func: Callable[..., Any], *args: Any) -> Any:
+    """Calls ``func(*args)`` once `limiter` allows another call to start,
+    feeding it every API response made by ``func``.
+
+    :param limiter: limiter gating the call
+    :param func: callable to call
+    :returns: value returned by ``func``
+    """
+    limiter.acquire()
+    try:
+        with observe_responses(limiter.record):
+            return func(*args)
+    finally:
+        limiter.release()
+
+
+def run_bulk(
+    func: Callable[[K], Any],
+    items: Iterable[K],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+    journal: Optional[OperationJournal] = None,
+    journal_key: Optional[Callable[[K], Hashable]] = None,
+) -> Dict[K, Any]:
+    """Calls ``func`` for every item in ``items`` using a bounded pool of threads.
+
+    Failures don't stop the remaining calls -- exceptions raised by ``func``
+    are caught and returned in place of the result, so callers can report
+    partial failures.  Calls run in a copy of the caller's context, so a
+    surrounding :func:`base.deadline` applies to them too.
+
+    Concurrency adapts to how the API copes: calls are gated by
+    ``limiter``, which is fed with every API response made by ``func``.
+
+    With a ``journal``, items it has recorded as done are skipped (and
+    left out of the result) and every successful item is recorded, so an
+    interrupted run can be resumed by calling it again.  Items are
+    recorded as themselves or, with ``journal_key``, as the key it returns
+    (e.g. to include what is done to the item).
+
+    :param func: callable taking a single item
+    :param items: hashable items to process, each one is used as a key in the result
+    :param max_workers: maximum number of concurrent calls
+    :param limiter: limiter to use, defaults to a new
+        :class:`AdaptiveConcurrencyLimiter` with ``max_workers`` maximum
+    :param journal: :class:`~pythonanywhere_core.journal.OperationJournal`
+        of completed items
+    :param journal_key: callable returning the journal key of an item
+    :returns: dictionary mapping each item to the value returned by ``func``
+        or the exception it raised
+    """
+    journal_key = journal_key or (lambda item: item)
+    items = list(items) if journal is None else [item for item in items if not journal.is_done(journal_key(item))]
+    results = {}
+    if not items:
+        return results
+    limiter = limiter or AdaptiveConcurrencyLimiter(maximum=max_workers)
+
+    def call(item):
+        result = call_limited(limiter, func, item)
+        if journal is not None:
+            journal.record(journal_key(item))
+        return result
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        futures = {item: executor.submit(contextvars.copy_context().run, call, item) for item in items}
+        for item, future in futures.items():
+            try:
+                results[item] = future.result()
+            except Exception as e:
+                results[item] = e
+    return results
+
+
+def failures(results: Dict[K, Any]) -> Dict[K, Exception]:
+    """Returns only the failed entries of a :func:`run_bulk` result."""
+
+    return {key: value for key, value in results.items() if isinstance(value, Exception)}
+
+
+_DONE = object()
+
+
+class _Failure:
+    def __init__(self, error: BaseException) -> None:
+        self.error = error
+
+
+def iter_pipeline(
+    source: Iterable[Any], stages: Sequence[Callable[[Any], Any]], queue_size: int = DEFAULT_QUEUE_SIZE
+) -> Iterator[Any]:
+    """Streams items of `source` through `stages`, each running in its own
+    thread and connected to the next one by a queue of at most
+    `queue_size` items, so that the stages overlap while memory stays
+    bounded.
+
+    Iterating `source` happens in a thread too; the caller consumes
+    results of the last stage (in order) in its own thread.  An exception
+    raised by `source` or a stage is re-raised to the caller.  Closing the
+    iterator early stops all the threads.
+
+    :param source: iterable of items to process
+    :param stages: callables each taking an item and returning the item
+        for the next stage
+    :param queue_size: maximum number of items waiting between stages
+    :returns: iterator of items returned by the last stage
+    """
+    stop = threading.Event()
+    queues = [queue.Queue(maxsize=queue_size) for _ in range(len(stages) + 1)]
+
+    def put(target: queue.Queue, item: Any) -> bool:
+        while not stop.is_set():
+            try:
+                target.put(item, timeout=0.05)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def get(source_queue: queue.Queue) -> Any:
+        while not stop.is_set():
+            try:
+                return source_queue.get(timeout=0.05)
+            except queue.Empty:
+                pass
+        return _DONE
+
+    def produce() -> None:
+        try:
+            for item in source:
+                if not put(queues[0], item):
+                    return
+        except BaseException as e:
+            put(queues[0], _Failure(e))
+            return
+        put(queues[0], _DONE)
+
+    def work(stage: Callable[[Any], Any], input_queue: queue.Queue, output_queue: queue.Queue) -> None:
+        while True:
+            item = get(input_queue)
+            if item is _DONE or isinstance(item, _Failure):
+                put(output_queue, item)
+                return
+            try:
+                item = stage(item)
+            except BaseException as e:
+                put(output_queue, _Failure(e))
+                return
+            if not put(output_queue, item):
+                return
+
+    threads = [threading.Thread(target=contextvars.copy_context().run, args=(produce,), daemon=True)]
+    for position, stage in enumerate(stages):
+        threads.append(
+            threading.Thread(
+                target=contextvars.copy_context().run,
+                args=(work, stage, queues[position], queues[position + 1]),
+                daemon=True,
+            )
+        )
+    for thread in threads:
+        thread.start()
+    try:
+        while True:
+            item = queues[-1].get()
+            if item is _DONE:
+                return
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from pythonanywhere_core.bulk import DEFAULT_MAX_WORKERS, run_bulk
+from pythonanywhere_core.exceptions import PythonAnywhereApiException
+from pythonanywhere_core.webapp import Webapp
+from pythonanywhere_core.website import Website
+
+
+def _days_left(not_after: datetime, now: datetime) -> float:
+    if not_after.tzinfo is None:
+        not_after = not_after.replace(tzinfo=timezone.utc)
+    return (not_after - now).total_seconds() / 86400
+
+
+def scan_ssl_expiry(
+    within_days: float = 30,
+    renew_below_days: Optional[float] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    now: Optional[datetime] = None,
+) -> list[dict[str, Any]]:
+    """Checks SSL certificates of all webapps and websites of the current user.
+
+    Lists webapps and websites, then fetches SSL info for every domain
+    concurrently.  Websites whose certificates expire in fewer than
+    ``renew_below_days`` days get a new Let's Encrypt certificate via
+    :meth:`Website.auto_ssl`.
+
+    :param within_days: only report certificates expiring within that many days
+    :param renew_below_days: if set, call :meth:`Website.auto_ssl` for websites
+        with fewer days left than that
+    :param max_workers: maximum number of concurrent API calls
+    :param now: time to compute days left from, defaults to current UTC time
+    :returns: list of dictionaries with ``domain``, ``kind`` (``"webapp"`` or
+        ``"website"``), ``not_after``, ``days_left`` and ``error`` keys (plus
+        ``renewal`` and ``renewal_error`` for websites due for renewal) sorted
+        by expiry, soonest first; domains that could not be checked are
+        reported last with the exception in ``error``, failed renewals have
+        ``renewal`` set to ``None`` and the exception in ``renewal_error``
+
+    :raises PythonAnywhereApiException: if webapps or websites can't be listed
+    """
+    now = now or datetime.now(timezone.utc)
+    website = Website()
+    targets = [("webapp", info["domain_name"]) for info in Webapp.list_webapps()]
+    websites = website.list()
+    if not isinstance(websites, list):
+        raise PythonAnywhereApiException(f"Listing websites via API failed, got {websites!r}")
+    targets += [("website", info["domain_name"]) for info in websites]
+
+    def fetch(target):
+        kind, domain = target
+        if kind == "webapp":
+            return Webapp(domain).get_ssl_info()["not_after"]
+        return website.get_ssl_info(domain)["not_after"]
+
+    report = []
+    for (kind, domain), not_after in run_bulk(fetch, targets, max_workers=max_workers).items():
+        if isinstance(not_after, Exception):
+            report.append({"domain": domain, "kind": kind, "not_after": None, "days_left": None, "error": not_after})
+            continue
+        days_left = _days_left(not_after, now)
+        if days_left < within_days:
+            report.append({"domain": domain, "kind": kind, "not_after": not_after, "days_left": days_left, "error": None})
+
+    if renew_below_days is not None:
+        to_renew = [
+            entry["domain"]
+            for entry in report
+            if entry["kind"] == "website" and entry["error"] is None and entry["days_left"] < renew_below_days
+        ]
+        renewals = run_bulk(website.auto_ssl, to_renew, max_workers=max_workers)
+        for entry in report:
+            if entry["kind"] == "website" and entry["domain"] in renewals:
+                renewal = renewals[entry["domain"]]
+                if isinstance(renewal, Exception):
+                    entry["renewal"], entry["renewal_error"] = None, renewal
+                else:
+                    entry["renewal"], entry["renewal_error"] = renewal, None
+
+    report.sort(key=lambda entry: (entry["days_left"] is None, entry["days_left"] or 0))
+    return report
@@ -0,0 +1,104 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import List, Union
+
+
+def content_digest(content: bytes) -> str:
+    """Returns hex SHA-256 digest of `content`."""
+
+    return hashlib.sha256(content).hexdigest()
+
+
+class ContentCache:
+    """Persistent record of contents uploaded to remote paths.
+
+    Maps each remote path to the SHA-256 digest and size of the contents
+    last uploaded there (by this cache's users), so uploads of unchanged
+    contents can be skipped, see the `cache` parameter of
+    :meth:`Files.path_post` and :meth:`Files.tree_post`.  Changes made to
+    remote files by other means are not noticed; :meth:`forget` paths
+    changed elsewhere.
+
+    Methods:
+        - :meth:`ContentCache.is_current`: Check whether a remote path already has given contents.
+        - :meth:`ContentCache.record`: Record contents uploaded to a remote path.
+        - :meth:`ContentCache.forget`: Drop records of a remote path and paths below it.
+        - :meth:`ContentCache.locations`: Get remote paths known to have given contents.
+        - :meth:`ContentCache.record_skipped`: Count bytes not sent thanks to the cache.
+
+    Attributes:
+        - ``bytes_saved``: bytes not sent since the cache was opened
+        - ``files_skipped``: uploads skipped since the cache was opened
+
+    :param path: path of the SQLite database, in memory by default
+    """
+
+    def __init__(self, path: Union[str, Path] = ":memory:") -> None:
+        self.bytes_saved = 0
+        self.files_skipped = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        with self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS uploads ("
+                "remote_path TEXT PRIMARY KEY, digest TEXT NOT NULL, size INTEGER NOT NULL, uploaded_at REAL NOT NULL"
+                ") WITHOUT ROWID"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS uploads_digest ON uploads (digest)")
+
+    def __enter__(self) -> "ContentCache":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Closes the database."""
+
+        with self._lock:
+            self._db.close()
+
+    def is_current(self, remote_path: str, digest: str) -> bool:
+        """Returns True if contents with `digest` were the last ones
+        uploaded to `remote_path`."""
+
+        with self._lock:
+            row = self._db.execute("SELECT digest FROM uploads WHERE remote_path = ?", (remote_path,)).fetchone()
+        return row is not None and row[0] == digest
+
+    def record(self, remote_path: str, digest: str, size: int) -> None:
+        """Records contents with `digest` and `size` as uploaded to `remote_path`."""
+
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO uploads VALUES (?, ?, ?, ?)", (remote_path, digest, size, time.time())
+            )
+
+    def forget(self, remote_path: str) -> None:
+        """Drops records of `remote_path` and of paths below it."""
+
+        remote_path = remote_path.rstrip("/")
+        with self._lock, self._db:
+            self._db.execute(
+                "DELETE FROM uploads WHERE remote_path = ? OR substr(remote_path, 1, ?) = ?",
+                (remote_path, len(remote_path) + 1, f"{remote_path}/"),
+            )
+
+    def locations(self, digest: str) -> List[str]:
+        """Returns sorted remote paths known to have contents with `digest`."""
+
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT remote_path FROM uploads WHERE digest = ? ORDER BY remote_path", (digest,)
+            ).fetchall()
+        return [remote_path for remote_path, in rows]
+
+    def record_skipped(self, size: int) -> None:
+        """Adds an upload of `size` bytes to ``bytes_saved`` and ``files_skipped``."""
+
+        with self._lock:
+            self.bytes_saved += size
+            self.files_skipped += 1
@@ -18,6 +18,14 @@ class DomainAlreadyExistsException(PythonAnywhereApiException):
     pass
 
 
+class CircuitOpenError(PythonAnywhereApiException):
+    pass
+
+
+class DeadlineExceededError(PythonAnywhereApiException):
+    pass
+
+
 class MissingCNAMEException(PythonAnywhereApiException):
     def __init__(self):
         super().__init__(
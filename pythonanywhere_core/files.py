@@ -1,11 +1,126 @@
+import contextvars
+import os
+import posixpath
+import shlex
+import tarfile
+import tempfile
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from contextlib import closing
 from pathlib import Path
-from typing import Tuple, Union
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 from urllib.parse import urljoin
 
+import requests
 from requests.models import Response
 
-from pythonanywhere_core.base import call_api, get_api_endpoint, get_username
-from pythonanywhere_core.exceptions import PythonAnywhereApiException
+from pythonanywhere_core.base import (
+    Timeout,
+    call_api,
+    decode_json,
+    emit_event,
+    get_api_endpoint,
+    get_circuit_breaker,
+    get_username,
+    iter_decode_json,
+)
+from pythonanywhere_core.bulk import (
+    DEFAULT_MAX_WORKERS,
+    DEFAULT_QUEUE_SIZE,
+    AdaptiveConcurrencyLimiter,
+    call_limited,
+    failures,
+    iter_pipeline,
+    run_bulk,
+)
+from pythonanywhere_core.content_cache import ContentCache, content_digest
+from pythonanywhere_core.exceptions import (
+    CircuitOpenError,
+    DeadlineExceededError,
+    NoTokenError,
+    PythonAnywhereApiException,
+)
+from pythonanywhere_core.hashing import HashCache, iter_hashes
+from pythonanywhere_core.ignore import IgnoreRules, walk
+from pythonanywhere_core.journal import OperationJournal
+from pythonanywhere_core.models import TreeEntry
+
+
+def _content_range_size(content_range: Optional[str]) -> Optional[int]:
+    """Returns total size from a ``Content-Range`` header value like
+    ``bytes 0-99/1234`` or ``bytes */1234``."""
+
+    if not content_range or "/" not in content_range:
+        return None
+    total = content_range.rsplit("/", 1)[1].strip()
+    return int(total) if total.isdigit() else None
+
+
+def _journal_key(remote_path: str, local_path: str, is_dir: bool) -> tuple:
+    """Returns :class:`OperationJournal` key of uploading `local_path` to
+    `remote_path`, which changes when the local file does."""
+
+    if is_dir:
+        return (remote_path,)
+    stat = os.stat(local_path)
+    return remote_path, stat.st_size, stat.st_mtime_ns
+
+
+class _MultipartFileBody:
+    """``multipart/form-data`` request body with a single file field,
+    streamed from a seekable binary file object."""
+
+    def __init__(self, name: str, fileobj: BinaryIO, chunk_size: int = 1024 * 1024) -> None:
+        boundary = uuid.uuid4().hex
+        self.content_type = f"multipart/form-data; boundary={boundary}"
+        filename = os.path.basename(fileobj.name) if isinstance(getattr(fileobj, "name", None), str) else name
+        # percent-encoded as in the WHATWG HTML standard (and by urllib3 for
+        # ``files=``), so that a quote or a line break can't end the header
+        filename = filename.replace('"', "%22").replace("\r", "%0D").replace("\n", "%0A")
+        self._head = (
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; filename="{filename}"\r\n\r\n'
+        ).encode()
+        self._tail = f"\r\n--{boundary}--\r\n".encode()
+        start = fileobj.tell()
+        self._length = fileobj.seek(0, os.SEEK_END) - start
+        fileobj.seek(start)
+        self._chunks = self._iter_chunks(fileobj, chunk_size)
+        self._current = b""
+        self._position = 0
+
+    def _iter_chunks(self, fileobj: BinaryIO, chunk_size: int) -> Iterator[bytes]:
+        yield self._head
+        yield from iter(lambda: fileobj.read(chunk_size), b"")
+        yield self._tail
+
+    def __len__(self) -> int:
+        return len(self._head) + self._length + len(self._tail)
+
+    def __iter__(self) -> Iterator[bytes]:
+        return self._chunks
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            data = b"".join([self._current[self._position:], *self._chunks])
+            self._current, self._position = b"", 0
+            return data
+        while self._position >= len(self._current):
+            self._current, self._position = next(self._chunks, None), 0
+            if self._current is None:
+                self._current = b""
+                return b""
+        data = self._current[self._position:self._position + size]
+        self._position += len(data)
+        return data
+
+
+def unpack_command(archive_path: str, dest_dir_path: str) -> str:
+    """Returns shell command unpacking ``.tar.gz`` archive at
+    `archive_path` into `dest_dir_path`, for use in an `unpack` hook of
+    :meth:`Files.tree_post` (e.g. run in a console or an always-on task)."""
+
+    return f"tar -xzf {shlex.quote(archive_path)} -C {shlex.quote(dest_dir_path)}"
 
 
 class Files:
@@ -24,8 +139,12 @@ class Files:
 
     Path Methods:
         - :meth:`Files.path_get`: Retrieve the contents of a file or directory from a specified `path`.
+        - :meth:`Files.path_get_range`: Retrieve a byte range of contents of a file at a specified `path`.
+        - :meth:`Files.path_get_range_with_size`: Retrieve a byte range and the size of a file at a specified `path`.
+        - :meth:`Files.path_download`: Download a file at a specified `path` to a local file, resuming after failures.
         - :meth:`Files.path_post`: Upload or update a file at the given `dest_path` using contents from `source`.
         - :meth:`Files.path_delete`: Delete a file or directory at the specified `path`.
+        - :meth:`Files.dirs_post`: Create empty directories which don't exist yet.
 
     Sharing Methods:
         - :meth:`Files.sharing_post`: Enable sharing of a file from the given `path` (if not already shared) and get a link to it.
@@ -35,6 +154,9 @@ class Files:
     Tree Method:
         - :meth:`Files.tree_get`: Retrieve a list of regular files and subdirectories of a directory at the specified `path`
           (limited to 1000 results).
+        - :meth:`Files.iter_tree`: Iterate over the same listing as :class:`~pythonanywhere_core.models.TreeEntry` models.
+
+    :param timeout: timeout of API calls, see :func:`~pythonanywhere_core.base.call_api`
     """
 
 
@@ -43,11 +165,14 @@ class Files:
     sharing_endpoint = urljoin(base_url, "sharing/")
     tree_endpoint = urljoin(base_url, "tree/")
 
+    def __init__(self, timeout: Timeout = None) -> None:
+        self.timeout = timeout
+
     def _error_msg(self, result: Response)  -> str:
         """TODO: error responses should be unified at the API side """
 
         if "application/json" in result.headers.get("content-type", ""):
-            jsn = result.json()
+            jsn = decode_json(result)
             msg = jsn.get("detail") or jsn.get("message") or jsn.get("error", "")
             return f": {msg}"
         return ""
@@ -64,18 +189,172 @@ class Files:
 
         url = f"{self.path_endpoint}{path}"
 
-        result = call_api(url, "GET")
+        result = call_api(url, "GET", timeout=self.timeout)
 
         if result.status_code == 200:
             if "application/json" in result.headers.get("content-type", ""):
-                return result.json()
+                return decode_json(result)
             return result.content
 
         raise PythonAnywhereApiException(
             f"GET to fetch contents of {url} failed, got {result}{self._error_msg(result)}"
         )
 
-    def path_post(self, dest_path: str, content: bytes) -> int:
+    def path_get_range(self, path: str, offset: int = 0, length: Optional[int] = None) -> bytes:
+        """Returns up to `length` bytes (all remaining ones if None) of
+        contents of file at `path` starting at byte `offset`, fetching only
+        that range.  Negative `offset` counts from the end of the file, so
+        ``path_get_range(path, -4096)`` returns the last 4 KiB.  Returns
+        fewer bytes (or none) at the end of the file.  Raises when `path`
+        is invalid or unavailable."""
+
+        return self.path_get_range_with_size(path, offset, length)[0]
+
+    def path_get_range_with_size(
+        self, path: str, offset: int = 0, length: Optional[int] = None
+    ) -> Tuple[bytes, Optional[int]]:
+        """Same as :meth:`path_get_range`, but also returns size of the
+        whole file, taken from the ``Content-Range`` header of the response.
+
+        :returns: tuple of the requested bytes and the size of the file,
+            None if the API didn't report it (or `length` is not positive)
+        """
+
+        url = f"{self.path_endpoint}{path}"
+        if length is not None and length <= 0:
+            return b"", None
+        if offset < 0:
+            byte_range = f"bytes={offset}"
+        else:
+            byte_range = f"bytes={offset}-{'' if length is None else offset + length - 1}"
+
+        result = call_api(url, "GET", headers={"Range": byte_range}, timeout=self.timeout)
+
+        if result.status_code == 206:
+            content, size = result.content, _content_range_size(result.headers.get("content-range"))
+        elif result.status_code == 200:
+            content, size = result.content, len(result.content)
+            content = content[offset:] if offset < 0 else content[offset:None if length is None else offset + length]
+        elif result.status_code == 416:
+            content, size = b"", _content_range_size(result.headers.get("content-range"))
+        else:
+            raise PythonAnywhereApiException(
+                f"GET to fetch {byte_range} of {url} failed, got {result}{self._error_msg(result)}"
+            )
+        if offset < 0 and length is not None:
+            content = content[:length]
+        return content, size
+
+    def path_download(
+        self,
+        path: str,
+        local_path: Union[str, Path],
+        chunk_size: int = 1024 * 1024,
+        max_retries: int = 5,
+        retry_delay: float = 1.0,
+    ) -> int:
+        """Downloads contents of file at `path` to `local_path`.
+
+        The response is streamed to ``<local_path>.part``; when the
+        connection fails (or the API returns a server error) the download
+        resumes from the bytes already received with a range request,
+        waiting `retry_delay` seconds (doubled on each consecutive failure)
+        before up to `max_retries` retries in a row.  When the circuit
+        breaker of the files API is open (see
+        :class:`~pythonanywhere_core.base.CircuitBreaker`) it waits until
+        the breaker lets a probe call through instead, without using up a
+        retry.  Once the size
+        reported by the API has been received the partial file is renamed
+        to `local_path`, replacing it atomically.  If the download fails
+        the partial file is kept, and calling this method again resumes
+        it -- provided the remote file hasn't changed in the meantime.
+
+        :param path: absolute path of the remote file
+        :param local_path: path of the local file to write
+        :param chunk_size: number of bytes to read from the response at once
+        :param max_retries: number of consecutive failed attempts to retry
+        :param retry_delay: seconds to wait before the first retry
+        :returns: number of bytes downloaded
+        :raises PythonAnywhereApiException: if `path` is invalid or
+            unavailable, or the download keeps failing
+        """
+        url = f"{self.path_endpoint}{path}"
+        local_path = Path(local_path)
+        part_path = local_path.with_name(f"{local_path.name}.part")
+        received = part_path.stat().st_size if part_path.exists() else 0
+        size = None
+        failures = 0
+        breaker = get_circuit_breaker(url)
+
+        def failed(reason):
+            nonlocal failures
+            failures += 1
+            if failures > max_retries:
+                raise PythonAnywhereApiException(
+                    f"GET to download {url} failed after {received} bytes and {max_retries} retries: {reason}"
+                )
+            time.sleep(retry_delay * 2 ** (failures - 1))
+
+        while size is None or received < size:
+            try:
+                result = call_api(
+                    url, "GET", headers={"Range": f"bytes={received}-"}, stream=True, timeout=self.timeout
+                )
+            except CircuitOpenError:
+                time.sleep(max(breaker.retry_after(), retry_delay))
+                continue
+            except requests.RequestException as e:
+                failed(e)
+                continue
+            with result:
+                if result.status_code == 416:
+                    size = _content_range_size(result.headers.get("content-range"))
+                    if size == received:
+                        # an empty file has nothing to range over, so it
+                        # ends up here without a partial file written
+                        part_path.touch()
+                        break
+                    received, size = 0, None
+                    part_path.unlink(missing_ok=True)
+                    failed(f"got {result} resuming partial download")
+                    continue
+                if result.status_code == 206:
+                    size = _content_range_size(result.headers.get("content-range"))
+                elif result.status_code == 200:
+                    received = 0
+                    length = result.headers.get("content-length")
+                    identity = "content-encoding" not in result.headers
+                    size = int(length) if length and length.isdigit() and identity else None
+                elif result.status_code >= 500:
+                    failed(f"got {result}")
+                    continue
+                else:
+                    raise PythonAnywhereApiException(
+                        f"GET to download {url} failed, got {result}{self._error_msg(result)}"
+                    )
+                try:
+                    with open(part_path, "ab" if received else "wb") as part:
+                        for chunk in result.iter_content(chunk_size=chunk_size):
+                            part.write(chunk)
+                            received += len(chunk)
+                            failures = 0
+                except requests.RequestException as e:
+                    breaker.record_failure()
+                    failed(e)
+                    continue
+            if size is None:
+                size = received
+            elif received < size:
+                failed(f"response ended after {received} of {size} bytes")
+            elif received > size:
+                raise PythonAnywhereApiException(f"GET to download {url} got {received} bytes, expected {size}")
+
+        os.replace(part_path, local_path)
+        return received
+
+    def path_post(
+        self, dest_path: str, content: Union[bytes, BinaryIO], cache: Optional[ContentCache] = None
+    ) -> int:
         """Uploads contents of `content` to `dest_path` which should be
         a valid absolute path of a file available to a PythonAnywhere
         user.  If `dest_path` contains directories which don't exist
@@ -83,36 +362,98 @@ class Files:
 
         Returns 200 if existing file on PythonAnywhere has been
         updated with `source` contents, or 201 if file from
-        `dest_path` has been created with those contents."""
+        `dest_path` has been created with those contents.
+
+        A seekable binary file `content` is streamed from its current
+        position instead of being read into memory.
+
+        With a `cache`, bytes `content` that the cache knows to be the
+        last contents uploaded to `dest_path` are not sent again and 304
+        is returned."""
 
         url = f"{self.path_endpoint}{dest_path}"
 
-        result = call_api(url, "POST", files={"content": content})
+        digest = None
+        if cache is not None and isinstance(content, bytes):
+            digest = content_digest(content)
+            if cache.is_current(dest_path, digest):
+                cache.record_skipped(len(content))
+                return 304
+
+        if isinstance(content, bytes) or content is None:
+            result = call_api(url, "POST", files={"content": content}, timeout=self.timeout)
+        else:
+            body = _MultipartFileBody("content", content)
+            result = call_api(
+                url, "POST", data=body, headers={"Content-Type": body.content_type}, timeout=self.timeout
+            )
 
         if result.ok:
+            if digest is not None:
+                cache.record(dest_path, digest, len(content))
             return result.status_code
 
         raise PythonAnywhereApiException(
             f"POST to upload contents to {url} failed, got {result}{self._error_msg(result)}"
         )
 
-    def path_delete(self, path: str) -> int:
+    def path_delete(self, path: str, cache: Optional[ContentCache] = None) -> int:
         """Deletes the file at specified `path` (if file is a
-        directory it will be deleted as well).
+        directory it will be deleted as well), dropping its records from
+        `cache` if given.
 
         Returns 204 on sucess, raises otherwise."""
 
         url = f"{self.path_endpoint}{path}"
 
-        result = call_api(url, "DELETE")
+        result = call_api(url, "DELETE", timeout=self.timeout)
 
         if result.status_code == 204:
+            if cache is not None:
+                cache.forget(path)
             return result.status_code
 
         raise PythonAnywhereApiException(
             f"DELETE on {url} failed, got {result}{self._error_msg(result)}"
         )
 
+    def _make_dir(self, dir_path: str) -> int:
+        placeholder = f"{dir_path}/.empty"
+        status_code = self.path_post(placeholder, b"")
+        self.path_delete(placeholder)
+        return status_code
+
+    def dirs_post(self, dir_paths: Iterable[str], max_workers: int = DEFAULT_MAX_WORKERS) -> Dict[str, Any]:
+        """Creates directories at absolute `dir_paths` (and their parents).
+
+        The API has no call creating a directory, so each one is created by
+        uploading a placeholder file and deleting it again.  When there is
+        more than one directory, those already present in a single
+        :meth:`tree_get` listing of the common parent of `dir_paths` are
+        skipped (for a single directory the listing would cost more calls
+        than it can save), the rest are created concurrently.
+
+        Returns dictionary mapping each path which had to be created to
+        status code of the placeholder upload or the exception raised
+        while creating it."""
+
+        dir_paths = sorted({path.rstrip("/") for path in dir_paths})
+        if not dir_paths:
+            return {}
+        existing = set()
+        if len(dir_paths) > 1:
+            parent = posixpath.commonpath(dir_paths)
+            try:
+                existing = {entry.path.rstrip("/") for entry in self.iter_tree(parent) if entry.is_dir}
+            except (CircuitOpenError, DeadlineExceededError):
+                raise
+            except PythonAnywhereApiException:
+                pass
+            else:
+                existing.add(parent)
+        missing = [path for path in dir_paths if path not in existing]
+        return run_bulk(self._make_dir, missing, max_workers=max_workers)
+
     def sharing_post(self, path: str) -> Tuple[str, str]:
         """Starts sharing a file at `path`.
 
@@ -122,11 +463,11 @@ class Files:
 
         url = self.sharing_endpoint
 
-        result = call_api(url, "POST", json={"path": path})
+        result = call_api(url, "POST", json={"path": path}, timeout=self.timeout)
 
         if result.ok:
             msg = {200: "was already shared", 201: "successfully shared"}[result.status_code]
-            sharing_url_suffix = result.json()["url"]
+            sharing_url_suffix = decode_json(result)["url"]
             return msg, self._make_sharing_url(sharing_url_suffix)
 
         raise PythonAnywhereApiException(
@@ -141,9 +482,9 @@ class Files:
 
         url = f"{self.sharing_endpoint}?path={path}"
 
-        result = call_api(url, "GET")
+        result = call_api(url, "GET", timeout=self.timeout)
         if result.ok:
-            sharing_url_suffix = result.json()["url"]
+            sharing_url_suffix = decode_json(result)["url"]
             return self._make_sharing_url(sharing_url_suffix)
         else:
             return ""
@@ -155,7 +496,7 @@ class Files:
 
         url = f"{self.sharing_endpoint}?path={path}"
 
-        result = call_api(url, "DELETE")
+        result = call_api(url, "DELETE", timeout=self.timeout)
 
         return result.status_code
 
@@ -168,29 +509,235 @@ class Files:
 
         url = f"{self.tree_endpoint}?path={path}"
 
-        result = call_api(url, "GET")
+        result = call_api(url, "GET", timeout=self.timeout)
 
         if result.ok:
-            return result.json()
+            return decode_json(result)
 
         raise PythonAnywhereApiException(f"GET to {url} failed, got {result}{self._error_msg(result)}")
 
-    def tree_post(self, local_dir_path: str, remote_dir_path: str) -> None:
+    def iter_tree(self, path: str) -> Iterator[TreeEntry]:
+        """Iterates over entries of :meth:`tree_get` listing of `path`
+        as :class:`~pythonanywhere_core.models.TreeEntry` models, streaming
+        the response and decoding one entry at a time."""
+
+        url = f"{self.tree_endpoint}?path={path}"
+
+        result = call_api(url, "GET", stream=True, timeout=self.timeout)
+        with result:
+            if not result.ok:
+                raise PythonAnywhereApiException(f"GET to {url} failed, got {result}{self._error_msg(result)}")
+            for entry in iter_decode_json(result):
+                yield TreeEntry(entry)
+
+    def tree_post(
+        self,
+        local_dir_path: str,
+        remote_dir_path: str,
+        journal: Optional[OperationJournal] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        ignore_patterns: Iterable[str] = (),
+        ignore_file_names: Iterable[str] = (),
+        unpack: Optional[Callable[[str, str], Any]] = None,
+        cache: Optional[ContentCache] = None,
+        hash_cache: Optional[HashCache] = None,
+        hash_workers: Optional[int] = None,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        hash_processes: bool = False,
+    ) -> None:
         """Uploads contents of a local directory to remote path on
         PythonAnywhere.  Walks `local_dir_path` recursively and uploads
         each file using :meth:`path_post`, preserving directory structure.
+        Walking, reading files and uploading them run as a pipeline (see
+        :func:`~pythonanywhere_core.bulk.iter_pipeline`) with at most
+        `queue_size` files waiting between stages, so disk and network I/O
+        overlap and memory use doesn't grow with the size of the tree.
+        Up to `max_workers` files are uploaded concurrently, gated by an
+        :class:`~pythonanywhere_core.bulk.AdaptiveConcurrencyLimiter`.
+        Empty directories are created afterwards with :meth:`dirs_post`.
+
+        Paths matching gitignore-style `ignore_patterns` (e.g.
+        :data:`~pythonanywhere_core.ignore.DEFAULT_IGNORE_PATTERNS`) or
+        rules from ignore files named in `ignore_file_names` (e.g.
+        ``.gitignore``) found while walking are skipped, and ignored
+        directories are not walked at all, see
+        :func:`~pythonanywhere_core.ignore.walk`.
+
+        With an `unpack` hook, the tree is packed into a single compressed
+        archive which is uploaded next to `remote_dir_path` contents and
+        ``unpack(archive_path, remote_dir_path)`` is called to unpack it
+        remotely (e.g. running :func:`unpack_command` in a console); the
+        archive is deleted afterwards.  The archive is built in a temporary
+        file on disk and streamed from it, so it isn't held in memory.  If
+        uploading it fails with an API or HTTP error, or `unpack` raises
+        :exc:`PythonAnywhereApiException`, an ``"archive_upload_failed"``
+        instrumentation event is emitted and files are uploaded one by one
+        instead; other errors (including an open circuit breaker or an
+        exceeded deadline) are raised.
+
+        With a `cache`, files which the cache knows to be already uploaded
+        with the same contents are skipped (in both modes), and the bytes
+        that weren't sent are counted in ``cache.bytes_saved``.  Files are
+        then hashed in `hash_workers` threads, or processes if
+        `hash_processes` is True (see
+        :func:`~pythonanywhere_core.hashing.iter_hashes`, using
+        `hash_cache` to avoid rehashing unchanged files), and each file is
+        uploaded as soon as its hash is ready, in no particular order.
+
+        With a `journal`, every uploaded path is recorded in it, keyed by
+        its remote path and the local file's size and modification time,
+        and paths already recorded are skipped, so an interrupted upload
+        resumes where it stopped.  Files changed since then, or uploaded
+        to a different `remote_dir_path`, are uploaded again.  The journal
+        is finished (removed) once the whole tree has been uploaded.
 
         Raises :exc:`PythonAnywhereApiException` on first upload failure."""
 
         local_dir = Path(local_dir_path)
         if not local_dir.is_dir():
             raise ValueError(f"{local_dir_path} is not a directory")
-        for path in sorted(local_dir.rglob("*")):
-            if path.is_file():
-                relative = path.relative_to(local_dir)
-                remote_path = f"{remote_dir_path}/{relative}"
-                self.path_post(remote_path, path.read_bytes())
-            elif path.is_dir() and not any(path.iterdir()):
-                placeholder = f"{remote_dir_path}/{path.relative_to(local_dir)}/.empty"
-                self.path_post(placeholder, b"")
-                self.path_delete(placeholder)
+        entries = (
+            entry
+            for entry in walk(local_dir, IgnoreRules(ignore_patterns), ignore_file_names)
+            if journal is None
+            or not journal.is_done(_journal_key(f"{remote_dir_path}/{entry[0]}", entry[1], entry[2]))
+        )
+        executor_factory = ProcessPoolExecutor if hash_processes else ThreadPoolExecutor
+        if unpack is not None:
+            entries = list(entries)
+            hashing = dict(cache=hash_cache, max_workers=hash_workers, executor_factory=executor_factory)
+            if entries and self._post_archive(entries, remote_dir_path, unpack, cache, hashing):
+                if journal is not None:
+                    journal.finish()
+                return
+
+        empty_dirs = {}
+
+        def local_files():
+            for relative, local_path, is_dir in entries:
+                if is_dir:
+                    empty_dirs[f"{remote_dir_path}/{relative}"] = local_path
+                else:
+                    yield local_path
+
+        def read(item):
+            local_path, digest = item
+            relative = Path(local_path).relative_to(local_dir).as_posix()
+            remote_path = f"{remote_dir_path}/{relative}"
+            # stat before reading, so that changes made while uploading
+            # don't get recorded as uploaded
+            key = _journal_key(remote_path, local_path, False)
+            if digest is not None and cache.is_current(remote_path, digest):
+                return key, remote_path, local_path, digest, None
+            return key, remote_path, local_path, digest, Path(local_path).read_bytes()
+
+        if cache is None:
+            hashes = ((local_path, None) for local_path in local_files())
+        else:
+            hashes = iter_hashes(
+                local_files(), cache=hash_cache, max_workers=hash_workers, executor_factory=executor_factory
+            )
+        limiter = AdaptiveConcurrencyLimiter(maximum=max_workers)
+
+        def upload(item):
+            key, remote_path, local_path, digest, content = item
+            call_limited(limiter, self._post_file, remote_path, local_path, digest, content, cache)
+            if journal is not None:
+                journal.record(key)
+
+        with (
+            closing(hashes),
+            closing(iter_pipeline(hashes, [read], queue_size=queue_size)) as uploads,
+            ThreadPoolExecutor(max_workers=max_workers) as executor,
+        ):
+            pending = set()
+            for item in uploads:
+                pending.add(executor.submit(contextvars.copy_context().run, upload, item))
+                if len(pending) >= max_workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        future.result()
+            for future in pending:
+                future.result()
+
+        results = self.dirs_post(empty_dirs, max_workers=max_workers)
+        if journal is not None:
+            for remote_path, local_path in empty_dirs.items():
+                if not isinstance(results.get(remote_path), Exception):
+                    journal.record(_journal_key(remote_path, local_path, True))
+        for error in failures(results).values():
+            raise error
+        if journal is not None:
+            journal.finish()
+
+    def _post_file(
+        self,
+        remote_path: str,
+        local_path: str,
+        digest: Optional[str],
+        content: Optional[bytes],
+        cache: Optional[ContentCache],
+    ) -> int:
+        if content is None:
+            cache.record_skipped(os.path.getsize(local_path))
+            return 304
+        status_code = self.path_post(remote_path, content)
+        if digest is not None:
+            cache.record(remote_path, digest, len(content))
+        return status_code
+
+    def _post_archive(
+        self,
+        entries: List[Tuple[str, str, bool]],
+        remote_dir_path: str,
+        unpack: Callable[[str, str], Any],
+        cache: Optional[ContentCache] = None,
+        hashing: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        uploads, skipped = {}, []
+        if cache is not None:
+            local_files = {local_path: relative for relative, local_path, is_dir in entries if not is_dir}
+            unchanged = set()
+            for local_path, digest in iter_hashes(local_files, **(hashing or {})):
+                remote_path = f"{remote_dir_path}/{local_files[local_path]}"
+                size = os.path.getsize(local_path)
+                if cache.is_current(remote_path, digest):
+                    unchanged.add(local_path)
+                    skipped.append(size)
+                else:
+                    uploads[remote_path] = (digest, size)
+            entries = [entry for entry in entries if entry[1] not in unchanged]
+        if entries and not self._upload_and_unpack_archive(entries, remote_dir_path, unpack):
+            return False
+        for remote_path, (digest, size) in uploads.items():
+            cache.record(remote_path, digest, size)
+        for size in skipped:
+            cache.record_skipped(size)
+        return True
+
+    def _upload_and_unpack_archive(
+        self, entries: List[Tuple[str, str, bool]], remote_dir_path: str, unpack: Callable[[str, str], Any]
+    ) -> bool:
+        archive_path = f"{remote_dir_path}/.tree_post-{uuid.uuid4().hex}.tar.gz"
+        uploaded = False
+        try:
+            with tempfile.TemporaryFile() as archive:
+                with tarfile.open(fileobj=archive, mode="w:gz", dereference=True) as tar:
+                    for relative, local_path, _ in entries:
+                        tar.add(local_path, arcname=relative, recursive=False)
+                archive.seek(0)
+                self.path_post(archive_path, archive)
+            uploaded = True
+            unpack(archive_path, remote_dir_path)
+        except (CircuitOpenError, DeadlineExceededError, NoTokenError):
+            raise
+        except (PythonAnywhereApiException, requests.RequestException) as e:
+            emit_event("archive_upload_failed", remote_path=archive_path, error=e)
+            return False
+        finally:
+            if uploaded:
+                try:
+                    self.path_delete(archive_path)
+                except Exception as e:
+                    emit_event("archive_delete_failed", remote_path=archive_path, error=e)
+        return True
@@ -0,0 +1,179 @@
+import hashlib
+import mmap
+import os
+import sqlite3
+import threading
+from concurrent.futures import FIRST_COMPLETED, Executor, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple, Union
+
+MMAP_THRESHOLD = 1024 * 1024
+READ_CHUNK_SIZE = 1024 * 1024
+BATCH_SIZE = 1024 * 1024
+
+
+def hash_file(path: Union[str, Path], mmap_threshold: int = MMAP_THRESHOLD) -> str:
+    """Returns hex SHA-256 digest of contents of local file at `path`,
+    the same as :func:`~pythonanywhere_core.content_cache.content_digest`
+    of its bytes.
+
+    Files of `mmap_threshold` bytes or more are memory-mapped instead of
+    read in chunks."""
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as local_file:
+        size = os.fstat(local_file.fileno()).st_size
+        if size and size >= mmap_threshold:
+            with mmap.mmap(local_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                digest.update(mapped)
+        else:
+            for chunk in iter(lambda: local_file.read(READ_CHUNK_SIZE), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _stat_key(stat: os.stat_result) -> Tuple[int, int, int]:
+    return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+class HashCache:
+    """Persistent cache of local file digests keyed by (inode, size,
+    mtime), so files which haven't changed since they were last hashed
+    aren't read again.
+
+    Methods:
+        - :meth:`HashCache.get`: Get cached digest of a file.
+        - :meth:`HashCache.put`: Cache digest of a file.
+
+    :param path: path of the SQLite database, in memory by default
+    """
+
+    def __init__(self, path: Union[str, Path] = ":memory:") -> None:
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        with self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS hashes ("
+                "inode INTEGER, size INTEGER, mtime_ns INTEGER, digest TEXT NOT NULL, "
+                "PRIMARY KEY (inode, size, mtime_ns)"
+                ") WITHOUT ROWID"
+            )
+
+    def __enter__(self) -> "HashCache":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Closes the database."""
+
+        with self._lock:
+            self._db.close()
+
+    def get(self, stat: os.stat_result) -> Optional[str]:
+        """Returns cached digest of file with `stat`, or None."""
+
+        with self._lock:
+            row = self._db.execute(
+                "SELECT digest FROM hashes WHERE inode = ? AND size = ? AND mtime_ns = ?", _stat_key(stat)
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, stat: os.stat_result, digest: str) -> None:
+        """Caches `digest` of file with `stat`."""
+
+        with self._lock, self._db:
+            self._db.execute("INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?)", (*_stat_key(stat), digest))
+
+
+def _hash_files(paths: List[str]) -> List[str]:
+    return [hash_file(path) for path in paths]
+
+
+def iter_hashes(
+    paths: Iterable[str],
+    cache: Optional[HashCache] = None,
+    max_workers: Optional[int] = None,
+    executor_factory: Callable[[Optional[int]], Executor] = ThreadPoolExecutor,
+    max_pending: Optional[int] = None,
+    batch_size: int = BATCH_SIZE,
+) -> Iterator[Tuple[str, str]]:
+    """Hashes local files at `paths` concurrently, yielding results as
+    soon as they are ready so that callers can start using them (e.g.
+    uploading) while the rest are still being hashed.
+
+    Files are hashed in threads by default, which hash in parallel since
+    :mod:`hashlib` releases the GIL while hashing large buffers.  Pass
+    ``executor_factory=ProcessPoolExecutor`` to hash in processes instead;
+    that only pays off for many large files, and on platforms starting
+    processes with ``spawn`` (macOS, Windows) the calling script needs an
+    ``if __name__ == "__main__":`` guard.  Files smaller than
+    `batch_size` bytes are submitted in batches of about `batch_size`
+    bytes, so a tree of small files doesn't cost a task per file.
+
+    `paths` are consumed lazily: at most `max_pending` files (four per
+    worker by default) are being hashed or waiting to be hashed at any
+    time.  Files cached in `cache` are yielded without being read; digests
+    of the others are added to the cache (unless the file changed while
+    being hashed).  Closing the iterator early cancels hashing which
+    hasn't started yet.
+
+    :param paths: paths of local files
+    :param cache: :class:`HashCache` to use
+    :param max_workers: number of workers, defaults to number of CPUs
+    :param executor_factory: callable creating the executor given `max_workers`
+    :param max_pending: maximum number of files submitted but not yielded yet
+    :param batch_size: size in bytes below which files are hashed in batches
+    :returns: iterator of (path, hex SHA-256 digest) tuples, in no particular order
+    """
+    max_pending = max_pending or (max_workers or os.cpu_count() or 1) * 4
+    executor = None
+    pending = {}
+    batch, batch_bytes = [], 0
+
+    def submit(files):
+        nonlocal executor
+        if executor is None:
+            executor = executor_factory(max_workers)
+        pending[executor.submit(_hash_files, [path for path, _ in files])] = files
+
+    def collect(done):
+        for future in done:
+            files = pending.pop(future)
+            for (path, stat), digest in zip(files, future.result()):
+                if cache is not None and _stat_key(os.stat(path)) == _stat_key(stat):
+                    cache.put(stat, digest)
+                yield path, digest
+
+    def pending_files():
+        return sum(len(files) for files in pending.values()) + len(batch)
+
+    try:
+        for path in paths:
+            stat = os.stat(path)
+            digest = cache.get(stat) if cache is not None else None
+            if digest is not None:
+                yield path, digest
+                continue
+            if stat.st_size >= batch_size:
+                submit([(path, stat)])
+            else:
+                batch.append((path, stat))
+                batch_bytes += stat.st_size
+                if batch_bytes >= batch_size or len(batch) >= max_pending:
+                    submit(batch)
+                    batch, batch_bytes = [], 0
+            if pending_files() >= max_pending:
+                if batch:
+                    submit(batch)
+                    batch, batch_bytes = [], 0
+                yield from collect(wait(pending, return_when=FIRST_COMPLETED).done)
+        if batch:
+            submit(batch)
+            batch = []
+        while pending:
+            yield from collect(wait(pending, return_when=FIRST_COMPLETED).done)
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,249 @@
+import os
+import re
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+DEFAULT_IGNORE_PATTERNS = (
+    ".git/",
+    ".hg/",
+    ".svn/",
+    "__pycache__/",
+    "*.py[cod]",
+    ".mypy_cache/",
+    ".pytest_cache/",
+    ".tox/",
+    ".nox/",
+    ".venv/",
+    "venv/",
+    "node_modules/",
+    ".DS_Store",
+)
+
+
+def _translate_segment(segment: str) -> str:
+    result = []
+    i = 0
+    while i < len(segment):
+        char = segment[i]
+        if char == "*":
+            result.append("[^/]*")
+        elif char == "?":
+            result.append("[^/]")
+        elif char == "\\" and i + 1 < len(segment):
+            i += 1
+            result.append(re.escape(segment[i]))
+        elif char == "[":
+            end = i + 1
+            if segment[end:end + 1] == "!":
+                end += 1
+            if segment[end:end + 1] == "]":
+                end += 1
+            end = segment.find("]", end)
+            if end == -1:
+                result.append(re.escape(char))
+            else:
+                body = segment[i + 1:end].replace("\\", "\\\\")
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                result.append(f"[{body}]")
+                i = end
+        else:
+            result.append(re.escape(char))
+        i += 1
+    return "".join(result)
+
+
+def _translate(pattern: str) -> str:
+    anchored = "/" in pattern
+    segments = pattern.lstrip("/").split("/")
+    result = []
+    for position, segment in enumerate(segments):
+        last = position == len(segments) - 1
+        if segment == "**":
+            result.append(".*" if last else "(?:[^/]*/)*")
+        else:
+            result.append(_translate_segment(segment) + ("" if last else "/"))
+    prefix = "" if anchored else "(?:.*/)?"
+    return f"{prefix}{''.join(result)}"
+
+
+class IgnoreRules:
+    """Compiled gitignore-style rules.
+
+    Supports comments, ``!`` negation (the last matching rule wins),
+    ``/``-anchored patterns, trailing ``/`` for directories only, ``*``,
+    ``?``, ``[...]`` and ``**``.  Patterns are relative to `base` (a
+    relative directory, as for ``.gitignore`` files in subdirectories).
+    Rules without negations are merged into a single regular expression.
+
+    Methods:
+        - :meth:`IgnoreRules.from_file`: Read rules from an ignore file.
+        - :meth:`IgnoreRules.match`: Check a single path against the rules.
+        - :meth:`IgnoreRules.is_ignored`: Check a path and its parent directories.
+    """
+
+    def __init__(self, patterns: Iterable[str] = (), base: str = "") -> None:
+        self.base = base.strip("/")
+        self._rules: List[Tuple["re.Pattern", bool, bool]] = []
+        for line in patterns:
+            line = line.rstrip("\n\r")
+            if not line.endswith("\\ "):
+                line = line.rstrip(" ")
+            if not line or line.startswith("#"):
+                continue
+            negated = line.startswith("!")
+            if negated or line.startswith("\\!") or line.startswith("\\#"):
+                line = line[1:]
+            dir_only = line.endswith("/")
+            self._rules.append((re.compile(_translate(line.rstrip("/")) + r"\Z"), negated, dir_only))
+        self._has_negations = any(negated for _, negated, _ in self._rules)
+        self._file_regex = self._combine(dir_only for _, _, dir_only in self._rules)
+        self._dir_regex = self._combine(False for _ in self._rules)
+
+    def _combine(self, skipped: Iterable[bool]) -> Optional["re.Pattern"]:
+        parts = [regex.pattern for (regex, _, _), skip in zip(self._rules, skipped) if not skip]
+        return re.compile("|".join(f"(?:{part})" for part in parts)) if parts else None
+
+    def __bool__(self) -> bool:
+        return bool(self._rules)
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path], base: str = "") -> "IgnoreRules":
+        """Reads rules from ignore file at `path`."""
+
+        with open(path, encoding="utf-8", errors="replace") as ignore_file:
+            return cls(ignore_file, base=base)
+
+    def match(self, path: str, is_dir: bool = False) -> Optional[bool]:
+        """Matches relative posix `path` (without checking its parents).
+
+        :returns: True if `path` is ignored, False if it is explicitly
+            included by a negated rule, None if no rule matches"""
+
+        if self.base:
+            if not path.startswith(f"{self.base}/"):
+                return None
+            path = path[len(self.base) + 1:]
+        if not self._has_negations:
+            regex = self._dir_regex if is_dir else self._file_regex
+            return True if regex is not None and regex.match(path) else None
+        for regex, negated, dir_only in reversed(self._rules):
+            if dir_only and not is_dir:
+                continue
+            if regex.match(path):
+                return not negated
+        return None
+
+    def is_ignored(self, path: str, is_dir: bool = False) -> bool:
+        """Returns True if relative posix `path` or any of its parent
+        directories is ignored."""
+
+        parts = path.strip("/").split("/")
+        for depth in range(1, len(parts)):
+            if self.match("/".join(parts[:depth]), is_dir=True):
+                return True
+        return bool(self.match("/".join(parts), is_dir=is_dir))
+
+
+def _is_ignored(rules: Sequence[IgnoreRules], path: str, is_dir: bool) -> bool:
+    for rule_set in reversed(rules):
+        matched = rule_set.match(path, is_dir=is_dir)
+        if matched is not None:
+            return matched
+    return False
+
+
+class IgnoreTree:
+    """Checks single paths below `root` the same way :func:`walk` does,
+    reading ignore files named in `ignore_file_names` of each directory on
+    first use.
+
+    Methods:
+        - :meth:`IgnoreTree.is_ignored`: Check a path and its parent directories.
+        - :meth:`IgnoreTree.invalidate`: Forget rules read from a directory's ignore files.
+    """
+
+    def __init__(
+        self, root: Union[str, Path], rules: Optional[IgnoreRules] = None, ignore_file_names: Iterable[str] = ()
+    ) -> None:
+        self.root = Path(root)
+        self.rules = rules
+        self.ignore_file_names = tuple(ignore_file_names)
+        self._directory_rules = {}
+
+    def _rules_of(self, relative_dir: str) -> List[IgnoreRules]:
+        if relative_dir not in self._directory_rules:
+            rules = []
+            for name in self.ignore_file_names:
+                path = self.root / relative_dir / name
+                if path.is_file():
+                    rules.append(IgnoreRules.from_file(path, base=relative_dir))
+            self._directory_rules[relative_dir] = rules
+        return self._directory_rules[relative_dir]
+
+    def is_ignored(self, path: str, is_dir: bool = False) -> bool:
+        """Returns True if relative posix `path` or any of its parent
+        directories is ignored."""
+
+        parts = path.strip("/").split("/")
+        chain = [self.rules] if self.rules else []
+        for depth in range(len(parts)):
+            chain = chain + self._rules_of("/".join(parts[:depth]))
+            last = depth == len(parts) - 1
+            if _is_ignored(chain, "/".join(parts[:depth + 1]), is_dir=is_dir if last else True):
+                return True
+        return False
+
+    def invalidate(self, relative_dir: str) -> None:
+        """Forgets rules read from ignore files in `relative_dir`, e.g.
+        after one of them changed."""
+
+        self._directory_rules.pop(relative_dir.strip("/"), None)
+
+
+def walk(
+    root: Union[str, Path],
+    rules: Optional[IgnoreRules] = None,
+    ignore_file_names: Iterable[str] = (),
+) -> Iterator[Tuple[str, str, bool]]:
+    """Walks `root` with ``os.scandir`` yielding files and empty
+    directories that are not ignored.
+
+    Ignored directories are pruned: nothing below them is listed or
+    stat-ed.  A directory counts as empty when it has nothing but ignored
+    entries.  Ignore files named in `ignore_file_names` (e.g.
+    ``.gitignore``) apply to the directory they are in and its
+    subdirectories, taking precedence over `rules` and over ignore files
+    of parent directories.  Symlinks to directories are not followed.
+
+    :param root: local directory to walk
+    :param rules: rules applying to the whole tree
+    :param ignore_file_names: names of ignore files to read while walking
+    :returns: iterator of (relative posix path, local path, is directory)
+        tuples, entries of each directory in sorted order"""
+
+    ignore_file_names = set(ignore_file_names)
+    base_rules = [rules] if rules else []
+    pending = [("", os.fspath(root), base_rules)]
+    while pending:
+        relative_dir, directory, chain = pending.pop()
+        with os.scandir(directory) as iterator:
+            entries = sorted(iterator, key=lambda entry: entry.name)
+        for entry in entries:
+            if entry.name in ignore_file_names and entry.is_file():
+                chain = chain + [IgnoreRules.from_file(entry.path, base=relative_dir)]
+        subdirectories = []
+        found = False
+        for entry in entries:
+            relative = f"{relative_dir}/{entry.name}" if relative_dir else entry.name
+            is_dir = entry.is_dir(follow_symlinks=False)
+            if not (is_dir or entry.is_file()) or _is_ignored(chain, relative, is_dir):
+                continue
+            found = True
+            if is_dir:
+                subdirectories.append((relative, entry.path, chain))
+            else:
+                yield relative, entry.path, False
+        if not found and relative_dir:
+            yield relative_dir, directory, True
+        pending.extend(reversed(subdirectories))
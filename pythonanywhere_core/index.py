@@ -0,0 +1,183 @@
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union
+
+from pythonanywhere_core.files import Files
+
+TREE_LISTING_LIMIT = 1000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    path TEXT PRIMARY KEY,
+    is_dir INTEGER NOT NULL,
+    fetched_at REAL NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS listings (
+    path TEXT PRIMARY KEY,
+    fetched_at REAL NOT NULL,
+    complete INTEGER NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+def _prefix_bounds(prefix: str):
+    if not prefix:
+        return "", chr(0x10FFFF)
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+class RemoteIndex:
+    """Persistent local index of remote :meth:`Files.tree_get` listings.
+
+    Listings are stored in an SQLite database at `path` (in memory by
+    default), keyed by path, together with the time they were fetched, so
+    existence, prefix and glob queries don't need API calls.  Directories
+    are refreshed one at a time with :meth:`refresh` or, when their
+    listing is older than some age, with :meth:`ensure_fresh`.  The API
+    limits listings to 1000 entries; truncated listings are never used to
+    tell that a path doesn't exist.
+
+    Methods:
+        - :meth:`RemoteIndex.refresh`: Fetch listing of a directory and return what changed.
+        - :meth:`RemoteIndex.ensure_fresh`: Refresh a directory if its listing is too old.
+        - :meth:`RemoteIndex.fetched_at`: Get time the listing of a directory was fetched.
+        - :meth:`RemoteIndex.exists`: Check whether a remote path exists.
+        - :meth:`RemoteIndex.list`: List indexed paths with a prefix.
+        - :meth:`RemoteIndex.glob`: List indexed paths matching a glob pattern.
+
+    :param path: path of the SQLite database
+    :param files: :class:`Files` instance used to fetch listings
+    :param clock: callable returning current time as seconds since the epoch
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path] = ":memory:",
+        files: Optional[Files] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.files = files or Files()
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+
+    def __enter__(self) -> "RemoteIndex":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Closes the database."""
+
+        with self._lock:
+            self._db.close()
+
+    def refresh(self, dir_path: str) -> Dict[str, List[str]]:
+        """Fetches listing of remote directory `dir_path` (including its
+        subdirectories) and replaces indexed entries below it.  A listing
+        cut off at the API limit is only added to the index: entries
+        missing from it aren't removed, and listings of subdirectories
+        are kept.
+
+        :returns: dictionary with sorted lists of ``added`` and ``removed``
+            paths (directories end with ``/``)
+        :raises PythonAnywhereApiException: if the listing can't be fetched
+        """
+        dir_path = dir_path.rstrip("/")
+        listing = self.files.tree_get(dir_path)
+        fetched_at = self._clock()
+        fetched = {entry.rstrip("/"): entry.endswith("/") for entry in listing}
+        complete = len(listing) < TREE_LISTING_LIMIT
+        low, high = _prefix_bounds(f"{dir_path}/")
+        with self._lock, self._db:
+            indexed = dict(
+                self._db.execute(
+                    "SELECT path, is_dir FROM entries WHERE path = ? OR path >= ? AND path < ?", (dir_path, low, high)
+                )
+            )
+            if complete:
+                # only entries strictly below `dir_path` are replaced, its own
+                # entry comes from the listing of its parent
+                self._db.execute("DELETE FROM entries WHERE path >= ? AND path < ?", (low, high))
+                self._db.execute("DELETE FROM listings WHERE path >= ? AND path < ?", (low, high))
+            self._db.executemany(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?)",
+                ((path, is_dir, fetched_at) for path, is_dir in fetched.items()),
+            )
+            self._db.execute("INSERT OR REPLACE INTO listings VALUES (?, ?, ?)", (dir_path, fetched_at, complete))
+        removed = indexed.keys() - fetched.keys() - {dir_path} if complete else ()
+        return {
+            "added": sorted(path + "/" * is_dir for path, is_dir in fetched.items() if path not in indexed),
+            "removed": sorted(path + "/" * indexed[path] for path in removed),
+        }
+
+    def ensure_fresh(self, dir_path: str, max_age: float) -> Optional[Dict[str, List[str]]]:
+        """Refreshes `dir_path` if its listing wasn't fetched in the last
+        `max_age` seconds.
+
+        :returns: result of :meth:`refresh`, or None if the listing was fresh
+        """
+        fetched_at = self._fetched_at(dir_path.rstrip("/"))
+        if fetched_at is not None and self._clock() - fetched_at <= max_age:
+            return None
+        return self.refresh(dir_path)
+
+    def _fetched_at(self, dir_path: str) -> Optional[float]:
+        with self._lock:
+            row = self._db.execute("SELECT fetched_at FROM listings WHERE path = ?", (dir_path,)).fetchone()
+        return row[0] if row else None
+
+    def fetched_at(self, dir_path: str) -> Optional[datetime]:
+        """Returns UTC time the listing of `dir_path` was fetched, or None
+        if it hasn't been."""
+
+        fetched_at = self._fetched_at(dir_path.rstrip("/"))
+        return None if fetched_at is None else datetime.fromtimestamp(fetched_at, timezone.utc)
+
+    def exists(self, path: str) -> Optional[bool]:
+        """Checks whether remote `path` exists according to the index.
+
+        :returns: True if it is indexed, False if a complete listing of one
+            of its parent directories doesn't contain it, None if unknown
+        """
+        path = path.rstrip("/")
+        parents = []
+        parent = path
+        while "/" in parent.strip("/"):
+            parent = parent.rsplit("/", 1)[0]
+            parents.append(parent)
+        with self._lock:
+            if self._db.execute("SELECT 1 FROM entries WHERE path = ?", (path,)).fetchone():
+                return True
+            placeholders = ", ".join("?" * len(parents))
+            row = self._db.execute(
+                f"SELECT 1 FROM listings WHERE complete AND path IN ({placeholders})", parents
+            ).fetchone()
+        return False if row else None
+
+    def list(self, prefix: str) -> List[str]:
+        """Returns sorted indexed paths starting with `prefix`
+        (directories end with ``/``)."""
+
+        low, high = _prefix_bounds(prefix)
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT path, is_dir FROM entries WHERE path >= ? AND path < ? ORDER BY path", (low, high)
+            ).fetchall()
+        return [path + "/" * is_dir for path, is_dir in rows]
+
+    def glob(self, pattern: str) -> List[str]:
+        """Returns sorted indexed paths matching SQLite GLOB `pattern`
+        (``*`` and ``?`` match ``/`` too, ``[...]`` matches a character
+        class); directories end with ``/``."""
+
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT path, is_dir FROM entries WHERE path GLOB ? ORDER BY path", (pattern.rstrip("/"),)
+            ).fetchall()
+        return [path + "/" * is_dir for path, is_dir in rows]
@@ -0,0 +1,134 @@
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Hashable, Iterable, List, Union
+
+
+def _encode_key(key: Hashable) -> str:
+    return json.dumps(key, sort_keys=True, separators=(",", ":"), default=str)
+
+
+class OperationJournal:
+    """Append-only on-disk journal of completed units of a bulk operation.
+
+    Every :meth:`record` appends a line with the unit's key (anything JSON
+    serializable: a path, an id, a tuple of those; other values such as
+    dates are stored as strings) and flushes it to disk,
+    so when a long operation is interrupted, rerunning it with the same
+    journal skips the units already done.  A partially written last line
+    (e.g. after a crash) is ignored.
+
+    Methods:
+        - :meth:`OperationJournal.is_done`: Check whether a unit has been completed.
+        - :meth:`OperationJournal.pending`: Filter out completed units.
+        - :meth:`OperationJournal.record`: Mark a unit as completed.
+        - :meth:`OperationJournal.compact`: Rewrite the journal without duplicated entries.
+        - :meth:`OperationJournal.finish`: Remove the journal once the operation has completed.
+
+    :param path: path of the journal file, created if it doesn't exist
+    :param sync: if True, fsync the journal after every record
+    """
+
+    def __init__(self, path: Union[str, Path], sync: bool = True) -> None:
+        self.path = Path(path)
+        self.sync = sync
+        self._done = set()
+        self._lock = threading.Lock()
+        self._file = None
+        self._load()
+
+    def __enter__(self) -> "OperationJournal":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._done)
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        with self.path.open("rb") as journal_file:
+            for line in journal_file:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    json.loads(line)
+                except ValueError:
+                    continue
+                self._done.add(line.decode("utf-8").rstrip("\n"))
+
+    def _open(self):
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = self.path.open("ab")
+            if self._file.tell() and not self._ends_with_newline():
+                self._file.write(b"\n")
+        return self._file
+
+    def _ends_with_newline(self) -> bool:
+        with self.path.open("rb") as journal_file:
+            journal_file.seek(-1, os.SEEK_END)
+            return journal_file.read(1) == b"\n"
+
+    def is_done(self, key: Hashable) -> bool:
+        """Returns True if unit `key` has been recorded as completed."""
+
+        return _encode_key(key) in self._done
+
+    def pending(self, keys: Iterable[Any]) -> List[Any]:
+        """Returns `keys` of units which haven't been completed yet, in order."""
+
+        return [key for key in keys if not self.is_done(key)]
+
+    def record(self, key: Hashable) -> None:
+        """Appends unit `key` to the journal as completed.  Safe to call
+        from multiple threads."""
+
+        encoded = _encode_key(key)
+        with self._lock:
+            if encoded in self._done:
+                return
+            journal_file = self._open()
+            journal_file.write(encoded.encode("utf-8") + b"\n")
+            journal_file.flush()
+            if self.sync:
+                os.fsync(journal_file.fileno())
+            self._done.add(encoded)
+
+    def compact(self) -> None:
+        """Rewrites the journal with a single line per completed unit,
+        dropping duplicated and corrupted lines.  The journal is replaced
+        atomically."""
+
+        with self._lock:
+            self._close_file()
+            temporary = self.path.with_name(f"{self.path.name}.tmp")
+            with temporary.open("wb") as journal_file:
+                journal_file.writelines(f"{encoded}\n".encode("utf-8") for encoded in sorted(self._done))
+                journal_file.flush()
+                os.fsync(journal_file.fileno())
+            os.replace(temporary, self.path)
+
+    def finish(self) -> None:
+        """Removes the journal file after the whole operation has
+        completed, so the next run starts from scratch."""
+
+        with self._lock:
+            self._close_file()
+            self._done.clear()
+            if self.path.exists():
+                self.path.unlink()
+
+    def close(self) -> None:
+        """Closes the journal file, keeping recorded units."""
+
+        with self._lock:
+            self._close_file()
+
+    def _close_file(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, fields
+from datetime import date, datetime
+from typing import Any, Optional, Type, TypeVar, Union
+
+from pythonanywhere_core.timestamps import parse_date, parse_datetime
+
+M = TypeVar("M")
+
+
+def _from_dict(cls: Type[M], data: dict[str, Any]) -> M:
+    kwargs = {}
+    for field in fields(cls):
+        key = field.name.lstrip("_")
+        if key in data:
+            kwargs[field.name] = data[key]
+    return cls(**kwargs)
+
+
+def _decode_datetime(value: Union[str, datetime, None]) -> Optional[datetime]:
+    if isinstance(value, str):
+        return parse_datetime(value) if value else None
+    return value
+
+
+def _decode_date(value: Union[str, date, None]) -> Optional[date]:
+    if isinstance(value, str):
+        return parse_date(value) if value else None
+    return value
+
+
+@dataclass(slots=True)
+class WebappInfo:
+    """Webapp as returned by :meth:`Webapp.get` and :meth:`Webapp.list_webapps`."""
+
+    id: Optional[int] = None
+    user: Optional[str] = None
+    domain_name: Optional[str] = None
+    python_version: Optional[str] = None
+    source_directory: Optional[str] = None
+    working_directory: Optional[str] = None
+    virtualenv_path: Optional[str] = None
+    force_https: Optional[bool] = None
+    password_protection_enabled: Optional[bool] = None
+    password_protection_username: Optional[str] = None
+    password_protection_password: Optional[str] = None
+    _expiry: Union[str, date, None] = None
+
+    @property
+    def expiry(self) -> Optional[date]:
+        return _decode_date(self._expiry)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> WebappInfo:
+        return _from_dict(cls, data)
+
+
+@dataclass(slots=True)
+class WebsiteInfo:
+    """Website as returned by :meth:`Website.get` and :meth:`Website.list`."""
+
+    id: Optional[int] = None
+    user: Optional[str] = None
+    domain_name: Optional[str] = None
+    enabled: Optional[bool] = None
+    webapp: Optional[dict] = None
+    logfiles: Optional[dict] = None
+
+    @property
+    def command(self) -> Optional[str]:
+        return (self.webapp or {}).get("command")
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> WebsiteInfo:
+        return _from_dict(cls, data)
+
+
+@dataclass(slots=True)
+class ScheduledTask:
+    """Scheduled task as returned by :class:`Schedule` methods."""
+
+    id: Optional[int] = None
+    command: Optional[str] = None
+    enabled: Optional[bool] = None
+    interval: Optional[str] = None
+    hour: Optional[int] = None
+    minute: Optional[int] = None
+    can_enable: Optional[bool] = None
+    extend_url: Optional[str] = None
+    logfile: Optional[str] = None
+    printable_time: Optional[str] = None
+    url: Optional[str] = None
+    user: Optional[str] = None
+    _expiry: Union[str, date, None] = None
+
+    @property
+    def expiry(self) -> Optional[date]:
+        return _decode_date(self._expiry)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> ScheduledTask:
+        return _from_dict(cls, data)
+
+
+@dataclass(slots=True)
+class SSLInfo:
+    """SSL certificate info as returned by :meth:`Webapp.get_ssl_info_model` and
+    :meth:`Website.get_ssl_info_model`."""
+
+    cert_type: Optional[str] = None
+    issuer_name: Optional[str] = None
+    subject_alternate_names: Optional[list] = None
+    _not_after: Union[str, datetime, None] = None
+
+    @property
+    def not_after(self) -> Optional[datetime]:
+        return _decode_datetime(self._not_after)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> SSLInfo:
+        return _from_dict(cls, data)
+
+
+@dataclass(slots=True)
+class CPUUsage:
+    """CPU usage as returned by :meth:`CPU.get_cpu_usage_model`."""
+
+    daily_cpu_limit_seconds: Optional[float] = None
+    daily_cpu_total_usage_seconds: Optional[float] = None
+    _next_reset_time: Union[str, datetime, None] = None
+
+    @property
+    def next_reset_time(self) -> Optional[datetime]:
+        return _decode_datetime(self._next_reset_time)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> CPUUsage:
+        return _from_dict(cls, data)
+
+
+@dataclass(slots=True)
+class TreeEntry:
+    """Entry of a directory listing returned by :meth:`Files.tree_get`."""
+
+    path: str
+
+    @property
+    def is_dir(self) -> bool:
+        return self.path.endswith("/")
+
+    @property
+    def name(self) -> str:
+        return self.path.rstrip("/").rsplit("/", 1)[-1]
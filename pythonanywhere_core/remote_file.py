@@ -0,0 +1,121 @@
+import io
+from collections import OrderedDict
+from typing import Optional
+
+from pythonanywhere_core.files import Files
+
+DEFAULT_BLOCK_SIZE = 64 * 1024
+DEFAULT_CACHE_BLOCKS = 32
+
+
+class RemoteFile(io.RawIOBase):
+    """Seekable read-only file-like object over a remote file.
+
+    Contents are fetched lazily in blocks of `block_size` bytes with
+    :meth:`Files.path_get_range_with_size` and the last `cache_blocks`
+    blocks used are kept in an LRU cache, so reading the header of a
+    large file or the tail of a log only transfers the blocks needed.
+
+    :param path: absolute path of the remote file
+    :param files: :class:`Files` instance to use
+    :param block_size: number of bytes fetched at once
+    :param cache_blocks: maximum number of blocks kept in memory
+    """
+
+    def __init__(
+        self,
+        path: str,
+        files: Optional[Files] = None,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        cache_blocks: int = DEFAULT_CACHE_BLOCKS,
+    ) -> None:
+        super().__init__()
+        self.path = path
+        self.files = files or Files()
+        self.block_size = block_size
+        self.cache_blocks = cache_blocks
+        self.blocks_fetched = 0
+        self._blocks = OrderedDict()
+        self._position = 0
+        self._size: Optional[int] = None
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    @property
+    def size(self) -> int:
+        """Size of the remote file in bytes (fetches the first block if
+        it isn't known yet)."""
+
+        if self._size is None:
+            self._block(0)
+        if self._size is None:
+            raise OSError(f"size of {self.path} is unknown")
+        return self._size
+
+    def _block(self, index: int) -> bytes:
+        if index in self._blocks:
+            self._blocks.move_to_end(index)
+            return self._blocks[index]
+        content, size = self.files.path_get_range_with_size(self.path, index * self.block_size, self.block_size)
+        self.blocks_fetched += 1
+        if size is not None:
+            self._size = size
+        elif len(content) < self.block_size and (content or index == 0):
+            # a short block ends the file, but an empty one past the end
+            # (416 without Content-Range) only tells it is shorter
+            self._size = index * self.block_size + len(content)
+        self._blocks[index] = content
+        if len(self._blocks) > self.cache_blocks:
+            self._blocks.popitem(last=False)
+        return content
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        self._checkClosed()
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = self.size + offset
+        else:
+            raise ValueError(f"invalid whence ({whence})")
+        if position < 0:
+            raise ValueError(f"negative seek position {position}")
+        self._position = position
+        return position
+
+    def tell(self) -> int:
+        self._checkClosed()
+        return self._position
+
+    def read(self, size: Optional[int] = -1) -> bytes:
+        self._checkClosed()
+        if size is None or size < 0:
+            size = None
+        chunks = []
+        remaining = size
+        while remaining is None or remaining > 0:
+            if self._size is not None and self._position >= self._size:
+                break
+            index, start = divmod(self._position, self.block_size)
+            block = self._block(index)
+            chunk = block[start:] if remaining is None else block[start:start + remaining]
+            if not chunk:
+                break
+            chunks.append(chunk)
+            self._position += len(chunk)
+            if remaining is not None:
+                remaining -= len(chunk)
+        return b"".join(chunks)
+
+    def readall(self) -> bytes:
+        return self.read()
+
+    def readinto(self, buffer) -> int:
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
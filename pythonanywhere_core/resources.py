@@ -1,5 +1,17 @@
-from pythonanywhere_core.base import call_api, get_api_endpoint, get_username
+import heapq
+import itertools
+import math
+import threading
+import time
+from array import array
+from concurrent.futures import Future
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from pythonanywhere_core.base import Timeout, call_api, decode_json, get_api_endpoint, get_username
 from pythonanywhere_core.exceptions import PythonAnywhereApiException
+from pythonanywhere_core.models import CPUUsage
+from pythonanywhere_core.timestamps import parse_fields
 
 
 class CPU:
@@ -12,19 +24,322 @@ class CPU:
 
     Methods:
         - :meth:`CPU.get_cpu_usage`: Get current CPU usage information.
+        - :meth:`CPU.get_cpu_usage_model`: Get current CPU usage information as a model.
+
+    See :class:`CPUSampler` to track usage over time and
+    :class:`CPUBudgetScheduler` to pace work to the daily allowance.
+
+    :param timeout: timeout of API calls, see :func:`~pythonanywhere_core.base.call_api`
     """
     
-    def __init__(self):
+    def __init__(self, timeout: Timeout = None):
+        self.timeout = timeout
         self.base_url = get_api_endpoint(username=get_username(), flavor="cpu")
 
     def get_cpu_usage(self):
         """Get current CPU usage information.
         
         :returns: dictionary with CPU usage information including daily limit,
-                 total usage, and next reset time
+                 total usage, and next reset time (as datetime)
         :raises PythonAnywhereApiException: if API call fails
         """
-        response = call_api(url=self.base_url, method="GET")
+        return parse_fields(self._fetch_cpu_usage(), datetimes=["next_reset_time"])
+
+    def get_cpu_usage_model(self) -> CPUUsage:
+        """Get current CPU usage information as a model.
+
+        The next reset time is decoded only when accessed.
+
+        :returns: :class:`~pythonanywhere_core.models.CPUUsage`
+        :raises PythonAnywhereApiException: if API call fails
+        """
+        return CPUUsage.from_dict(self._fetch_cpu_usage())
+
+    def _fetch_cpu_usage(self) -> dict:
+        response = call_api(url=self.base_url, method="GET", timeout=self.timeout)
         if not response.ok:
             raise PythonAnywhereApiException(f"GET to {self.base_url} failed, got {response}:{response.text}")
-        return response.json()
\ No newline at end of file
+        return decode_json(response)
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+class CPUSampler:
+    """Samples :meth:`CPU.get_cpu_usage` periodically in a background thread.
+
+    Samples are kept in a ring buffer backed by two ``array('d')`` of
+    `capacity` items (timestamps and used CPU seconds), so memory stays
+    bounded however long the sampler runs.  Samples taken before the
+    latest daily reset are ignored by the statistics.
+
+    Methods:
+        - :meth:`CPUSampler.start`: Start sampling in a background thread.
+        - :meth:`CPUSampler.stop`: Stop background sampling.
+        - :meth:`CPUSampler.sample`: Take a single sample.
+        - :meth:`CPUSampler.samples`: Get samples, oldest first.
+        - :meth:`CPUSampler.burn_rate`: Get CPU seconds used per second.
+        - :meth:`CPUSampler.projected_exhaustion`: Get time when the daily allowance runs out.
+        - :meth:`CPUSampler.percentiles`: Get percentiles of burn rate between samples.
+    """
+
+    def __init__(self, cpu: Optional[CPU] = None, interval: float = 60, capacity: int = 1440) -> None:
+        self.cpu = cpu or CPU()
+        self.interval = interval
+        self.capacity = capacity
+        self.limit: Optional[float] = None
+        self.next_reset_time: Optional[datetime] = None
+        self.last_error: Optional[Exception] = None
+        self._timestamps = array("d", bytes(8 * capacity))
+        self._usage = array("d", bytes(8 * capacity))
+        self._count = 0
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "CPUSampler":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        """Starts sampling every `interval` seconds in a daemon thread."""
+
+        if self._thread is not None:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="cpu-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stops background sampling and waits for the thread to finish."""
+
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while True:
+            try:
+                self.sample()
+            except Exception as e:
+                self.last_error = e
+            if self._stopped.wait(self.interval):
+                return
+
+    def sample(self) -> dict:
+        """Fetches current CPU usage and records it.
+
+        :returns: dictionary returned by :meth:`CPU.get_cpu_usage`
+        :raises PythonAnywhereApiException: if API call fails
+        """
+        usage = self.cpu.get_cpu_usage()
+        with self._lock:
+            self.limit = usage["daily_cpu_limit_seconds"]
+            self.next_reset_time = usage["next_reset_time"]
+        self.record(time.time(), usage["daily_cpu_total_usage_seconds"])
+        return usage
+
+    def record(self, timestamp: float, used_seconds: float) -> None:
+        """Records a sample.
+
+        :param timestamp: time of the sample as seconds since the epoch
+        :param used_seconds: CPU seconds used since the last daily reset
+        """
+        with self._lock:
+            index = self._count % self.capacity
+            self._timestamps[index] = timestamp
+            self._usage[index] = used_seconds
+            self._count += 1
+
+    def samples(self) -> List[Tuple[float, float]]:
+        """Returns recorded samples since the latest daily reset.
+
+        :returns: list of (timestamp, used CPU seconds) tuples, oldest first
+        """
+        with self._lock:
+            stored = min(self._count, self.capacity)
+            first = self._count - stored
+            result = [
+                (self._timestamps[i % self.capacity], self._usage[i % self.capacity])
+                for i in range(first, self._count)
+            ]
+        for position in range(len(result) - 1, 0, -1):
+            if result[position][1] < result[position - 1][1]:
+                return result[position:]
+        return result
+
+    def _rates(self) -> List[float]:
+        samples = self.samples()
+        return [
+            (used - previous_used) / (timestamp - previous_timestamp)
+            for (previous_timestamp, previous_used), (timestamp, used) in zip(samples, samples[1:])
+            if timestamp > previous_timestamp
+        ]
+
+    def burn_rate(self, window: Optional[float] = None) -> Optional[float]:
+        """Returns average CPU seconds used per second.
+
+        :param window: only use samples from that many last seconds
+        :returns: burn rate, or None if there are fewer than two samples
+        """
+        samples = self.samples()
+        if window is not None and samples:
+            samples = [sample for sample in samples if sample[0] >= samples[-1][0] - window]
+        if len(samples) < 2 or samples[-1][0] <= samples[0][0]:
+            return None
+        return (samples[-1][1] - samples[0][1]) / (samples[-1][0] - samples[0][0])
+
+    def projected_exhaustion(self, window: Optional[float] = None) -> Optional[datetime]:
+        """Returns time when the daily CPU allowance will be used up at the
+        current burn rate.
+
+        :param window: passed to :meth:`burn_rate`
+        :returns: UTC datetime, or None if the allowance won't be used up
+            before the next reset (or there isn't enough data yet)
+        """
+        rate = self.burn_rate(window)
+        samples = self.samples()
+        if not rate or rate <= 0 or self.limit is None:
+            return None
+        last_timestamp, used = samples[-1]
+        exhaustion = datetime.fromtimestamp(last_timestamp + max(self.limit - used, 0) / rate, timezone.utc)
+        if self.next_reset_time is not None and exhaustion >= _as_utc(self.next_reset_time):
+            return None
+        return exhaustion
+
+    def percentiles(self, percents: Iterable[float] = (50, 90, 99)) -> Dict[float, float]:
+        """Returns percentiles of burn rates between consecutive samples.
+
+        :param percents: percentiles to compute, between 0 and 100
+        :returns: dictionary mapping each percent to the burn rate (nearest
+            rank), empty if there are fewer than two samples
+        """
+        rates = sorted(self._rates())
+        if not rates:
+            return {}
+        return {
+            percent: rates[min(len(rates) - 1, max(0, math.ceil(percent / 100 * len(rates)) - 1))]
+            for percent in percents
+        }
+
+
+class CPUBudgetScheduler:
+    """Runs submitted work units paced so that the daily CPU allowance
+    lasts until the next reset.
+
+    Work units are run in order of priority (lower number first).  The
+    allowance left (from :meth:`CPU.get_cpu_usage`, cached for
+    `cache_ttl` seconds) divided by the time left until the reset gives
+    the rate at which CPU seconds can be spent; each unit is delayed so
+    that its estimated `cost` fits that rate.  Units that would need to
+    wait longer than `max_delay`, or don't fit in the remaining allowance
+    at all, are deferred to a later :meth:`run_pending` call.  Units with
+    priority of `critical_priority` or lower always run immediately.
+
+    Methods:
+        - :meth:`CPUBudgetScheduler.submit`: Queue a work unit.
+        - :meth:`CPUBudgetScheduler.run_pending`: Run queued work units the budget allows.
+        - :meth:`CPUBudgetScheduler.remaining`: Get CPU seconds left until the next reset.
+        - :meth:`CPUBudgetScheduler.allowed_rate`: Get CPU seconds per second that can be spent.
+    """
+
+    def __init__(
+        self,
+        cpu: Optional[CPU] = None,
+        cache_ttl: float = 60,
+        max_delay: float = 60,
+        critical_priority: int = 0,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.cpu = cpu or CPU()
+        self.cache_ttl = cache_ttl
+        self.max_delay = max_delay
+        self.critical_priority = critical_priority
+        self._clock = clock
+        self._sleep = sleep
+        self._queue = []
+        self._counter = itertools.count()
+        self._usage: Optional[dict] = None
+        self._fetched_at = 0.0
+        self._spent_since_fetch = 0.0
+        self._next_slot = 0.0
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def submit(self, func: Callable, *args, priority: int = 10, cost: float = 1.0, **kwargs) -> Future:
+        """Queues a work unit calling ``func(*args, **kwargs)``.
+
+        :param func: callable to run
+        :param priority: lower numbers run first
+        :param cost: estimated CPU seconds the unit uses
+        :returns: future with the unit's result once it has run
+        """
+        future = Future()
+        heapq.heappush(self._queue, (priority, next(self._counter), cost, future, func, args, kwargs))
+        return future
+
+    def _get_usage(self) -> dict:
+        now = self._clock()
+        if self._usage is None or now - self._fetched_at >= self.cache_ttl:
+            self._usage = self.cpu.get_cpu_usage()
+            self._fetched_at = now
+            self._spent_since_fetch = 0.0
+        return self._usage
+
+    def remaining(self) -> float:
+        """Returns CPU seconds left until the next reset, including
+        estimated costs of units run since usage was last fetched."""
+
+        usage = self._get_usage()
+        used = usage["daily_cpu_total_usage_seconds"] + self._spent_since_fetch
+        return max(usage["daily_cpu_limit_seconds"] - used, 0.0)
+
+    def allowed_rate(self) -> float:
+        """Returns CPU seconds per second that can be spent so that the
+        allowance lasts until the next reset."""
+
+        remaining = self.remaining()
+        reset = _as_utc(self._get_usage()["next_reset_time"]).timestamp()
+        time_left = reset - self._clock()
+        if time_left <= 0:
+            return float("inf")
+        return remaining / time_left
+
+    def run_pending(self) -> int:
+        """Runs queued work units in priority order as the budget allows.
+
+        Stops at the first unit that has to be deferred, so lower priority
+        units never overtake it.
+
+        :returns: number of units run
+        """
+        ran = 0
+        while self._queue:
+            priority, _, cost, future, func, args, kwargs = self._queue[0]
+            if priority > self.critical_priority:
+                if cost > self.remaining():
+                    break
+                rate = self.allowed_rate()
+                start = max(self._clock(), self._next_slot)
+                delay = start - self._clock()
+                if delay > self.max_delay:
+                    break
+                if delay > 0:
+                    self._sleep(delay)
+                self._next_slot = start + (cost / rate if rate > 0 else 0)
+            heapq.heappop(self._queue)
+            self._spent_since_fetch += cost
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(func(*args, **kwargs))
+                except Exception as e:
+                    future.set_exception(e)
+            ran += 1
+        return ran
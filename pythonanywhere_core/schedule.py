@@ -1,9 +1,18 @@
-from typing import List, Optional
+from functools import partial
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
 from typing_extensions import Literal
 
-from pythonanywhere_core.base import call_api, get_api_endpoint, get_username
+from pythonanywhere_core.base import Timeout, call_api, decode_json, get_api_endpoint, get_username, iter_decode_json
+from pythonanywhere_core.bulk import DEFAULT_MAX_WORKERS, failures, run_bulk
 from pythonanywhere_core.exceptions import PythonAnywhereApiException
+from pythonanywhere_core.journal import OperationJournal
+from pythonanywhere_core.models import ScheduledTask
+from pythonanywhere_core.timestamps import parse_fields
+
+
+def _parse_task(task: dict) -> dict:
+    return parse_fields(task, dates=["expiry"])
 
 
 class Schedule:
@@ -21,57 +30,84 @@ class Schedule:
 
     Methods:
         - :meth:`Schedule.get_list`: Retrieve the list of all scheduled tasks.
+        - :meth:`Schedule.iter_tasks`: Iterate over all scheduled tasks as models.
         - :meth:`Schedule.create`: Create a new scheduled task.
         - :meth:`Schedule.get_specs`: Retrieve the specifications of an existing task.
         - :meth:`Schedule.delete`: Delete an existing task.
         - :meth:`Schedule.update`: Update an existing task.
+        - :meth:`Schedule.create_many`: Create many tasks concurrently.
+        - :meth:`Schedule.update_many`: Update many tasks concurrently.
+        - :meth:`Schedule.set_enabled_many`: Enable or disable many tasks concurrently.
+        - :meth:`Schedule.delete_many`: Delete many tasks concurrently.
+        - :meth:`Schedule.diff`: Compare existing tasks with a list of desired tasks.
+        - :meth:`Schedule.sync`: Make existing tasks match a list of desired tasks.
+
+    :param timeout: timeout of API calls, see :func:`~pythonanywhere_core.base.call_api`
     """
 
     base_url: str = get_api_endpoint(username=get_username(), flavor="schedule")
 
-    def create(self, params: dict) -> Optional[dict]:
+    def __init__(self, timeout: Timeout = None) -> None:
+        self.timeout = timeout
+
+    def create(self, params: dict) -> dict:
         """Creates new scheduled task using `params`.
 
         Params should be: command, enabled (True or False), interval (daily or
         hourly), hour (24h format) and minute.
 
         :param params: dictionary with required scheduled task specs
-        :returns: dictionary with created task specs"""
-
-        result = call_api(self.base_url, "POST", json=params)
+        :returns: dictionary with created task specs (empty if API
+            response has no body)"""
 
-        if result.status_code == 201:
-            return result.json()
+        result = call_api(self.base_url, "POST", json=params, timeout=self.timeout)
 
         if not result.ok:
             raise PythonAnywhereApiException(
                 f"POST to set new task via API failed, got {result}: {result.text}"
             )
 
+        return _parse_task(decode_json(result)) if result.content else {}
+
     def delete(self, task_id: int) -> Literal[True]:
         """Deletes scheduled task by id.
 
         :param task_id: scheduled task to be deleted id number
-        :returns: True when API response is 204"""
+        :returns: True when API response is successful"""
 
         result = call_api(
-            f"{self.base_url}{task_id}/", "DELETE"
+            f"{self.base_url}{task_id}/", "DELETE", timeout=self.timeout
         )
 
-        if result.status_code == 204:
-            return True
-
         if not result.ok:
             raise PythonAnywhereApiException(
                 f"DELETE via API on task {task_id} failed, got {result}: {result.text}"
             )
 
+        return True
+
     def get_list(self) -> List[dict]:
         """Gets list of existing scheduled tasks.
 
         :returns: list of existing scheduled tasks specs"""
 
-        return call_api(self.base_url, "GET").json()
+        return [_parse_task(task) for task in decode_json(call_api(self.base_url, "GET", timeout=self.timeout))]
+
+    def iter_tasks(self) -> Iterator[ScheduledTask]:
+        """Iterates over existing scheduled tasks.
+
+        The response is streamed and decoded one task at a time; dates are
+        decoded only when accessed on the returned models.
+
+        :returns: iterator of :class:`~pythonanywhere_core.models.ScheduledTask`
+        :raises PythonAnywhereApiException: if tasks can't be listed"""
+
+        result = call_api(self.base_url, "GET", stream=True, timeout=self.timeout)
+        with result:
+            if result.status_code != 200:
+                raise PythonAnywhereApiException(f"GET to list tasks failed, got {result.text}")
+            for task in iter_decode_json(result):
+                yield ScheduledTask.from_dict(task)
 
     def get_specs(self, task_id: int) -> dict:
         """Get task specs by id.
@@ -80,10 +116,10 @@ class Schedule:
         :returns: dictionary of existing task specs"""
 
         result = call_api(
-            f"{self.base_url}{task_id}/", "GET"
+            f"{self.base_url}{task_id}/", "GET", timeout=self.timeout
         )
         if result.status_code == 200:
-            return result.json()
+            return _parse_task(decode_json(result))
         else:
             raise PythonAnywhereApiException(
                 f"Could not get task with id {task_id}. Got result {result}: {result.text}"
@@ -104,10 +140,186 @@ class Schedule:
             f"{self.base_url}{task_id}/",
             "PATCH",
             json=params,
+            timeout=self.timeout,
         )
         if result.status_code == 200:
-            return result.json()
+            return _parse_task(decode_json(result))
         else:
             raise PythonAnywhereApiException(
                 f"Could not update task {task_id}. Got {result}: {result.text}"
             )
+
+    def create_many(
+        self, tasks: List[dict], max_workers: int = DEFAULT_MAX_WORKERS, journal: Optional[OperationJournal] = None
+    ) -> Dict[int, Any]:
+        """Creates scheduled tasks concurrently, see :meth:`create`.
+
+        With a `journal`, tasks created by an interrupted call (with the
+        same params) are skipped and left out of the result.
+
+        :param tasks: list of task params
+        :param max_workers: maximum number of concurrent API calls
+        :param journal: :class:`~pythonanywhere_core.journal.OperationJournal` of created tasks
+        :returns: dictionary mapping position of each task in `tasks` to
+            created task specs or the exception raised while creating it"""
+
+        return run_bulk(
+            lambda index: self.create(tasks[index]),
+            range(len(tasks)),
+            max_workers=max_workers,
+            journal=journal,
+            journal_key=lambda index: ("create", tasks[index]),
+        )
+
+    def update_many(
+        self,
+        updates: Dict[int, dict],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        journal: Optional[OperationJournal] = None,
+    ) -> Dict[int, Any]:
+        """Updates scheduled tasks concurrently, see :meth:`update`.
+
+        With a `journal`, updates applied by an interrupted call (with the
+        same params) are skipped and left out of the result.
+
+        :param updates: dictionary mapping task ids to params to update
+        :param max_workers: maximum number of concurrent API calls
+        :param journal: :class:`~pythonanywhere_core.journal.OperationJournal` of applied updates
+        :returns: dictionary mapping task ids to updated task specs or the
+            exception raised while updating the task"""
+
+        return run_bulk(
+            lambda task_id: self.update(task_id, updates[task_id]),
+            updates,
+            max_workers=max_workers,
+            journal=journal,
+            journal_key=lambda task_id: ("update", task_id, updates[task_id]),
+        )
+
+    def set_enabled_many(
+        self,
+        task_ids: Iterable[int],
+        enabled: bool,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        journal: Optional[OperationJournal] = None,
+    ) -> Dict[int, Any]:
+        """Enables or disables scheduled tasks concurrently.
+
+        :param task_ids: ids of tasks to change
+        :param enabled: True to enable tasks, False to disable them
+        :param max_workers: maximum number of concurrent API calls
+        :param journal: see :meth:`update_many`
+        :returns: same as :meth:`update_many`"""
+
+        return self.update_many(
+            {task_id: {"enabled": enabled} for task_id in task_ids}, max_workers=max_workers, journal=journal
+        )
+
+    def delete_many(
+        self,
+        task_ids: Iterable[int],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        journal: Optional[OperationJournal] = None,
+    ) -> Dict[int, Any]:
+        """Deletes scheduled tasks concurrently, see :meth:`delete`.
+
+        With a `journal`, tasks deleted by an interrupted call are skipped
+        and left out of the result.
+
+        :param task_ids: ids of tasks to delete
+        :param max_workers: maximum number of concurrent API calls
+        :param journal: :class:`~pythonanywhere_core.journal.OperationJournal` of deleted tasks
+        :returns: dictionary mapping task ids to True or the exception
+            raised while deleting the task"""
+
+        return run_bulk(
+            self.delete,
+            task_ids,
+            max_workers=max_workers,
+            journal=journal,
+            journal_key=lambda task_id: ("delete", task_id),
+        )
+
+    def diff(self, tasks: List[dict], delete_missing: bool = True) -> Dict[str, object]:
+        """Compares desired `tasks` with existing scheduled tasks.
+
+        Desired tasks are matched with existing ones by command.  Fields
+        the API returns as dates (e.g. ``expiry``) are compared as parsed
+        values, so ``"2025-10-16"`` matches ``date(2025, 10, 16)``.
+        Existing tasks without a match are marked for deletion when
+        `delete_missing` is True.
+
+        :param tasks: list of desired task params, as for :meth:`create`
+        :param delete_missing: whether unmatched existing tasks should be deleted
+        :returns: dictionary with ``create`` (list of params), ``update``
+            (dictionary of task id to params that differ) and ``delete``
+            (list of task ids) keys"""
+
+        commands = [task["command"] for task in tasks]
+        duplicated = {command for command in commands if commands.count(command) > 1}
+        if duplicated:
+            raise ValueError(f"Desired tasks should have unique commands, got duplicates: {sorted(duplicated)}")
+
+        existing = {}
+        to_delete = []
+        for task in self.get_list():
+            if task["command"] in existing:
+                to_delete.append(task["id"])
+            else:
+                existing[task["command"]] = task
+
+        to_create = []
+        to_update = {}
+        for params in tasks:
+            current = existing.pop(params["command"], None)
+            if current is None:
+                to_create.append(params)
+                continue
+            current, desired = _parse_task(dict(current)), _parse_task(dict(params))
+            changes = {key: params[key] for key, value in desired.items() if current.get(key) != value}
+            if changes:
+                to_update[current["id"]] = changes
+
+        if delete_missing:
+            to_delete.extend(task["id"] for task in existing.values())
+        else:
+            to_delete = []
+        return {"create": to_create, "update": to_update, "delete": sorted(to_delete)}
+
+    def sync(
+        self,
+        tasks: List[dict],
+        delete_missing: bool = True,
+        dry_run: bool = False,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ) -> Dict[str, object]:
+        """Makes existing scheduled tasks match desired `tasks`.
+
+        Fetches existing tasks once (see :meth:`diff`) and only issues the
+        needed :meth:`create`, :meth:`update` and :meth:`delete` calls,
+        concurrently, so matched tasks keep their ids and logs.
+
+        :param tasks: list of desired task params, as for :meth:`create`
+        :param delete_missing: whether unmatched existing tasks should be deleted
+        :param dry_run: if True, only compute the changes
+        :param max_workers: maximum number of concurrent API calls
+        :returns: dictionary returned by :meth:`diff` with additional
+            ``failures`` key mapping ``("create", command)``,
+            ``("update", task_id)`` or ``("delete", task_id)`` to exceptions
+            raised while applying them (empty for dry runs)"""
+
+        changes = self.diff(tasks, delete_missing=delete_missing)
+        changes["failures"] = {}
+        if dry_run:
+            return changes
+
+        calls = {}
+        for params in changes["create"]:
+            calls[("create", params["command"])] = partial(self.create, params)
+        for task_id, params in changes["update"].items():
+            calls[("update", task_id)] = partial(self.update, task_id, params)
+        for task_id in changes["delete"]:
+            calls[("delete", task_id)] = partial(self.delete, task_id)
+        results = run_bulk(lambda key: calls[key](), calls, max_workers=max_workers)
+        changes["failures"] = failures(results)
+        return changes
@@ -0,0 +1,119 @@
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from pythonanywhere_core.bulk import DEFAULT_MAX_WORKERS, failures, run_bulk
+from pythonanywhere_core.schedule import Schedule
+
+MINUTES_PER_DAY = 24 * 60
+
+
+def _is_active(task: dict) -> bool:
+    return task.get("enabled", True)
+
+
+def next_runs(task: dict, after: datetime, count: int = 1) -> List[datetime]:
+    """Computes next run times of a scheduled `task` after `after`.
+
+    Uses the same semantics as :meth:`Schedule.create`: hourly tasks run
+    every hour at `minute`, daily tasks run every day at `hour`:`minute`.
+    Scheduled tasks run on UTC time, so `after` should be in UTC too.
+
+    :param task: task specs, as returned by :meth:`Schedule.get_list`
+    :param after: time to compute next runs from
+    :param count: number of runs to compute
+    :returns: list of run times, empty for disabled tasks"""
+
+    if not _is_active(task):
+        return []
+    if task["interval"] == "hourly":
+        step = timedelta(hours=1)
+        first = after.replace(minute=task["minute"], second=0, microsecond=0)
+    else:
+        step = timedelta(days=1)
+        first = after.replace(hour=task["hour"], minute=task["minute"], second=0, microsecond=0)
+    if first <= after:
+        first += step
+    return [first + step * run for run in range(count)]
+
+
+def start_load(tasks: List[dict]) -> Counter:
+    """Counts enabled tasks starting at each minute of the day.
+
+    :param tasks: list of task specs
+    :returns: counter mapping minute of the day (0-1439) to number of tasks
+        starting then"""
+
+    load = Counter()
+    for task in filter(_is_active, tasks):
+        if task["interval"] == "hourly":
+            for hour in range(24):
+                load[hour * 60 + task["minute"]] += 1
+        else:
+            load[task["hour"] * 60 + task["minute"]] += 1
+    return load
+
+
+def plan_spread(tasks: List[dict]) -> Dict[int, dict]:
+    """Plans new start times spreading enabled `tasks` evenly.
+
+    Hourly tasks are spread evenly over the minutes of an hour, then daily
+    tasks are spread over the day, each one put at the least busy minute
+    near its evenly spaced slot (later rather than earlier on ties).  Tasks
+    keep their relative order.
+
+    :param tasks: list of task specs, as returned by :meth:`Schedule.get_list`
+    :returns: dictionary mapping ids of tasks that should move to params for
+        :meth:`Schedule.update` (``minute`` for hourly tasks, ``hour`` and
+        ``minute`` for daily ones)"""
+
+    active = [task for task in tasks if _is_active(task)]
+    hourly = sorted((task for task in active if task["interval"] == "hourly"), key=lambda t: (t["minute"], t["id"]))
+    daily = sorted(
+        (task for task in active if task["interval"] != "hourly"), key=lambda t: (t["hour"], t["minute"], t["id"])
+    )
+
+    plan = {}
+    load = Counter()
+    for slot, task in enumerate(hourly):
+        minute = slot * 60 // len(hourly)
+        for hour in range(24):
+            load[hour * 60 + minute] += 1
+        if minute != task["minute"]:
+            plan[task["id"]] = {"minute": minute}
+
+    if daily:
+        spacing = MINUTES_PER_DAY / len(daily)
+        for slot, task in enumerate(daily):
+            ideal = int(slot * spacing)
+            window = range(ideal - int(spacing // 2), ideal + int(spacing // 2) + 1)
+            start = min(
+                window, key=lambda minute: (load[minute % MINUTES_PER_DAY], abs(minute - ideal), minute < ideal)
+            )
+            start %= MINUTES_PER_DAY
+            load[start] += 1
+            hour, minute = divmod(start, 60)
+            if (hour, minute) != (task["hour"], task["minute"]):
+                plan[task["id"]] = {"hour": hour, "minute": minute}
+    return plan
+
+
+def spread_tasks(
+    schedule: Optional[Schedule] = None, apply: bool = False, max_workers: int = DEFAULT_MAX_WORKERS
+) -> Dict[str, dict]:
+    """Suggests (or applies) start times spreading scheduled tasks of the
+    current user evenly, see :func:`plan_spread`.
+
+    :param schedule: :class:`Schedule` instance to use
+    :param apply: if True, update tasks with the planned start times
+    :param max_workers: maximum number of concurrent API calls
+    :returns: dictionary with ``plan`` (result of :func:`plan_spread`) and
+        ``failures`` (task id to exception raised while updating it) keys"""
+
+    schedule = schedule or Schedule()
+    plan = plan_spread(schedule.get_list())
+    result = {"plan": plan, "failures": {}}
+    if apply:
+        results = run_bulk(lambda task_id: schedule.update(task_id, plan[task_id]), plan, max_workers=max_workers)
+        result["failures"] = failures(results)
+    return result
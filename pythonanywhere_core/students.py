@@ -1,6 +1,9 @@
-from typing import Optional
+from typing import Any, Dict, Iterable, Iterator, Optional
 
-from pythonanywhere_core.base import call_api, get_api_endpoint, get_username
+from pythonanywhere_core.base import Timeout, call_api, decode_json, get_api_endpoint, get_username, iter_decode_json
+from pythonanywhere_core.bulk import DEFAULT_MAX_WORKERS, run_bulk
+from pythonanywhere_core.exceptions import PythonAnywhereApiException
+from pythonanywhere_core.journal import OperationJournal
 
 
 class StudentsAPI:
@@ -18,23 +21,47 @@ class StudentsAPI:
 
     Methods:
         - :meth:`StudentsAPI.get`: Retrieve a list of students.
+        - :meth:`StudentsAPI.iter_students`: Iterate over students without loading the whole list.
         - :meth:`StudentsAPI.delete`: Remove a student.
+        - :meth:`StudentsAPI.delete_many`: Remove many students concurrently.
+
+    :param timeout: timeout of API calls, see :func:`~pythonanywhere_core.base.call_api`
     """
 
     base_url: str = get_api_endpoint(username=get_username(), flavor="students")
 
+    def __init__(self, timeout: Timeout = None) -> None:
+        self.timeout = timeout
+
     def get(self) -> Optional[dict]:
         """Returns list of PythonAnywhere students related with user's account.
 
         :returns: dictionary with students info
         """
 
-        result = call_api(self.base_url, "GET")
+        result = call_api(self.base_url, "GET", timeout=self.timeout)
 
         if result.status_code == 200:
-            return result.json()
+            return decode_json(result)
+
+        raise PythonAnywhereApiException(f"GET to list students failed, got {result.text}")
 
-        raise Exception(f"GET to list students failed, got {result.text}")
+    def iter_students(self, chunk_size: int = 64 * 1024) -> Iterator[dict]:
+        """Yields PythonAnywhere students related with user's account.
+
+        The response is streamed and decoded one student at a time, so the
+        whole list is never held in memory.
+
+        :param chunk_size: number of bytes to read from the response at once
+        :returns: iterator of dictionaries with student info
+        """
+
+        result = call_api(self.base_url, "GET", stream=True, timeout=self.timeout)
+
+        with result:
+            if result.status_code != 200:
+                raise PythonAnywhereApiException(f"GET to list students failed, got {result.text}")
+            yield from iter_decode_json(result, key="students", chunk_size=chunk_size)
 
     def delete(self, student_username: str) -> Optional[int]:
         """Returns 204 if student has been successfully removed, raises otherwise.
@@ -45,12 +72,32 @@ class StudentsAPI:
 
         url = f"{self.base_url}{student_username}"
 
-        result = call_api(url, "DELETE")
+        result = call_api(url, "DELETE", timeout=self.timeout)
 
         if result.status_code == 204:
             return result.status_code
 
         detail = f": {result.text}" if result.text else ""
-        raise Exception(
+        raise PythonAnywhereApiException(
             f"DELETE to remove student {student_username!r} failed, got {result}{detail}"
         )
+
+    def delete_many(
+        self,
+        student_usernames: Iterable[str],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        journal: Optional[OperationJournal] = None,
+    ) -> Dict[str, Any]:
+        """Removes students concurrently, see :meth:`delete`.
+
+        With a `journal`, students removed by an interrupted call are
+        skipped and left out of the result.
+
+        :param student_usernames: usernames of students to be removed
+        :param max_workers: maximum number of concurrent API calls
+        :param journal: :class:`~pythonanywhere_core.journal.OperationJournal` of removed students
+        :returns: dictionary mapping each username to 204 or the exception
+            raised while removing the student
+        """
+
+        return run_bulk(self.delete, student_usernames, max_workers=max_workers, journal=journal)
@@ -0,0 +1,56 @@
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, Optional
+
+
+def parse_datetime(value: str) -> datetime:
+    """Parses timestamp returned by the API.
+
+    Uses :meth:`datetime.fromisoformat` which handles formats used by the
+    API (e.g. ``2018-08-24T17:16:23+00:00`` or ``2025-08-09T03:26:37``) and
+    is much faster than :func:`dateutil.parser.parse`.  Anything else is
+    passed to ``dateutil``, which is imported only when needed.
+
+    :param value: timestamp string
+    :returns: parsed datetime, timezone-aware if ``value`` specifies a timezone
+    """
+    try:
+        if value.endswith("Z"):
+            return datetime.fromisoformat(f"{value[:-1]}+00:00")
+        return datetime.fromisoformat(value)
+    except ValueError:
+        from dateutil.parser import parse
+
+        return parse(value)
+
+
+def parse_date(value: str) -> date:
+    """Parses date returned by the API (e.g. ``2025-10-16``).
+
+    :param value: date string
+    :returns: parsed date
+    """
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        return parse_datetime(value).date()
+
+
+def parse_fields(data: Dict[str, Any], datetimes: Iterable[str] = (), dates: Iterable[str] = ()) -> Dict[str, Any]:
+    """Parses timestamp fields of API response ``data`` in place.
+
+    Fields that are missing or empty are left as they are.
+
+    :param data: dictionary decoded from API response
+    :param datetimes: names of fields holding timestamps
+    :param dates: names of fields holding dates
+    :returns: ``data``, for convenience
+    """
+    for field in datetimes:
+        value: Optional[str] = data.get(field)
+        if isinstance(value, str) and value:
+            data[field] = parse_datetime(value)
+    for field in dates:
+        value = data.get(field)
+        if isinstance(value, str) and value:
+            data[field] = parse_date(value)
+    return data
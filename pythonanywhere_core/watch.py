@@ -0,0 +1,341 @@
+import ctypes
+import ctypes.util
+import os
+import posixpath
+import select
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Set, Tuple, Union
+
+from pythonanywhere_core.bulk import DEFAULT_MAX_WORKERS, failures, run_bulk
+from pythonanywhere_core.files import Files
+from pythonanywhere_core.ignore import IgnoreRules, IgnoreTree, walk
+from pythonanywhere_core.webapp import Webapp
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_IGNORED = 0x00008000
+IN_Q_OVERFLOW = 0x00004000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+_EVENT = struct.Struct("iIII")
+
+
+class PollingWatcher:
+    """Detects changes below `root` by comparing snapshots of modification
+    times and sizes of files, taken with :func:`~pythonanywhere_core.ignore.walk`.
+
+    :param root: local directory to watch
+    :param rules: rules of paths to ignore
+    :param ignore_file_names: names of ignore files to read while walking
+    :param interval: seconds between snapshots
+    """
+
+    def __init__(
+        self,
+        root: Union[str, Path],
+        rules: Optional[IgnoreRules] = None,
+        ignore_file_names: Iterable[str] = (),
+        interval: float = 1.0,
+    ) -> None:
+        self.root = Path(root)
+        self.rules = rules
+        self.ignore_file_names = tuple(ignore_file_names)
+        self.interval = interval
+        self._snapshot = self._take_snapshot()
+
+    def _take_snapshot(self) -> Dict[str, Tuple[int, int]]:
+        snapshot = {}
+        for relative, local_path, is_dir in walk(self.root, self.rules, self.ignore_file_names):
+            if not is_dir:
+                try:
+                    stat = os.stat(local_path)
+                except FileNotFoundError:
+                    continue
+                snapshot[relative] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def poll(self, timeout: Optional[float] = None) -> Set[str]:
+        """Waits `timeout` seconds (`interval` if None) and returns
+        relative paths of files created, changed or deleted since the
+        previous call."""
+
+        time.sleep(self.interval if timeout is None else timeout)
+        snapshot = self._take_snapshot()
+        previous, self._snapshot = self._snapshot, snapshot
+        return {path for path in previous.keys() | snapshot.keys() if previous.get(path) != snapshot.get(path)}
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    """Detects changes below `root` with Linux inotify (through ctypes),
+    watching every directory which isn't ignored.
+
+    Raises :exc:`OSError` when inotify isn't available.
+
+    :param root: local directory to watch
+    :param rules: rules of paths to ignore
+    :param ignore_file_names: names of ignore files to honour
+    """
+
+    def __init__(
+        self,
+        root: Union[str, Path],
+        rules: Optional[IgnoreRules] = None,
+        ignore_file_names: Iterable[str] = (),
+    ) -> None:
+        if not sys.platform.startswith("linux"):
+            raise OSError(f"inotify is not available on {sys.platform}")
+        self.root = Path(root)
+        self.ignore = IgnoreTree(root, rules, ignore_file_names)
+        library = ctypes.util.find_library("c")
+        self._libc = ctypes.CDLL(library, use_errno=True)
+        if not hasattr(self._libc, "inotify_init1"):
+            raise OSError("inotify is not available")
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+        self._directories: Dict[int, str] = {}
+        self._buffer = b""
+        self._add_tree("")
+
+    def _add_watch(self, relative_dir: str) -> None:
+        path = os.fsencode(self.root / relative_dir)
+        descriptor = self._libc.inotify_add_watch(self._fd, path, _WATCH_MASK)
+        if descriptor >= 0:
+            self._directories[descriptor] = relative_dir
+
+    def _add_tree(self, relative_dir: str) -> Set[str]:
+        files = set()
+        pending = [relative_dir]
+        while pending:
+            current = pending.pop()
+            self._add_watch(current)
+            try:
+                with os.scandir(self.root / current) as entries:
+                    for entry in entries:
+                        relative = posixpath.join(current, entry.name) if current else entry.name
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                        if self.ignore.is_ignored(relative, is_dir=is_dir):
+                            continue
+                        if is_dir:
+                            pending.append(relative)
+                        elif entry.is_file():
+                            files.add(relative)
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+        return files
+
+    def _remove_tree(self, relative_dir: str) -> None:
+        for descriptor, watched in list(self._directories.items()):
+            if watched == relative_dir or watched.startswith(f"{relative_dir}/"):
+                self._libc.inotify_rm_watch(self._fd, descriptor)
+                self._directories.pop(descriptor, None)
+
+    def _read_events(self) -> Iterable[Tuple[int, int, str]]:
+        try:
+            self._buffer += os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return
+        while len(self._buffer) >= _EVENT.size:
+            descriptor, mask, _, length = _EVENT.unpack_from(self._buffer)
+            end = _EVENT.size + length
+            if len(self._buffer) < end:
+                break
+            name = os.fsdecode(self._buffer[_EVENT.size:end].rstrip(b"\0"))
+            self._buffer = self._buffer[end:]
+            yield descriptor, mask, name
+
+    def poll(self, timeout: Optional[float] = None) -> Set[str]:
+        """Waits up to `timeout` seconds (forever if None) for changes and
+        returns relative paths of files and directories created, changed,
+        moved or deleted."""
+
+        changed = set()
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return changed
+        for descriptor, mask, name in self._read_events():
+            if mask & IN_Q_OVERFLOW:
+                changed |= self._add_tree("")
+                continue
+            if mask & IN_IGNORED:
+                self._directories.pop(descriptor, None)
+                continue
+            relative_dir = self._directories.get(descriptor)
+            if relative_dir is None or not name:
+                continue
+            relative = posixpath.join(relative_dir, name) if relative_dir else name
+            is_dir = bool(mask & IN_ISDIR)
+            if name in self.ignore.ignore_file_names:
+                self.ignore.invalidate(relative_dir)
+            if self.ignore.is_ignored(relative, is_dir=is_dir):
+                continue
+            if is_dir and mask & (IN_CREATE | IN_MOVED_TO):
+                changed |= self._add_tree(relative)
+            elif is_dir and mask & (IN_DELETE | IN_MOVED_FROM):
+                self._remove_tree(relative)
+                changed.add(relative)
+            elif mask & (IN_CLOSE_WRITE | IN_MOVED_TO | IN_DELETE | IN_MOVED_FROM) or is_dir:
+                changed.add(relative)
+        return changed
+
+    def close(self) -> None:
+        """Stops watching."""
+
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def create_watcher(
+    root: Union[str, Path],
+    rules: Optional[IgnoreRules] = None,
+    ignore_file_names: Iterable[str] = (),
+    interval: float = 1.0,
+):
+    """Returns :class:`InotifyWatcher` for `root` if inotify is available,
+    :class:`PollingWatcher` polling every `interval` seconds otherwise."""
+
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(root, rules, ignore_file_names)
+        except OSError:
+            pass
+    return PollingWatcher(root, rules, ignore_file_names, interval=interval)
+
+
+def plan_sync(root: Union[str, Path], changed: Iterable[str]) -> Tuple[Set[str], Set[str]]:
+    """Decides what to do with `changed` relative paths below local
+    `root` based on its current state.
+
+    :returns: tuple of paths of files to upload and of paths to delete
+        remotely; deletions are collapsed to the topmost directory which
+        no longer exists locally"""
+
+    root = Path(root)
+    uploads, deletes = set(), set()
+    for relative in changed:
+        local_path = root / relative
+        if local_path.is_file():
+            uploads.add(relative)
+        elif not local_path.exists():
+            parent = posixpath.dirname(relative)
+            while parent and not (root / parent).exists():
+                relative, parent = parent, posixpath.dirname(parent)
+            deletes.add(relative)
+    deletes = {path for path in deletes if not any(path.startswith(f"{other}/") for other in deletes)}
+    return uploads, deletes
+
+
+def sync_changes(
+    root: Union[str, Path],
+    remote_dir_path: str,
+    changed: Iterable[str],
+    files: Optional[Files] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> Dict[str, Any]:
+    """Mirrors `changed` relative paths below local `root` to
+    `remote_dir_path`, see :func:`plan_sync`.  Uploads and deletions run
+    concurrently.
+
+    :returns: dictionary with ``uploaded`` and ``deleted`` sorted lists of
+        relative paths and ``failures`` mapping (``"upload"`` or
+        ``"delete"``, relative path) to exception"""
+
+    files = files or Files()
+    root = Path(root)
+    uploads, deletes = plan_sync(root, changed)
+
+    def apply(operation: Tuple[str, str]) -> int:
+        action, relative = operation
+        remote_path = f"{remote_dir_path}/{relative}"
+        if action == "upload":
+            return files.path_post(remote_path, (root / relative).read_bytes())
+        return files.path_delete(remote_path)
+
+    operations = [("upload", path) for path in sorted(uploads)] + [("delete", path) for path in sorted(deletes)]
+    results = run_bulk(apply, operations, max_workers=max_workers)
+    failed = failures(results)
+    return {
+        "uploaded": [path for path in sorted(uploads) if ("upload", path) not in failed],
+        "deleted": [path for path in sorted(deletes) if ("delete", path) not in failed],
+        "failures": failed,
+    }
+
+
+def watch(
+    local_dir_path: str,
+    remote_dir_path: str,
+    files: Optional[Files] = None,
+    webapp: Optional[Webapp] = None,
+    debounce: float = 0.5,
+    ignore_patterns: Iterable[str] = (),
+    ignore_file_names: Iterable[str] = (),
+    stop_event: Optional[threading.Event] = None,
+    on_batch: Optional[Callable[[Dict[str, Any]], Any]] = None,
+    watcher=None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> None:
+    """Keeps `remote_dir_path` in sync with local directory
+    `local_dir_path` until `stop_event` is set.
+
+    Changes are detected with :func:`create_watcher` (unless a `watcher`
+    is given).  Bursts of changes are collected until there are none for
+    `debounce` seconds, then the batch is mirrored with
+    :func:`sync_changes` and `webapp` (if given) is reloaded once.
+    Only changes made while watching are synced, so run
+    :meth:`Files.tree_post` first for a full upload.
+
+    :param local_dir_path: local directory to watch
+    :param remote_dir_path: remote directory to mirror changes to
+    :param files: :class:`Files` instance to use
+    :param webapp: :class:`Webapp` to reload after each batch with changes
+    :param debounce: seconds without changes that end a batch
+    :param ignore_patterns: gitignore-style patterns of paths to ignore
+    :param ignore_file_names: names of ignore files (e.g. ``.gitignore``) to honour
+    :param stop_event: event stopping the watch when set
+    :param on_batch: callable called with result of :func:`sync_changes`
+        (plus ``reload_error`` key) after each batch
+    :param watcher: watcher to use, see :class:`InotifyWatcher` and
+        :class:`PollingWatcher`
+    :param max_workers: maximum number of concurrent API calls
+    """
+    stop_event = stop_event or threading.Event()
+    if not Path(local_dir_path).is_dir():
+        raise ValueError(f"{local_dir_path} is not a directory")
+    watcher = watcher or create_watcher(local_dir_path, IgnoreRules(ignore_patterns), ignore_file_names)
+    try:
+        while not stop_event.is_set():
+            changed = watcher.poll(timeout=1.0)
+            if not changed:
+                continue
+            while True:
+                more = watcher.poll(timeout=debounce)
+                if not more:
+                    break
+                changed |= more
+            result = sync_changes(local_dir_path, remote_dir_path, changed, files=files, max_workers=max_workers)
+            result["reload_error"] = None
+            if webapp is not None and (result["uploaded"] or result["deleted"]):
+                try:
+                    webapp.reload()
+                except Exception as e:
+                    result["reload_error"] = e
+            if on_batch is not None:
+                on_batch(result)
+    finally:
+        watcher.close()
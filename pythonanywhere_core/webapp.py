@@ -1,14 +1,16 @@
 from __future__ import annotations
 
 import os
+from functools import partial
 from pathlib import Path
 from textwrap import dedent
-from typing import Any
+from typing import Any, Iterator
 
-from dateutil.parser import parse
-
-from pythonanywhere_core.base import call_api, get_api_endpoint, get_username, PYTHON_VERSIONS
+from pythonanywhere_core.base import Timeout, call_api, decode_json, get_api_endpoint, get_username, iter_decode_json, PYTHON_VERSIONS
+from pythonanywhere_core.bulk import DEFAULT_MAX_WORKERS, failures, run_bulk
 from pythonanywhere_core.exceptions import SanityException, PythonAnywhereApiException, MissingCNAMEException
+from pythonanywhere_core.models import SSLInfo, WebappInfo
+from pythonanywhere_core.timestamps import parse_fields
 
 
 class Webapp:
@@ -21,10 +23,15 @@ class Webapp:
     Methods:
         - :meth:`Webapp.create`: Create a new webapp.
         - :meth:`Webapp.create_static_file_mapping`: Create a static file mapping.
+        - :meth:`Webapp.get_static_file_mappings`: List static file mappings.
+        - :meth:`Webapp.update_static_file_mapping`: Update a static file mapping.
+        - :meth:`Webapp.delete_static_file_mapping`: Delete a static file mapping.
+        - :meth:`Webapp.ensure_static_file_mappings`: Make static file mappings match the given ones.
         - :meth:`Webapp.add_default_static_files_mappings`: Add default static files mappings.
         - :meth:`Webapp.reload`: Reload the webapp.
         - :meth:`Webapp.set_ssl`: Set the SSL certificate and private key.
         - :meth:`Webapp.get_ssl_info`: Retrieve SSL certificate information.
+        - :meth:`Webapp.get_ssl_info_model`: Retrieve SSL certificate information as a model.
         - :meth:`Webapp.delete_log`: Delete a log file.
         - :meth:`Webapp.get_log_info`: Retrieve log file information.
         - :meth:`Webapp.get`: Retrieve webapp information.
@@ -33,13 +40,18 @@ class Webapp:
 
     Class Methods:
         - :meth:`Webapp.list_webapps`: List all webapps for the current user.
+        - :meth:`Webapp.iter_webapps`: Iterate over all webapps for the current user as models.
+
+    :param domain: domain name of the webapp
+    :param timeout: timeout of API calls, see :func:`~pythonanywhere_core.base.call_api`
     """
     username = get_username()
     files_url = get_api_endpoint(username=username, flavor="files")
     webapps_url = get_api_endpoint(username=username, flavor="webapps")
 
-    def __init__(self, domain: str) -> None:
+    def __init__(self, domain: str, timeout: Timeout = None) -> None:
         self.domain = domain
+        self.timeout = timeout
         self.domain_url = f"{self.webapps_url}{self.domain}/"
 
     def __eq__(self, other: Webapp) -> bool:
@@ -67,7 +79,7 @@ class Webapp:
         if nuke:
             return
 
-        response = call_api(self.domain_url, "get")
+        response = call_api(self.domain_url, "get", timeout=self.timeout)
         if response.status_code == 200:
             raise SanityException(
                 f"You already have a webapp for {self.domain}.\n\nUse the --nuke option if you want to replace it."
@@ -84,42 +96,165 @@ class Webapp:
         :raises PythonAnywhereApiException: if API call fails
         """
         if nuke:
-            call_api(self.domain_url, "delete")
+            call_api(self.domain_url, "delete", timeout=self.timeout)
         response = call_api(
             self.webapps_url,
             "post",
             data={"domain_name": self.domain, "python_version": PYTHON_VERSIONS[python_version]},
+            timeout=self.timeout,
         )
-        if not response.ok or response.json().get("status") == "ERROR":
+        if not response.ok or decode_json(response).get("status") == "ERROR":
             raise PythonAnywhereApiException(f"POST to create webapp via API failed, got {response}:{response.text}")
         response = call_api(
-            self.domain_url, "patch", data={"virtualenv_path": virtualenv_path, "source_directory": project_path}
+            self.domain_url,
+            "patch",
+            data={"virtualenv_path": virtualenv_path, "source_directory": project_path},
+            timeout=self.timeout,
         )
         if not response.ok:
             raise PythonAnywhereApiException(
                 "PATCH to set virtualenv path and source directory via API failed," f"got {response}:{response.text}"
             )
 
-    def create_static_file_mapping(self, url_path: str, directory_path: Path) -> None:
+    def create_static_file_mapping(self, url_path: str, directory_path: Path) -> dict[str, Any]:
         """Create a static file mapping via the API.
 
         :param url_path: URL path (e.g., '/static/')
         :param directory_path: Filesystem path to serve (as Path)
+        :returns: dictionary with created mapping info
+
+        :raises PythonAnywhereApiException: if API call fails
+        """
+        url = f"{self.domain_url}static_files/"
+        response = call_api(url, "post", json=dict(url=url_path, path=str(directory_path)), timeout=self.timeout)
+        if not response.ok:
+            raise PythonAnywhereApiException(
+                f"POST to create static file mapping {url_path} via API failed, got {response}:{response.text}"
+            )
+        return decode_json(response) if response.content else {}
+
+    def get_static_file_mappings(self) -> list[dict[str, Any]]:
+        """List static file mappings of the webapp.
+
+        :returns: list of mappings as dictionaries with ``id``, ``url`` and ``path`` keys
 
         :raises PythonAnywhereApiException: if API call fails
         """
         url = f"{self.domain_url}static_files/"
-        call_api(url, "post", json=dict(url=url_path, path=str(directory_path)))
+        response = call_api(url, "get", timeout=self.timeout)
+        if not response.ok:
+            raise PythonAnywhereApiException(
+                f"GET static file mappings via API failed, got {response}:{response.text}"
+            )
+        return decode_json(response)
+
+    def update_static_file_mapping(self, mapping_id: int, url_path: str, directory_path: Path) -> dict[str, Any]:
+        """Update an existing static file mapping.
+
+        :param mapping_id: id of the mapping to update
+        :param url_path: URL path (e.g., '/static/')
+        :param directory_path: Filesystem path to serve (as Path)
+        :returns: dictionary with updated mapping info
+
+        :raises PythonAnywhereApiException: if API call fails
+        """
+        url = f"{self.domain_url}static_files/{mapping_id}/"
+        response = call_api(url, "patch", json=dict(url=url_path, path=str(directory_path)), timeout=self.timeout)
+        if not response.ok:
+            raise PythonAnywhereApiException(
+                f"PATCH to update static file mapping {mapping_id} via API failed, got {response}:{response.text}"
+            )
+        return decode_json(response) if response.content else {}
+
+    def delete_static_file_mapping(self, mapping_id: int) -> None:
+        """Delete a static file mapping.
+
+        :param mapping_id: id of the mapping to delete
+
+        :raises PythonAnywhereApiException: if API call fails
+        """
+        url = f"{self.domain_url}static_files/{mapping_id}/"
+        response = call_api(url, "delete", timeout=self.timeout)
+        if not response.ok:
+            raise PythonAnywhereApiException(
+                f"DELETE static file mapping {mapping_id} via API failed, got {response}:{response.text}"
+            )
+
+    def ensure_static_file_mappings(
+        self, mappings: dict[str, Path], prune: bool = False, max_workers: int = DEFAULT_MAX_WORKERS
+    ) -> dict[str, Any]:
+        """Make static file mappings of the webapp match ``mappings``.
+
+        Existing mappings are fetched once; mappings that are missing are
+        created, mappings with a different directory are updated and (with
+        ``prune``) mappings not listed are deleted.  If a URL is mapped more
+        than once, one mapping is kept (or updated) and the duplicates are
+        deleted.  Changes are applied concurrently, so one failing change
+        doesn't prevent the others.
+
+        :param mappings: dictionary mapping URL paths to directories to serve
+        :param prune: if True, delete existing mappings for URLs not in ``mappings``
+        :param max_workers: maximum number of concurrent API calls
+        :returns: dictionary mapping URL paths to ``"created"``, ``"updated"``
+            (also when only duplicates were deleted), ``"deleted"`` or
+            ``"unchanged"``, or to the exception raised while applying the
+            change
+
+        :raises PythonAnywhereApiException: if existing mappings can't be fetched
+        """
+        existing = {}
+        for mapping in self.get_static_file_mappings():
+            existing.setdefault(mapping["url"], []).append(mapping)
+        results = {}
+        changes = {}
+        for url_path, directory_path in mappings.items():
+            current = existing.get(url_path, [])
+            if not current:
+                changes[url_path] = ("created", [partial(self.create_static_file_mapping, url_path, directory_path)])
+                continue
+            matching = [mapping for mapping in current if mapping["path"] == str(directory_path)]
+            kept = matching[0] if matching else current[0]
+            calls = [partial(self.delete_static_file_mapping, mapping["id"]) for mapping in current if mapping is not kept]
+            if not matching:
+                calls.insert(0, partial(self.update_static_file_mapping, kept["id"], url_path, directory_path))
+            if calls:
+                changes[url_path] = ("updated", calls)
+            else:
+                results[url_path] = "unchanged"
+        if prune:
+            for url_path, current in existing.items():
+                if url_path not in mappings:
+                    changes[url_path] = (
+                        "deleted",
+                        [partial(self.delete_static_file_mapping, mapping["id"]) for mapping in current],
+                    )
+
+        applied = run_bulk(
+            lambda url_path: [call() for call in changes[url_path][1]], changes, max_workers=max_workers
+        )
+        for url_path, outcome in applied.items():
+            results[url_path] = outcome if isinstance(outcome, Exception) else changes[url_path][0]
+        return results
 
     def add_default_static_files_mappings(self, project_path: Path) -> None:
         """Add default static files mappings for /static/ and /media/.
 
+        Mappings that already exist are left alone, so it's safe to call
+        this more than once.
+
         :param project_path: path to the project
 
         :raises PythonAnywhereApiException: if API call fails
         """
-        self.create_static_file_mapping("/static/", Path(project_path) / "static")
-        self.create_static_file_mapping("/media/", Path(project_path) / "media")
+        results = self.ensure_static_file_mappings(
+            {"/static/": Path(project_path) / "static", "/media/": Path(project_path) / "media"}
+        )
+        failed = failures(results)
+        if failed:
+            raise PythonAnywhereApiException(
+                "Could not set up static files mappings: "
+                + "; ".join(f"{url_path}: {error}" for url_path, error in failed.items())
+            )
 
     def reload(self) -> None:
         """Reload webapp
@@ -127,9 +262,9 @@ class Webapp:
         :raises MissingCNAMEException: if CNAME not found (reload succeeded)
         :raises PythonAnywhereApiException: if API call fails"""
         url = f"{self.domain_url}reload/"
-        response = call_api(url, "post")
+        response = call_api(url, "post", timeout=self.timeout)
         if not response.ok:
-            if response.status_code == 409 and response.json()["error"] == "cname_error":
+            if response.status_code == 409 and decode_json(response)["error"] == "cname_error":
                 raise MissingCNAMEException()
             raise PythonAnywhereApiException(f"POST to reload webapp via API failed, got {response}:{response.text}")
 
@@ -142,7 +277,7 @@ class Webapp:
         :raises PythonAnywhereApiException: if API call fails
         """
         url = f"{self.domain_url}ssl/"
-        response = call_api(url, "post", json={"cert": certificate, "private_key": private_key})
+        response = call_api(url, "post", json={"cert": certificate, "private_key": private_key}, timeout=self.timeout)
         if not response.ok:
             raise PythonAnywhereApiException(
                 dedent(
@@ -161,14 +296,25 @@ class Webapp:
 
         :raises PythonAnywhereApiException: if API call fails
         """
+        return parse_fields(self._fetch_ssl_info(), datetimes=["not_after"])
+
+    def get_ssl_info_model(self) -> SSLInfo:
+        """Get SSL certificate info as a model.
+
+        The expiration date is decoded only when accessed.
+
+        :returns: :class:`~pythonanywhere_core.models.SSLInfo`
+
+        :raises PythonAnywhereApiException: if API call fails
+        """
+        return SSLInfo.from_dict(self._fetch_ssl_info())
+
+    def _fetch_ssl_info(self) -> dict[str, Any]:
         url = f"{self.domain_url}ssl/"
-        response = call_api(url, "get")
+        response = call_api(url, "get", timeout=self.timeout)
         if not response.ok:
             raise PythonAnywhereApiException(f"GET SSL details via API failed, got {response}:{response.text}")
-
-        result = response.json()
-        result["not_after"] = parse(result["not_after"])
-        return result
+        return decode_json(response)
 
     def delete_log(self, log_type: str, index: int = 0) -> None:
         """Delete log file
@@ -186,7 +332,7 @@ class Webapp:
             suffix = ""
 
         base_log_url = f"{self.files_url}path/var/log/{self.domain}.{log_type}.log"
-        response = call_api(f"{base_log_url}{suffix}/", "delete")
+        response = call_api(f"{base_log_url}{suffix}/", "delete", timeout=self.timeout)
 
         if not response.ok:
             raise PythonAnywhereApiException(f"DELETE log file via API failed, got {response}:{response.text}")
@@ -199,10 +345,10 @@ class Webapp:
 
         :raises PythonAnywhereApiException: if API call fails"""
         url = f"{self.files_url}tree/?path=/var/log/"
-        response = call_api(url, "get")
+        response = call_api(url, "get", timeout=self.timeout)
         if not response.ok:
             raise PythonAnywhereApiException(f"GET log files info via API failed, got {response}:{response.text}")
-        file_list = response.json()
+        file_list = decode_json(response)
         log_types = ["access", "error", "server"]
         logs = {"access": [], "error": [], "server": []}
         log_prefix = f"/var/log/{self.domain}."
@@ -223,20 +369,42 @@ class Webapp:
         return logs
 
     @classmethod
-    def list_webapps(cls) -> list[dict[str, Any]]:
+    def list_webapps(cls, timeout: Timeout = None) -> list[dict[str, Any]]:
         """List all webapps for the current user.
 
+        :param timeout: timeout of the API call, see :func:`~pythonanywhere_core.base.call_api`
         :returns: list of webapps info as dictionaries
 
         :raises PythonAnywhereApiException: if API call fails
         """
-        response = call_api(cls.webapps_url, "get")
+        response = call_api(cls.webapps_url, "get", timeout=timeout)
         if not response.ok:
             raise PythonAnywhereApiException(
                 f"GET webapps via API failed, "
                 f"got {response}:{response.text}"
             )
-        return response.json()
+        return decode_json(response)
+
+    @classmethod
+    def iter_webapps(cls, timeout: Timeout = None) -> Iterator[WebappInfo]:
+        """Iterate over all webapps for the current user.
+
+        The response is streamed and decoded one webapp at a time.
+
+        :param timeout: timeout of the API call, see :func:`~pythonanywhere_core.base.call_api`
+        :returns: iterator of :class:`~pythonanywhere_core.models.WebappInfo`
+
+        :raises PythonAnywhereApiException: if API call fails
+        """
+        response = call_api(cls.webapps_url, "get", stream=True, timeout=timeout)
+        with response:
+            if not response.ok:
+                raise PythonAnywhereApiException(
+                    f"GET webapps via API failed, "
+                    f"got {response}:{response.text}"
+                )
+            for info in iter_decode_json(response):
+                yield WebappInfo.from_dict(info)
 
     def get(self) -> dict[str, Any]:
         """Retrieve webapp information.
@@ -245,21 +413,21 @@ class Webapp:
 
         :raises PythonAnywhereApiException: if API call fails
         """
-        response = call_api(self.domain_url, "get")
+        response = call_api(self.domain_url, "get", timeout=self.timeout)
 
         if not response.ok:
             raise PythonAnywhereApiException(
                 f"GET webapp for {self.domain} via API failed, got {response}:{response.text}"
             )
 
-        return response.json()
+        return decode_json(response)
 
     def delete(self) -> None:
         """Delete webapp.
 
         :raises PythonAnywhereApiException: if API call fails
         """
-        response = call_api(self.domain_url, "delete")
+        response = call_api(self.domain_url, "delete", timeout=self.timeout)
 
         if response.status_code != 204:
             raise PythonAnywhereApiException(
@@ -274,7 +442,7 @@ class Webapp:
 
         :raises PythonAnywhereApiException: if API call fails
         """
-        response = call_api(self.domain_url, "patch", data=data)
+        response = call_api(self.domain_url, "patch", data=data, timeout=self.timeout)
 
         if not response.ok:
             raise PythonAnywhereApiException(
@@ -282,4 +450,4 @@ class Webapp:
                 f"got {response}:{response.text}"
             )
 
-        return response.json()
+        return decode_json(response)
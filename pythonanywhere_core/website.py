@@ -1,5 +1,9 @@
-from pythonanywhere_core.base import call_api, get_api_endpoint, get_username
+from typing import Iterator
+
+from pythonanywhere_core.base import Timeout, call_api, decode_json, get_api_endpoint, get_username, iter_decode_json
 from pythonanywhere_core.exceptions import DomainAlreadyExistsException, PythonAnywhereApiException
+from pythonanywhere_core.models import SSLInfo, WebsiteInfo
+from pythonanywhere_core.timestamps import parse_fields
 
 
 class Website:
@@ -14,13 +18,18 @@ class Website:
         - :meth:`Website.create`: Create a new website.
         - :meth:`Website.get`: Retrieve information about a specific website.
         - :meth:`Website.list`: Get a list of all websites.
+        - :meth:`Website.iter_websites`: Iterate over all websites as models.
         - :meth:`Website.reload`: Reload the website.
         - :meth:`Website.auto_ssl`: Create and apply a Let's Encrypt SSL certificate.
         - :meth:`Website.get_ssl_info`: Get SSL certificate information.
+        - :meth:`Website.get_ssl_info_model`: Get SSL certificate information as a model.
         - :meth:`Website.delete`: Delete a website.
+
+    :param timeout: timeout of API calls, see :func:`~pythonanywhere_core.base.call_api`
     """
 
-    def __init__(self) -> None:
+    def __init__(self, timeout: Timeout = None) -> None:
+        self.timeout = timeout
         self.websites_base_url = get_api_endpoint(username=get_username(), flavor="websites")
         self.domains_base_url = get_api_endpoint(username=get_username(), flavor="domains")
 
@@ -39,7 +48,8 @@ class Website:
                 "domain_name": domain_name,
                 "enabled": True,
                 "webapp": {"command": command}
-            }
+            },
+            timeout=self.timeout
         )
         if response.status_code == 400 and "domain with this domain name already exists" in response.text:
             raise DomainAlreadyExistsException
@@ -47,7 +57,7 @@ class Website:
         if not response.ok:
             raise PythonAnywhereApiException(f"POST to create website failed with status code {response.status_code} and error message: {response.text}")
 
-        return response.json()
+        return decode_json(response)
 
     def get(self, domain_name: str) -> dict:
         """Returns dictionary with website info for ``domain_name``.
@@ -57,8 +67,9 @@ class Website:
         response = call_api(
             f"{self.websites_base_url}{domain_name}/",
             "get",
+            timeout=self.timeout,
         )
-        return response.json()
+        return decode_json(response)
 
     def list(self) -> list:
         """Returns list of dictionaries with all websites info.
@@ -67,8 +78,23 @@ class Website:
         response = call_api(
             self.websites_base_url,
             "get",
+            timeout=self.timeout,
         )
-        return response.json()
+        return decode_json(response)
+
+    def iter_websites(self) -> Iterator[WebsiteInfo]:
+        """Iterates over all websites, streaming the response and decoding
+        one website at a time.
+        :return: iterator of :class:`~pythonanywhere_core.models.WebsiteInfo`
+
+        :raises PythonAnywhereApiException: if websites can't be listed"""
+
+        response = call_api(self.websites_base_url, "get", stream=True, timeout=self.timeout)
+        with response:
+            if not response.ok:
+                raise PythonAnywhereApiException(f"GET websites via API failed, got {response}:{response.text}")
+            for info in iter_decode_json(response):
+                yield WebsiteInfo.from_dict(info)
 
     def reload(self, domain_name: str) -> dict:
         """Reloads website with ``domain_name``.
@@ -78,30 +104,45 @@ class Website:
         response = call_api(
             f"{self.websites_base_url}{domain_name}/reload/",
             "post",
+            timeout=self.timeout,
         )
-        return response.json()
+        return decode_json(response)
 
     def auto_ssl(self, domain_name: str) -> dict:
         """Creates and applies a Let's Encrypt certificate for ``domain_name``.
         :param domain_name: domain name for website to apply the certificate to
-        :return: dictionary with response"""
+        :return: dictionary with response
+
+        :raises PythonAnywhereApiException: if the certificate could not be applied"""
         response = call_api(
             f"{self.domains_base_url}{domain_name}/ssl/",
             "post",
-            json={"cert_type": "letsencrypt-auto-renew"}
+            json={"cert_type": "letsencrypt-auto-renew"},
+            timeout=self.timeout
         )
-        return response.json()
+        if not response.ok:
+            raise PythonAnywhereApiException(f"POST to apply Let's Encrypt certificate via API failed, got {response}:{response.text}")
+        return decode_json(response)
 
     def get_ssl_info(self, domain_name) -> dict:
         """Get SSL certificate info
         :param domain_name: domain name for website to get SSL info
-        :return: dictionary with SSL certificate info"""
+        :return: dictionary with SSL certificate info including parsed expiration date"""
+        return parse_fields(self._fetch_ssl_info(domain_name), datetimes=["not_after"])
+
+    def get_ssl_info_model(self, domain_name: str) -> SSLInfo:
+        """Get SSL certificate info as a model, with the expiration date
+        decoded only when accessed.
+        :param domain_name: domain name for website to get SSL info
+        :return: :class:`~pythonanywhere_core.models.SSLInfo`"""
+        return SSLInfo.from_dict(self._fetch_ssl_info(domain_name))
+
+    def _fetch_ssl_info(self, domain_name: str) -> dict:
         url = f"{self.domains_base_url}{domain_name}/ssl/"
-        response = call_api(url, "get")
+        response = call_api(url, "get", timeout=self.timeout)
         if not response.ok:
             raise PythonAnywhereApiException(f"GET SSL details via API failed, got {response}:{response.text}")
-
-        return response.json()
+        return decode_json(response)
 
     def delete(self, domain_name: str) -> dict:
         """Deletes website with ``domain_name``.
@@ -111,5 +152,6 @@ class Website:
         call_api(
             f"{self.websites_base_url}{domain_name}/",
             "delete",
+            timeout=self.timeout,
         )
         return {}
@@ -7,11 +7,20 @@ import pytest
 import responses
 import tempfile
 
+from pythonanywhere_core.base import reset_circuit_breakers
+
 
 def _get_temp_dir():
     return Path(tempfile.mkdtemp())
 
 
+@pytest.fixture(autouse=True)
+def circuit_breakers():
+    reset_circuit_breakers()
+    yield
+    reset_circuit_breakers()
+
+
 @pytest.fixture
 def api_responses():
     with responses.RequestsMock() as r:
@@ -1,17 +1,39 @@
 import getpass
+import json
 import platform
+from datetime import date, datetime
 from pythonanywhere_core import __version__
 
 import pytest
+import requests
 import responses
 
 from pythonanywhere_core.base import (
+    DEFAULT_TIMEOUT,
+    CircuitBreaker,
+    add_instrumentation_hook,
     call_api,
+    circuit_breaker_states,
+    deadline,
+    decode_json,
     get_api_endpoint,
+    get_circuit_breaker,
+    get_default_timeout,
     get_username,
     helpful_token_error_message,
+    iter_decode_json,
+    remove_instrumentation_hook,
+    set_json_backend,
+    _default_json_backend,
+)
+from pythonanywhere_core.bulk import run_bulk
+from pythonanywhere_core.exceptions import (
+    AuthenticationError,
+    CircuitOpenError,
+    DeadlineExceededError,
+    NoTokenError,
+    PythonAnywhereApiException,
 )
-from pythonanywhere_core.exceptions import AuthenticationError, NoTokenError
 
 
 def test_get_username_returns_env_var_when_set(monkeypatch):
@@ -149,3 +171,286 @@ def test_call_api_preserves_authorization_with_custom_headers(api_token, api_res
     assert response.status_code == 200
     assert api_responses.calls[0].request.headers["Authorization"] == f"Token {api_token}"
     assert api_responses.calls[0].request.headers["X-Custom"] == "value"
+
+
+@pytest.fixture
+def stdlib_json_backend():
+    set_json_backend(json.loads, lambda obj: json.dumps(obj).encode())
+    yield
+    set_json_backend(*_default_json_backend())
+
+
+def test_call_api_encodes_json_body_with_json_backend(api_token, api_responses, stdlib_json_backend):
+    url = "https://www.pythonanywhere.com/api/v0/test"
+    api_responses.add(responses.POST, url, json={"status": "ok"}, status=200)
+    set_json_backend(json.loads, lambda obj: b'{"encoded": "by backend"}')
+
+    call_api(url, "POST", json={"foo": "bar"})
+
+    request = api_responses.calls[0].request
+    assert request.body == b'{"encoded": "by backend"}'
+    assert request.headers["Content-Type"] == "application/json"
+
+
+def test_decode_json_uses_json_backend(api_token, api_responses, stdlib_json_backend):
+    url = "https://www.pythonanywhere.com/api/v0/test"
+    api_responses.add(responses.GET, url, json={"status": "ok"}, status=200)
+    set_json_backend(lambda data: ("decoded", data), json.dumps)
+
+    response = call_api(url, "GET")
+
+    assert decode_json(response) == ("decoded", b'{"status": "ok"}')
+
+
+def test_default_json_backend_round_trips(api_token, api_responses):
+    url = "https://www.pythonanywhere.com/api/v0/test"
+    api_responses.add(responses.POST, url, json={"status": "ok"}, status=200)
+
+    response = call_api(url, "POST", json={"foo": ["bar", 1]})
+
+    assert json.loads(api_responses.calls[0].request.body) == {"foo": ["bar", 1]}
+    assert decode_json(response) == {"status": "ok"}
+
+
+def test_iter_decode_json_yields_items_of_streamed_list(api_token, api_responses):
+    url = "https://www.pythonanywhere.com/api/v0/test"
+    items = [{"id": 1, "tags": ["a", "]"]}, 22, "x"]
+    api_responses.add(responses.GET, url, body=json.dumps(items), status=200)
+
+    response = call_api(url, "GET", stream=True)
+
+    assert list(iter_decode_json(response, chunk_size=3)) == items
+
+
+def test_iter_decode_json_raises_when_list_is_truncated(api_token, api_responses):
+    url = "https://www.pythonanywhere.com/api/v0/test"
+    api_responses.add(responses.GET, url, body='[{"id": 1}, {"id": 2}, {"i', status=200)
+
+    items = iter_decode_json(call_api(url, "GET", stream=True))
+
+    assert next(items) == {"id": 1}
+    with pytest.raises(PythonAnywhereApiException) as e:
+        list(items)
+    assert "Response ended before the end of JSON list" in str(e.value)
+
+
+def test_stdlib_json_backend_encodes_dates(api_token, api_responses, mocker):
+    mocker.patch.dict("sys.modules", {"orjson": None})
+    set_json_backend(*_default_json_backend())
+    url = "https://www.pythonanywhere.com/api/v0/test"
+    api_responses.add(responses.POST, url, json={"status": "ok"}, status=200)
+
+    try:
+        call_api(url, "POST", json={"expiry": date(2025, 10, 16), "at": datetime(2025, 10, 16, 3, 4, 5)})
+    finally:
+        mocker.stopall()
+        set_json_backend(*_default_json_backend())
+
+    assert json.loads(api_responses.calls[0].request.body) == {"expiry": "2025-10-16", "at": "2025-10-16T03:04:05"}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def events():
+    recorded = []
+
+    def hook(event, info):
+        recorded.append((event, info))
+
+    add_instrumentation_hook(hook)
+    yield recorded
+    remove_instrumentation_hook(hook)
+
+
+def test_circuit_breaker_opens_after_consecutive_failures(clock, events):
+    breaker = CircuitBreaker("www.foo.com", "webapps", failure_threshold=2, clock=clock)
+
+    breaker.record_failure()
+    breaker.before_call()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError) as e:
+        breaker.before_call()
+    assert "webapps on www.foo.com is open after 2 consecutive failures" in str(e.value)
+    assert events == [
+        (
+            "circuit_state_changed",
+            {"host": "www.foo.com", "flavor": "webapps", "previous": "closed", "state": "open"},
+        )
+    ]
+
+
+def test_circuit_breaker_success_resets_failure_count(clock):
+    breaker = CircuitBreaker("www.foo.com", "webapps", failure_threshold=2, clock=clock)
+
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_circuit_breaker_half_opens_to_let_single_probe_through(clock):
+    breaker = CircuitBreaker("www.foo.com", "webapps", failure_threshold=1, recovery_timeout=30, clock=clock)
+    breaker.record_failure()
+    clock.now = 30
+
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_circuit_breaker_retry_after_counts_down_while_open(clock):
+    breaker = CircuitBreaker("www.foo.com", "webapps", failure_threshold=1, recovery_timeout=30, clock=clock)
+    assert breaker.retry_after() == 0
+    breaker.record_failure()
+    clock.now = 12
+
+    assert breaker.retry_after() == 18
+    clock.now = 30
+    assert breaker.retry_after() == 0
+
+
+def test_circuit_breaker_opens_again_when_probe_fails(clock):
+    breaker = CircuitBreaker("www.foo.com", "webapps", failure_threshold=3, recovery_timeout=30, clock=clock)
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now = 30
+    breaker.before_call()
+
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_get_circuit_breaker_is_keyed_by_host_and_flavor():
+    files = get_circuit_breaker("https://www.foo.com/api/v0/user/bill/files/path/home/bill/")
+
+    assert files is get_circuit_breaker("https://www.foo.com/api/v0/user/bill/files/tree/?path=/")
+    assert files.flavor == "files"
+    assert get_circuit_breaker("https://www.foo.com/api/v0/user/bill/webapps/") is not files
+    assert get_circuit_breaker("https://www.bar.com/api/v0/user/bill/files/") is not files
+
+
+def test_call_api_fails_fast_when_circuit_is_open(api_token, api_responses, monkeypatch):
+    monkeypatch.setattr("pythonanywhere_core.base.CIRCUIT_BREAKER_FAILURE_THRESHOLD", 2)
+    url = "https://www.pythonanywhere.com/api/v0/user/bill/webapps/"
+    other_url = "https://www.pythonanywhere.com/api/v0/user/bill/files/tree/"
+    api_responses.add(responses.GET, url, status=503)
+    api_responses.add(responses.GET, other_url, status=200)
+
+    call_api(url, "GET")
+    call_api(url, "GET")
+    with pytest.raises(CircuitOpenError):
+        call_api(url, "GET")
+
+    assert len(api_responses.calls) == 2
+    assert call_api(other_url, "GET").status_code == 200
+    assert circuit_breaker_states() == {
+        ("www.pythonanywhere.com", "webapps"): "open",
+        ("www.pythonanywhere.com", "files"): "closed",
+    }
+
+
+def test_call_api_lets_another_probe_through_after_interrupted_probe(api_token, api_responses, monkeypatch):
+    monkeypatch.setattr("pythonanywhere_core.base.CIRCUIT_BREAKER_FAILURE_THRESHOLD", 1)
+    monkeypatch.setattr("pythonanywhere_core.base.CIRCUIT_BREAKER_RECOVERY_TIMEOUT", 0)
+    url = "https://www.pythonanywhere.com/api/v0/user/bill/webapps/"
+    api_responses.add(responses.GET, url, status=503)
+    api_responses.add(responses.GET, url, body=DeadlineExceededError("interrupted"))
+    api_responses.add(responses.GET, url, status=200)
+
+    call_api(url, "GET")
+    with pytest.raises(DeadlineExceededError):
+        call_api(url, "GET")
+
+    assert call_api(url, "GET").status_code == 200
+    assert circuit_breaker_states() == {("www.pythonanywhere.com", "webapps"): "closed"}
+
+
+def test_call_api_counts_connection_errors_as_failures(api_token, api_responses):
+    url = "https://www.pythonanywhere.com/api/v0/user/bill/webapps/"
+    api_responses.add(responses.GET, url, body=requests.ConnectionError("down"))
+
+    with pytest.raises(requests.ConnectionError):
+        call_api(url, "GET")
+
+    assert get_circuit_breaker(url).failures == 1
+
+
+def test_call_api_uses_default_timeout(api_token, api_responses, monkeypatch):
+    monkeypatch.delenv("PYTHONANYWHERE_API_TIMEOUT", raising=False)
+    url = "https://www.pythonanywhere.com/api/v0/test"
+    api_responses.add(responses.GET, url, status=200)
+
+    call_api(url, "GET")
+
+    assert api_responses.calls[0].request.req_kwargs["timeout"] == DEFAULT_TIMEOUT
+
+
+@pytest.mark.parametrize("value,expected", [("5", (10.0, 5.0)), ("3,30", (3.0, 30.0))])
+def test_default_timeout_from_environment_variable(monkeypatch, value, expected):
+    monkeypatch.setenv("PYTHONANYWHERE_API_TIMEOUT", value)
+
+    assert get_default_timeout() == expected
+
+
+def test_call_api_passes_timeout_given(api_token, api_responses):
+    url = "https://www.pythonanywhere.com/api/v0/test"
+    api_responses.add(responses.GET, url, status=200)
+
+    call_api(url, "GET", timeout=3)
+
+    assert api_responses.calls[0].request.req_kwargs["timeout"] == (3, 3)
+
+
+def test_call_api_clamps_timeout_to_deadline(api_token, api_responses):
+    url = "https://www.pythonanywhere.com/api/v0/test"
+    api_responses.add(responses.GET, url, status=200)
+
+    with deadline(2):
+        call_api(url, "GET", timeout=(1, 30))
+
+    connect, read = api_responses.calls[0].request.req_kwargs["timeout"]
+    assert connect == 1
+    assert 0 < read <= 2
+
+
+def test_call_api_raises_once_deadline_passed(api_token, api_responses):
+    with deadline(0):
+        with pytest.raises(DeadlineExceededError):
+            call_api("https://www.pythonanywhere.com/api/v0/test", "GET")
+
+    assert len(api_responses.calls) == 0
+
+
+def test_nested_deadline_cannot_extend_outer_one():
+    with deadline(1) as outer:
+        with deadline(100) as inner:
+            assert inner is outer
+        with deadline(0.5) as inner:
+            assert inner.expires_at < outer.expires_at
+
+
+def test_deadline_applies_to_bulk_operations(api_token, api_responses):
+    with deadline(0):
+        results = run_bulk(lambda url: call_api(url, "GET"), ["https://www.pythonanywhere.com/api/v0/test"])
+
+    assert isinstance(results["https://www.pythonanywhere.com/api/v0/test"], DeadlineExceededError)
@@ -0,0 +1,183 @@
+import threading
+
+import pytest
+import responses
+
+from pythonanywhere_core.base import call_api
+from pythonanywhere_core.bulk import AdaptiveConcurrencyLimiter, failures, iter_pipeline, run_bulk
+from pythonanywhere_core.journal import OperationJournal
+
+
+def test_run_bulk_returns_result_for_every_item():
+    assert run_bulk(lambda x: x * 2, [1, 2, 3]) == {1: 2, 2: 4, 3: 6}
+
+
+def test_run_bulk_returns_exceptions_instead_of_raising():
+    def func(x):
+        if x == 2:
+            raise ValueError("two")
+        return x
+
+    result = run_bulk(func, [1, 2, 3])
+
+    assert result[1] == 1
+    assert isinstance(result[2], ValueError)
+    assert result[3] == 3
+
+
+def test_run_bulk_with_no_items_returns_empty_dict():
+    assert run_bulk(lambda x: x, []) == {}
+
+
+def test_failures_returns_only_exceptions():
+    error = RuntimeError("nope")
+
+    assert failures({"a": 1, "b": error}) == {"b": error}
+
+
+def test_limiter_increases_limit_additively_on_healthy_responses():
+    limiter = AdaptiveConcurrencyLimiter(initial=2, maximum=4)
+
+    for _ in range(3):
+        limiter.record(200, 0.1)
+
+    assert limiter.limit == 3
+
+
+def test_limiter_never_goes_above_maximum():
+    limiter = AdaptiveConcurrencyLimiter(initial=2, maximum=3)
+
+    for _ in range(20):
+        limiter.record(200, 0.1)
+
+    assert limiter.limit == 3
+
+
+@pytest.mark.parametrize("status_code", [429, 503, 500, None])
+def test_limiter_backs_off_multiplicatively_on_throttling_and_errors(status_code):
+    limiter = AdaptiveConcurrencyLimiter(initial=8, maximum=8)
+
+    limiter.record(status_code, 0.1)
+
+    assert limiter.limit == 4
+
+
+def test_limiter_never_goes_below_minimum():
+    limiter = AdaptiveConcurrencyLimiter(initial=2, minimum=1)
+
+    for _ in range(5):
+        limiter.record(429, 0.1)
+
+    assert limiter.limit == 1
+
+
+def test_limiter_backs_off_once_for_a_burst_of_concurrent_throttled_calls():
+    limiter = AdaptiveConcurrencyLimiter(initial=8, maximum=8)
+    for _ in range(8):
+        limiter.acquire()
+
+    for _ in range(8):
+        limiter.record(429, 0.1)
+        limiter.release()
+
+    assert limiter.limit == 4
+    limiter.acquire()
+    limiter.record(429, 0.1)
+    assert limiter.limit == 2
+
+
+def test_limiter_treats_slow_responses_as_unhealthy():
+    limiter = AdaptiveConcurrencyLimiter(initial=4, latency_threshold=1)
+
+    limiter.record(200, 0.5)
+    limiter.record(200, 2)
+
+    assert limiter.limit == 2
+
+
+def test_run_bulk_keeps_concurrency_within_limit():
+    limiter = AdaptiveConcurrencyLimiter(initial=1, maximum=1)
+    lock = threading.Lock()
+    running = []
+    peak = []
+
+    def func(x):
+        with lock:
+            running.append(x)
+            peak.append(len(running))
+        with lock:
+            running.remove(x)
+
+    run_bulk(func, range(20), max_workers=8, limiter=limiter)
+
+    assert max(peak) == 1
+
+
+def test_run_bulk_feeds_api_responses_to_limiter(api_token, api_responses):
+    url = "https://www.pythonanywhere.com/api/v0/test"
+    api_responses.add(responses.GET, url, status=429)
+    limiter = AdaptiveConcurrencyLimiter(initial=4, maximum=4)
+
+    run_bulk(lambda _: call_api(url, "GET"), [1, 2], max_workers=1, limiter=limiter)
+
+    assert limiter.limit == 1
+
+
+def test_run_bulk_skips_items_done_in_journal_and_records_successes(tmp_path):
+    journal = OperationJournal(tmp_path / "job.journal")
+    journal.record(1)
+    called = []
+
+    def func(x):
+        called.append(x)
+        if x == 3:
+            raise ValueError("three")
+        return x
+
+    result = run_bulk(func, [1, 2, 3], journal=journal)
+
+    assert sorted(called) == [2, 3]
+    assert set(result) == {2, 3}
+    assert journal.pending([1, 2, 3]) == [3]
+
+
+def test_iter_pipeline_runs_items_through_stages_in_order():
+    result = list(iter_pipeline(range(100), [lambda x: x * 2, lambda x: x + 1], queue_size=4))
+
+    assert result == [x * 2 + 1 for x in range(100)]
+
+
+@pytest.mark.parametrize("failing", ["source", "stage"])
+def test_iter_pipeline_reraises_errors(failing):
+    def source():
+        yield 1
+        if failing == "source":
+            raise ValueError("source")
+        yield 2
+
+    def stage(x):
+        if failing == "stage" and x == 2:
+            raise ValueError("stage")
+        return x
+
+    pipeline = iter_pipeline(source(), [stage])
+
+    assert next(pipeline) == 1
+    with pytest.raises(ValueError, match=failing):
+        next(pipeline)
+
+
+def test_iter_pipeline_reads_ahead_only_up_to_queue_sizes():
+    consumed = []
+
+    def source():
+        for x in range(1000):
+            consumed.append(x)
+            yield x
+
+    pipeline = iter_pipeline(source(), [lambda x: x], queue_size=2)
+    assert next(pipeline) == 0
+    threading.Event().wait(0.2)
+    pipeline.close()
+
+    assert len(consumed) <= 2 + 1 + 2 + 1 + 1
@@ -0,0 +1,104 @@
+import getpass
+import json
+from datetime import datetime, timezone
+
+import pytest
+import responses
+
+from pythonanywhere_core.base import get_api_endpoint
+from pythonanywhere_core.certificates import scan_ssl_expiry
+from pythonanywhere_core.exceptions import PythonAnywhereApiException
+
+
+pytestmark = pytest.mark.usefixtures("api_token")
+
+
+@pytest.fixture
+def webapps_url():
+    return get_api_endpoint(username=getpass.getuser(), flavor="webapps")
+
+
+@pytest.fixture
+def websites_url():
+    return get_api_endpoint(username=getpass.getuser(), flavor="websites")
+
+
+@pytest.fixture
+def domains_url():
+    return get_api_endpoint(username=getpass.getuser(), flavor="domains")
+
+
+@pytest.fixture
+def now():
+    return datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def fleet(api_responses, webapps_url, websites_url, domains_url):
+    api_responses.add(
+        responses.GET,
+        webapps_url,
+        status=200,
+        body=json.dumps([{"domain_name": "old.com"}, {"domain_name": "fine.com"}, {"domain_name": "broken.com"}]),
+    )
+    api_responses.add(
+        responses.GET, websites_url, status=200, body=json.dumps([{"domain_name": "site.com"}])
+    )
+    api_responses.add(
+        responses.GET, f"{webapps_url}old.com/ssl/", status=200, body=json.dumps({"not_after": "2025-01-11T00:00:00Z"})
+    )
+    api_responses.add(
+        responses.GET, f"{webapps_url}fine.com/ssl/", status=200, body=json.dumps({"not_after": "2026-01-01T00:00:00Z"})
+    )
+    api_responses.add(responses.GET, f"{webapps_url}broken.com/ssl/", status=500, body="oops")
+    api_responses.add(
+        responses.GET, f"{domains_url}site.com/ssl/", status=200, body=json.dumps({"not_after": "2025-01-03T00:00:00Z"})
+    )
+    return api_responses
+
+
+def test_scan_ssl_expiry_reports_expiring_certificates_soonest_first(fleet, now):
+    report = scan_ssl_expiry(within_days=30, now=now)
+
+    assert [(entry["domain"], entry["kind"]) for entry in report] == [
+        ("site.com", "website"),
+        ("old.com", "webapp"),
+        ("broken.com", "webapp"),
+    ]
+    assert report[0]["days_left"] == 2
+    assert report[0]["not_after"] == datetime(2025, 1, 3, tzinfo=timezone.utc)
+    assert report[1]["days_left"] == 10
+    assert isinstance(report[2]["error"], PythonAnywhereApiException)
+
+
+def test_scan_ssl_expiry_renews_websites_below_threshold(fleet, domains_url, now):
+    fleet.add(responses.POST, f"{domains_url}site.com/ssl/", status=200, body=json.dumps({"status": "OK"}))
+
+    report = scan_ssl_expiry(within_days=30, renew_below_days=7, now=now)
+
+    assert report[0]["renewal"] == {"status": "OK"}
+    assert "renewal" not in report[1]
+    renew_call = [call for call in fleet.calls if call.request.method == "POST"][0]
+    assert json.loads(renew_call.request.body) == {"cert_type": "letsencrypt-auto-renew"}
+    assert report[0]["renewal_error"] is None
+
+
+def test_scan_ssl_expiry_reports_failed_renewals(fleet, domains_url, now):
+    fleet.add(responses.POST, f"{domains_url}site.com/ssl/", status=500, body="nope")
+
+    report = scan_ssl_expiry(within_days=30, renew_below_days=7, now=now)
+
+    assert report[0]["domain"] == "site.com"
+    assert report[0]["renewal"] is None
+    assert isinstance(report[0]["renewal_error"], PythonAnywhereApiException)
+    assert "nope" in str(report[0]["renewal_error"])
+
+
+def test_scan_ssl_expiry_raises_when_websites_cannot_be_listed(api_responses, webapps_url, websites_url):
+    api_responses.add(responses.GET, webapps_url, status=200, body=json.dumps([]))
+    api_responses.add(responses.GET, websites_url, status=403, body=json.dumps({"detail": "nope"}))
+
+    with pytest.raises(PythonAnywhereApiException) as e:
+        scan_ssl_expiry()
+
+    assert "Listing websites via API failed" in str(e.value)
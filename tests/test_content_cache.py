@@ -0,0 +1,48 @@
+from pythonanywhere_core.content_cache import ContentCache, content_digest
+
+
+def test_is_current_only_for_last_recorded_digest():
+    cache = ContentCache()
+    cache.record("/home/u/a.js", content_digest(b"v1"), 2)
+    cache.record("/home/u/a.js", content_digest(b"v2"), 2)
+
+    assert cache.is_current("/home/u/a.js", content_digest(b"v2"))
+    assert not cache.is_current("/home/u/a.js", content_digest(b"v1"))
+    assert not cache.is_current("/home/u/b.js", content_digest(b"v2"))
+
+
+def test_locations_lists_paths_with_same_contents():
+    cache = ContentCache()
+    for path in ("/home/u/site2/vendor.js", "/home/u/site1/vendor.js"):
+        cache.record(path, content_digest(b"bundle"), 6)
+
+    assert cache.locations(content_digest(b"bundle")) == ["/home/u/site1/vendor.js", "/home/u/site2/vendor.js"]
+
+
+def test_forget_drops_path_and_paths_below_it():
+    cache = ContentCache()
+    digest = content_digest(b"x")
+    for path in ("/home/u/app", "/home/u/app/a.js", "/home/u/app2/a.js"):
+        cache.record(path, digest, 1)
+
+    cache.forget("/home/u/app/")
+
+    assert cache.locations(digest) == ["/home/u/app2/a.js"]
+
+
+def test_records_persist_between_instances(tmp_path):
+    with ContentCache(tmp_path / "cache.db") as cache:
+        cache.record("/home/u/a.js", content_digest(b"v1"), 2)
+
+    with ContentCache(tmp_path / "cache.db") as cache:
+        assert cache.is_current("/home/u/a.js", content_digest(b"v1"))
+
+
+def test_record_skipped_counts_bytes_saved():
+    cache = ContentCache()
+
+    cache.record_skipped(10)
+    cache.record_skipped(5)
+
+    assert cache.bytes_saved == 15
+    assert cache.files_skipped == 2
@@ -1,13 +1,22 @@
 import getpass
+import io
 import json
+import re
+import tarfile
+import threading
+import time
 from urllib.parse import urljoin
 
 import pytest
+import requests
 import responses
 
-from pythonanywhere_core.base import get_api_endpoint
-from pythonanywhere_core.exceptions import PythonAnywhereApiException
-from pythonanywhere_core.files import Files
+from pythonanywhere_core import base
+from pythonanywhere_core.base import add_instrumentation_hook, get_api_endpoint, remove_instrumentation_hook
+from pythonanywhere_core.content_cache import ContentCache
+from pythonanywhere_core.exceptions import CircuitOpenError, DeadlineExceededError, PythonAnywhereApiException
+from pythonanywhere_core.files import Files, unpack_command
+from pythonanywhere_core.journal import OperationJournal
 
 
 @pytest.fixture()
@@ -61,6 +70,14 @@ def test_path_get_returns_contents_of_directory_when_path_to_dir_provided(
     assert Files().path_get(home_dir_path) == default_home_dir_files
 
 
+def test_path_get_uses_timeout_given_to_constructor(api_token, api_responses, base_url, home_dir_path):
+    api_responses.add(responses.GET, url=urljoin(base_url, f"path{home_dir_path}/a.txt"), body=b"a")
+
+    Files(timeout=3).path_get(f"{home_dir_path}/a.txt")
+
+    assert api_responses.calls[0].request.req_kwargs["timeout"] == (3, 3)
+
+
 def test_path_get_returns_file_contents_when_file_path_provided(
         api_token, api_responses, base_url, home_dir_path, readme_contents
 ):
@@ -136,6 +153,19 @@ def test_path_post_returns_201_when_new_file_uploaded(
     assert result == 201
 
 
+def test_path_post_escapes_file_name_in_streamed_body(api_token, api_responses, base_url, home_dir_path):
+    api_responses.add(responses.POST, url=f"{base_url}path{home_dir_path}/evil.txt", status=201)
+    source = io.BytesIO(b"contents")
+    source.name = 'evil"\r\nX-Injected: yes.txt'
+
+    Files().path_post(f"{home_dir_path}/evil.txt", source)
+
+    body = api_responses.calls[0].request.body
+    head = body[:body.index(b"\r\n\r\n")]
+    assert head.endswith(b'filename="evil%22%0D%0AX-Injected: yes.txt"')
+    assert b"\r\nX-Injected" not in head
+
+
 def test_path_post_raises_when_wrong_path(
         api_token, api_responses, base_url
 ):
@@ -358,6 +388,23 @@ def test_returns_list_of_the_regular_files_and_subdirectories_of_a_directory(
 
     assert result == [f"{home_dir_path}/{file}" for file in ["README.txt", "foo/"]]
 
+def test_iter_tree_yields_tree_entries(
+        api_token, api_responses, base_url, home_dir_path
+):
+    url = urljoin(base_url, f"tree/?path={home_dir_path}")
+    api_responses.add(
+        responses.GET,
+        url=url,
+        status=200,
+        body=json.dumps([f"{home_dir_path}/README.txt", f"{home_dir_path}/foo/"]),
+        headers={"Content-Type": "application/json"},
+    )
+
+    entries = list(Files().iter_tree(home_dir_path))
+
+    assert [(entry.name, entry.is_dir) for entry in entries] == [("README.txt", False), ("foo", True)]
+
+
 def test_raises_when_path_not_pointing_to_directory(
         api_token, api_responses, base_url, home_dir_path
 ):
@@ -457,6 +504,60 @@ def test_tree_post_creates_empty_directories(
     assert api_responses.calls[1].request.method == "DELETE"
 
 
+def test_tree_post_skips_empty_directories_already_present(
+        api_token, api_responses, base_url, home_dir_path, tmp_path
+):
+    (tmp_path / "cache").mkdir()
+    (tmp_path / "media").mkdir()
+    remote_dir = f"{home_dir_path}/myapp"
+    tree = json.dumps([f"{remote_dir}/cache/", f"{remote_dir}/index.html"])
+    api_responses.add(responses.GET, url=urljoin(base_url, f"tree/?path={remote_dir}"), status=200, body=tree)
+    api_responses.add(responses.POST, url=f"{base_url}path{remote_dir}/media/.empty", status=201)
+    api_responses.add(responses.DELETE, url=f"{base_url}path{remote_dir}/media/.empty", status=204)
+
+    Files().tree_post(str(tmp_path), remote_dir)
+
+    assert len(api_responses.calls) == 3
+    assert not any("cache" in call.request.url for call in api_responses.calls)
+
+
+def test_dirs_post_creates_all_directories_when_parent_is_missing(
+        api_token, api_responses, base_url, home_dir_path
+):
+    remote_dir = f"{home_dir_path}/new"
+    api_responses.add(responses.GET, url=urljoin(base_url, f"tree/?path={remote_dir}"), status=404)
+    for name in ("a", "b"):
+        api_responses.add(responses.POST, url=f"{base_url}path{remote_dir}/{name}/.empty", status=201)
+        api_responses.add(responses.DELETE, url=f"{base_url}path{remote_dir}/{name}/.empty", status=204)
+
+    result = Files().dirs_post([f"{remote_dir}/a", f"{remote_dir}/b/"])
+
+    assert result == {f"{remote_dir}/a": 201, f"{remote_dir}/b": 201}
+
+
+@pytest.mark.parametrize("error", [CircuitOpenError("open"), DeadlineExceededError("late")])
+def test_dirs_post_does_not_create_directories_when_listing_is_cut_short(
+        api_token, api_responses, home_dir_path, mocker, error
+):
+    mocker.patch.object(Files, "iter_tree", side_effect=error)
+
+    with pytest.raises(type(error)):
+        Files().dirs_post([f"{home_dir_path}/new/a", f"{home_dir_path}/new/b"])
+
+    assert len(api_responses.calls) == 0
+
+
+def test_tree_post_raises_when_empty_directory_cannot_be_created(
+        api_token, api_responses, base_url, home_dir_path, tmp_path
+):
+    (tmp_path / "empty_dir").mkdir()
+    remote_dir = f"{home_dir_path}/myapp"
+    api_responses.add(responses.POST, url=f"{base_url}path{remote_dir}/empty_dir/.empty", status=403)
+
+    with pytest.raises(PythonAnywhereApiException):
+        Files().tree_post(str(tmp_path), remote_dir)
+
+
 def test_tree_post_raises_when_path_is_not_a_directory(
         api_token, tmp_path
 ):
@@ -481,6 +582,399 @@ def test_tree_post_fails_fast_on_upload_error(
     api_responses.add(responses.POST, url=f"{base_url}path{remote_dir}/b.txt", status=403)
 
     with pytest.raises(PythonAnywhereApiException):
-        Files().tree_post(str(tmp_path), remote_dir)
+        Files().tree_post(str(tmp_path), remote_dir, max_workers=1)
+
+    assert len(api_responses.calls) == 2
+
+
+def test_tree_post_uploads_files_concurrently_within_limit(home_dir_path, tmp_path, mocker):
+    for n in range(12):
+        (tmp_path / f"{n}.txt").write_bytes(b"x")
+    lock = threading.Lock()
+    running, peak = [], []
+
+    def post(remote_path, content):
+        with lock:
+            running.append(remote_path)
+            peak.append(len(running))
+        time.sleep(0.01)
+        with lock:
+            running.remove(remote_path)
+        return 201
+
+    path_post = mocker.patch.object(Files, "path_post", side_effect=post)
+
+    Files().tree_post(str(tmp_path), f"{home_dir_path}/myapp", max_workers=4)
+
+    assert path_post.call_count == 12
+    assert 1 < max(peak) <= 4
+
+
+def test_tree_post_resumes_from_journal(
+        api_token, api_responses, base_url, home_dir_path, tmp_path
+):
+    local_dir = tmp_path / "site"
+    local_dir.mkdir()
+    (local_dir / "a.txt").write_bytes(b"aaa")
+    (local_dir / "b.txt").write_bytes(b"bbb")
+    journal_path = tmp_path / "upload.journal"
+    remote_dir = f"{home_dir_path}/myapp"
+    api_responses.add(responses.POST, url=f"{base_url}path{remote_dir}/a.txt", status=201)
+    api_responses.add(responses.POST, url=f"{base_url}path{remote_dir}/b.txt", status=403)
+
+    with pytest.raises(PythonAnywhereApiException):
+        Files().tree_post(str(local_dir), remote_dir, journal=OperationJournal(journal_path), max_workers=1)
+    api_responses.replace(responses.POST, url=f"{base_url}path{remote_dir}/b.txt", status=201)
+    Files().tree_post(str(local_dir), remote_dir, journal=OperationJournal(journal_path), max_workers=1)
+
+    assert [call.request.url for call in api_responses.calls] == [
+        f"{base_url}path{remote_dir}/a.txt",
+        f"{base_url}path{remote_dir}/b.txt",
+        f"{base_url}path{remote_dir}/b.txt",
+    ]
+    assert not journal_path.exists()
+
+
+@pytest.mark.parametrize("change_a, rerun_dir", [(False, "other"), (True, "myapp")])
+def test_tree_post_journal_does_not_skip_files_changed_or_sent_elsewhere(
+        api_token, api_responses, base_url, home_dir_path, tmp_path, change_a, rerun_dir
+):
+    local_dir = tmp_path / "site"
+    local_dir.mkdir()
+    (local_dir / "a.txt").write_bytes(b"aaa")
+    (local_dir / "b.txt").write_bytes(b"bbb")
+    journal_path = tmp_path / "upload.journal"
+    remote_dir = f"{home_dir_path}/myapp"
+    api_responses.add(responses.POST, url=f"{base_url}path{remote_dir}/a.txt", status=201)
+    api_responses.add(responses.POST, url=f"{base_url}path{remote_dir}/b.txt", status=403)
+    with pytest.raises(PythonAnywhereApiException):
+        Files().tree_post(str(local_dir), remote_dir, journal=OperationJournal(journal_path), max_workers=1)
+
+    if change_a:
+        (local_dir / "a.txt").write_bytes(b"changed")
+    rerun_remote_dir = f"{home_dir_path}/{rerun_dir}"
+    api_responses.upsert(responses.POST, url=f"{base_url}path{rerun_remote_dir}/a.txt", status=201)
+    api_responses.upsert(responses.POST, url=f"{base_url}path{rerun_remote_dir}/b.txt", status=201)
+    Files().tree_post(str(local_dir), rerun_remote_dir, journal=OperationJournal(journal_path), max_workers=1)
+
+    assert sorted(call.request.url for call in api_responses.calls[2:]) == [
+        f"{base_url}path{rerun_remote_dir}/a.txt",
+        f"{base_url}path{rerun_remote_dir}/b.txt",
+    ]
+
+
+def test_tree_post_skips_ignored_paths(
+        api_token, api_responses, base_url, home_dir_path, tmp_path
+):
+    (tmp_path / "app.py").write_bytes(b"")
+    (tmp_path / "debug.log").write_bytes(b"")
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".git" / "HEAD").write_bytes(b"")
+    (tmp_path / ".gitignore").write_bytes(b"*.log\n")
+    remote_dir = f"{home_dir_path}/myapp"
+    api_responses.add(responses.POST, url=f"{base_url}path{remote_dir}/.gitignore", status=201)
+    api_responses.add(responses.POST, url=f"{base_url}path{remote_dir}/app.py", status=201)
+
+    Files().tree_post(str(tmp_path), remote_dir, ignore_patterns=[".git/"], ignore_file_names=[".gitignore"])
+
+    assert sorted(call.request.url for call in api_responses.calls) == [
+        f"{base_url}path{remote_dir}/.gitignore",
+        f"{base_url}path{remote_dir}/app.py",
+    ]
+
+
+def test_tree_post_uploads_single_archive_when_unpack_hook_given(
+        api_token, api_responses, base_url, home_dir_path, tmp_path
+):
+    (tmp_path / "index.html").write_bytes(b"<h1>hello</h1>")
+    (tmp_path / "static").mkdir()
+    (tmp_path / "static" / "app.js").write_bytes(b"console.log('hi')")
+    (tmp_path / "media").mkdir()
+    remote_dir = f"{home_dir_path}/myapp"
+    archive_url = re.compile(re.escape(f"{base_url}path{remote_dir}/.tree_post-") + r"[0-9a-f]+\.tar\.gz")
+    api_responses.add(responses.POST, url=archive_url, status=201)
+    api_responses.add(responses.DELETE, url=archive_url, status=204)
+    unpacked = []
+
+    Files().tree_post(str(tmp_path), remote_dir, unpack=lambda *args: unpacked.append(args))
+
+    assert [call.request.method for call in api_responses.calls] == ["POST", "DELETE"]
+    archive_path = api_responses.calls[1].request.url.split("/path", 1)[1]
+    assert unpacked == [(archive_path, remote_dir)]
+    body = api_responses.calls[0].request.body
+    content = body[body.index(b"\r\n\r\n") + 4:body.rindex(b"\r\n--")]
+    with tarfile.open(fileobj=io.BytesIO(content), mode="r:gz") as tar:
+        assert sorted(tar.getnames()) == ["index.html", "media", "static/app.js"]
+        assert tar.extractfile("static/app.js").read() == b"console.log('hi')"
+
+
+def test_tree_post_falls_back_to_per_file_upload_when_unpack_fails(
+        api_token, api_responses, base_url, home_dir_path, tmp_path
+):
+    (tmp_path / "index.html").write_bytes(b"<h1>hello</h1>")
+    remote_dir = f"{home_dir_path}/myapp"
+    archive_url = re.compile(re.escape(f"{base_url}path{remote_dir}/.tree_post-") + r"[0-9a-f]+\.tar\.gz")
+    api_responses.add(responses.POST, url=archive_url, status=201)
+    api_responses.add(responses.DELETE, url=archive_url, status=204)
+    api_responses.add(responses.POST, url=f"{base_url}path{remote_dir}/index.html", status=201)
+    events = []
+    hook = lambda event, info: events.append((event, info))
+
+    def unpack(archive_path, dest_dir_path):
+        raise PythonAnywhereApiException("no console available")
+
+    add_instrumentation_hook(hook)
+    try:
+        Files().tree_post(str(tmp_path), remote_dir, unpack=unpack)
+    finally:
+        remove_instrumentation_hook(hook)
+
+    assert [call.request.method for call in api_responses.calls] == ["POST", "DELETE", "POST"]
+    assert api_responses.calls[2].request.url == f"{base_url}path{remote_dir}/index.html"
+    assert events[0][0] == "archive_upload_failed"
+    assert str(events[0][1]["error"]) == "no console available"
+
+
+def test_tree_post_reports_archive_it_could_not_delete(
+        api_token, api_responses, base_url, home_dir_path, tmp_path
+):
+    (tmp_path / "index.html").write_bytes(b"<h1>hello</h1>")
+    remote_dir = f"{home_dir_path}/myapp"
+    archive_url = re.compile(re.escape(f"{base_url}path{remote_dir}/.tree_post-") + r"[0-9a-f]+\.tar\.gz")
+    api_responses.add(responses.POST, url=archive_url, status=201)
+    api_responses.add(responses.DELETE, url=archive_url, status=500)
+    events = []
+    hook = lambda event, info: events.append((event, info))
+
+    add_instrumentation_hook(hook)
+    try:
+        Files().tree_post(str(tmp_path), remote_dir, unpack=lambda *args: None)
+    finally:
+        remove_instrumentation_hook(hook)
+
+    assert [event for event, _ in events] == ["archive_delete_failed"]
+    assert archive_url.fullmatch(f"{base_url}path{events[0][1]['remote_path']}")
+    assert isinstance(events[0][1]["error"], PythonAnywhereApiException)
+
+
+def test_tree_post_raises_circuit_open_error_instead_of_falling_back(
+        api_token, api_responses, base_url, home_dir_path, tmp_path
+):
+    (tmp_path / "index.html").write_bytes(b"<h1>hello</h1>")
+    remote_dir = f"{home_dir_path}/myapp"
+    archive_url = re.compile(re.escape(f"{base_url}path{remote_dir}/.tree_post-") + r"[0-9a-f]+\.tar\.gz")
+    api_responses.add(responses.POST, url=archive_url, body=CircuitOpenError("open"))
+
+    with pytest.raises(CircuitOpenError):
+        Files().tree_post(str(tmp_path), remote_dir, unpack=lambda *args: None)
+
+    assert len(api_responses.calls) == 1
+
+
+def test_unpack_command_quotes_paths():
+    assert unpack_command("/home/u/my app/a.tar.gz", "/home/u/my app") == (
+        "tar -xzf '/home/u/my app/a.tar.gz' -C '/home/u/my app'"
+    )
+
+
+def test_path_post_skips_contents_cache_knows_are_current(api_token, api_responses, base_url, home_dir_path):
+    dest_path = f"{home_dir_path}/vendor.js"
+    api_responses.add(responses.POST, url=f"{base_url}path{dest_path}", status=201)
+    cache = ContentCache()
+
+    assert Files().path_post(dest_path, b"bundle", cache=cache) == 201
+    assert Files().path_post(dest_path, b"bundle", cache=cache) == 304
+    assert Files().path_post(dest_path, b"bundle v2", cache=cache) == 201
+
+    assert len(api_responses.calls) == 2
+    assert cache.bytes_saved == len(b"bundle")
+
+
+def test_path_delete_forgets_path_in_cache(api_token, api_responses, base_url, home_dir_path):
+    dest_path = f"{home_dir_path}/vendor.js"
+    api_responses.add(responses.POST, url=f"{base_url}path{dest_path}", status=201)
+    api_responses.add(responses.DELETE, url=f"{base_url}path{dest_path}", status=204)
+    cache = ContentCache()
+    Files().path_post(dest_path, b"bundle", cache=cache)
+
+    Files().path_delete(dest_path, cache=cache)
+
+    assert Files().path_post(dest_path, b"bundle", cache=cache) == 201
+
+
+def test_tree_post_with_cache_uploads_only_changed_files(
+        api_token, api_responses, base_url, home_dir_path, tmp_path
+):
+    (tmp_path / "a.txt").write_bytes(b"aaa")
+    (tmp_path / "b.txt").write_bytes(b"bbb")
+    remote_dir = f"{home_dir_path}/myapp"
+    api_responses.add(responses.POST, url=f"{base_url}path{remote_dir}/a.txt", status=201)
+    api_responses.add(responses.POST, url=f"{base_url}path{remote_dir}/b.txt", status=201)
+    cache = ContentCache()
+    Files().tree_post(str(tmp_path), remote_dir, cache=cache)
+    (tmp_path / "b.txt").write_bytes(b"bbb v2")
+
+    Files().tree_post(str(tmp_path), remote_dir, cache=cache)
+
+    assert len(api_responses.calls) == 3
+    assert api_responses.calls[2].request.url == f"{base_url}path{remote_dir}/b.txt"
+    assert cache.bytes_saved == 3
+
+
+def test_tree_post_archive_mode_with_cache_skips_unchanged_files(
+        api_token, api_responses, base_url, home_dir_path, tmp_path
+):
+    (tmp_path / "a.txt").write_bytes(b"aaa")
+    remote_dir = f"{home_dir_path}/myapp"
+    archive_url = re.compile(re.escape(f"{base_url}path{remote_dir}/.tree_post-") + r"[0-9a-f]+\.tar\.gz")
+    api_responses.add(responses.POST, url=archive_url, status=201)
+    api_responses.add(responses.DELETE, url=archive_url, status=204)
+    cache = ContentCache()
+    unpacked = []
+
+    for _ in range(2):
+        Files().tree_post(str(tmp_path), remote_dir, unpack=lambda *args: unpacked.append(args), cache=cache)
 
+    assert len(unpacked) == 1
     assert len(api_responses.calls) == 2
+    assert cache.bytes_saved == 3
+
+
+@pytest.mark.parametrize(
+    "offset, length, status, headers, body, expected_range, expected",
+    [
+        (10, 5, 206, {"Content-Range": "bytes 10-14/100"}, b"abcde", "bytes=10-14", b"abcde"),
+        (-3, None, 206, {"Content-Range": "bytes 97-99/100"}, b"xyz", "bytes=-3", b"xyz"),
+        (2, 3, 200, {}, b"0123456789", "bytes=2-4", b"234"),
+        (200, None, 416, {"Content-Range": "bytes */100"}, b"", "bytes=200-", b""),
+    ],
+)
+def test_path_get_range(
+        api_token, api_responses, base_url, home_dir_path, offset, length, status, headers, body, expected_range,
+        expected
+):
+    url = f"{base_url}path{home_dir_path}/big.log"
+    api_responses.add(responses.GET, url=url, status=status, headers=headers, body=body)
+
+    assert Files().path_get_range(f"{home_dir_path}/big.log", offset, length) == expected
+    assert api_responses.calls[0].request.headers["Range"] == expected_range
+
+
+def test_path_get_range_raises_on_error(api_token, api_responses, base_url, home_dir_path):
+    api_responses.add(responses.GET, url=f"{base_url}path{home_dir_path}/missing", status=404)
+
+    with pytest.raises(PythonAnywhereApiException):
+        Files().path_get_range(f"{home_dir_path}/missing", 0, 10)
+
+
+def test_path_download_writes_file_and_removes_partial_one(api_token, api_responses, base_url, home_dir_path, tmp_path):
+    api_responses.add(responses.GET, url=f"{base_url}path{home_dir_path}/big.bin", body=b"0123456789")
+
+    assert Files().path_download(f"{home_dir_path}/big.bin", tmp_path / "big.bin") == 10
+    assert (tmp_path / "big.bin").read_bytes() == b"0123456789"
+    assert not (tmp_path / "big.bin.part").exists()
+    assert api_responses.calls[0].request.headers["Range"] == "bytes=0-"
+
+
+def test_path_download_writes_empty_file(api_token, api_responses, base_url, home_dir_path, tmp_path):
+    api_responses.add(
+        responses.GET,
+        url=f"{base_url}path{home_dir_path}/empty.txt",
+        status=416,
+        headers={"Content-Range": "bytes */0"},
+    )
+
+    assert Files().path_download(f"{home_dir_path}/empty.txt", tmp_path / "empty.txt") == 0
+    assert (tmp_path / "empty.txt").read_bytes() == b""
+    assert not (tmp_path / "empty.txt.part").exists()
+
+
+def test_path_download_resumes_after_failures(api_token, api_responses, base_url, home_dir_path, tmp_path):
+    url = f"{base_url}path{home_dir_path}/big.bin"
+    api_responses.add(responses.GET, url=url, status=206, headers={"Content-Range": "bytes 0-9/10"}, body=b"012345")
+    api_responses.add(responses.GET, url=url, body=requests.ConnectionError("connection reset"))
+    api_responses.add(responses.GET, url=url, status=503)
+    api_responses.add(responses.GET, url=url, status=206, headers={"Content-Range": "bytes 6-9/10"}, body=b"6789")
+
+    assert Files().path_download(f"{home_dir_path}/big.bin", tmp_path / "big.bin", retry_delay=0) == 10
+    assert (tmp_path / "big.bin").read_bytes() == b"0123456789"
+    assert [call.request.headers["Range"] for call in api_responses.calls] == [
+        "bytes=0-", "bytes=6-", "bytes=6-", "bytes=6-"
+    ]
+
+
+def test_path_download_resumes_existing_partial_file(api_token, api_responses, base_url, home_dir_path, tmp_path):
+    (tmp_path / "big.bin.part").write_bytes(b"0123")
+    api_responses.add(
+        responses.GET, url=f"{base_url}path{home_dir_path}/big.bin", status=206,
+        headers={"Content-Range": "bytes 4-9/10"}, body=b"456789",
+    )
+
+    Files().path_download(f"{home_dir_path}/big.bin", tmp_path / "big.bin")
+
+    assert (tmp_path / "big.bin").read_bytes() == b"0123456789"
+    assert api_responses.calls[0].request.headers["Range"] == "bytes=4-"
+
+
+def test_path_download_keeps_partial_file_when_retries_run_out(
+        api_token, api_responses, base_url, home_dir_path, tmp_path
+):
+    url = f"{base_url}path{home_dir_path}/big.bin"
+    api_responses.add(responses.GET, url=url, status=206, headers={"Content-Range": "bytes 0-9/10"}, body=b"012")
+    api_responses.add(responses.GET, url=url, status=503)
+
+    with pytest.raises(PythonAnywhereApiException, match="after 3 bytes and 2 retries"):
+        Files().path_download(f"{home_dir_path}/big.bin", tmp_path / "big.bin", max_retries=2, retry_delay=0)
+
+    assert (tmp_path / "big.bin.part").read_bytes() == b"012"
+    assert not (tmp_path / "big.bin").exists()
+
+
+def test_path_download_raises_without_retrying_client_errors(
+        api_token, api_responses, base_url, home_dir_path, tmp_path
+):
+    api_responses.add(responses.GET, url=f"{base_url}path{home_dir_path}/missing", status=404)
+
+    with pytest.raises(PythonAnywhereApiException, match="GET to download"):
+        Files().path_download(f"{home_dir_path}/missing", tmp_path / "missing")
+
+    assert len(api_responses.calls) == 1
+
+
+def test_path_download_waits_for_open_circuit_breaker(
+        api_token, api_responses, base_url, home_dir_path, tmp_path, monkeypatch
+):
+    monkeypatch.setattr(base, "CIRCUIT_BREAKER_RECOVERY_TIMEOUT", 0.01)
+    url = f"{base_url}path{home_dir_path}/big.bin"
+    for _ in range(base.CIRCUIT_BREAKER_FAILURE_THRESHOLD + 1):
+        api_responses.add(responses.GET, url=url, body=requests.ConnectionError("connection refused"))
+    api_responses.add(responses.GET, url=url, body=b"0123456789")
+
+    Files().path_download(f"{home_dir_path}/big.bin", tmp_path / "big.bin", max_retries=6, retry_delay=0)
+
+    assert (tmp_path / "big.bin").read_bytes() == b"0123456789"
+
+
+def test_path_download_reports_stream_errors_to_circuit_breaker(
+        api_token, api_responses, base_url, home_dir_path, tmp_path, monkeypatch, mocker
+):
+    url = f"{base_url}path{home_dir_path}/big.bin"
+    api_responses.add(responses.GET, url=url, status=206, headers={"Content-Range": "bytes 0-9/10"}, body=b"0123456789")
+    api_responses.add(responses.GET, url=url, status=206, headers={"Content-Range": "bytes 3-9/10"}, body=b"3456789")
+    iter_content = requests.Response.iter_content
+    broken = []
+
+    def iter_content_breaking_once(response, chunk_size=1, decode_unicode=False):
+        if not broken:
+            broken.append(response)
+            yield b"012"
+            raise requests.exceptions.ChunkedEncodingError("connection reset")
+        yield from iter_content(response, chunk_size, decode_unicode)
+
+    monkeypatch.setattr(requests.Response, "iter_content", iter_content_breaking_once)
+    record_failure = mocker.spy(base.CircuitBreaker, "record_failure")
+
+    Files().path_download(f"{home_dir_path}/big.bin", tmp_path / "big.bin", retry_delay=0)
+
+    assert (tmp_path / "big.bin").read_bytes() == b"0123456789"
+    assert record_failure.call_count == 1
@@ -0,0 +1,76 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from pythonanywhere_core import hashing
+from pythonanywhere_core.content_cache import content_digest
+from pythonanywhere_core.hashing import HashCache, hash_file, iter_hashes
+
+
+@pytest.mark.parametrize("mmap_threshold", [1, hashing.MMAP_THRESHOLD])
+def test_hash_file_matches_content_digest(tmp_path, mmap_threshold):
+    path = tmp_path / "data.bin"
+    path.write_bytes(os.urandom(10000))
+
+    assert hash_file(path, mmap_threshold=mmap_threshold) == content_digest(path.read_bytes())
+
+
+def test_hash_file_handles_empty_files(tmp_path):
+    path = tmp_path / "empty"
+    path.write_bytes(b"")
+
+    assert hash_file(path, mmap_threshold=0) == content_digest(b"")
+
+
+def test_hash_cache_is_keyed_by_inode_size_and_mtime(tmp_path):
+    path = tmp_path / "a.txt"
+    path.write_bytes(b"aaa")
+    cache = HashCache(tmp_path / "hashes.db")
+    cache.put(os.stat(path), "digest")
+
+    assert HashCache(tmp_path / "hashes.db").get(os.stat(path)) == "digest"
+    path.write_bytes(b"aaaa")
+    assert cache.get(os.stat(path)) is None
+
+
+def test_iter_hashes_in_processes_when_asked(tmp_path):
+    paths = []
+    for n in range(5):
+        path = tmp_path / f"{n}.txt"
+        path.write_bytes(b"x" * n)
+        paths.append(str(path))
+
+    result = dict(iter_hashes(paths, max_workers=2, executor_factory=ProcessPoolExecutor))
+
+    assert result == {str(path): content_digest(b"x" * n) for n, path in enumerate(paths)}
+
+
+def test_iter_hashes_submits_small_files_in_batches(tmp_path, mocker):
+    paths = []
+    for n in range(10):
+        path = tmp_path / f"{n}.txt"
+        path.write_bytes(b"x" * (n + 1) * 10)
+        paths.append(str(path))
+    executor = ThreadPoolExecutor()
+    submit = mocker.spy(executor, "submit")
+
+    result = dict(iter_hashes(paths, executor_factory=lambda _: executor, max_pending=100, batch_size=60))
+
+    assert result == {path: content_digest(b"x" * (n + 1) * 10) for n, path in enumerate(paths)}
+    assert [len(call.args[1]) for call in submit.call_args_list] == [3, 2, 1, 1, 1, 1, 1]
+
+
+def test_iter_hashes_does_not_rehash_cached_files(tmp_path, monkeypatch):
+    path = tmp_path / "a.txt"
+    path.write_bytes(b"aaa")
+    cache = HashCache()
+    hashed = []
+    monkeypatch.setattr(hashing, "hash_file", lambda p: hashed.append(p) or content_digest(b"aaa"))
+
+    for _ in range(2):
+        assert list(iter_hashes([str(path)], cache=cache, executor_factory=ThreadPoolExecutor)) == [
+            (str(path), content_digest(b"aaa"))
+        ]
+
+    assert hashed == [str(path)]
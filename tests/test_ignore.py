@@ -0,0 +1,115 @@
+import os
+
+import pytest
+
+from pythonanywhere_core.ignore import DEFAULT_IGNORE_PATTERNS, IgnoreRules, IgnoreTree, walk
+
+
+@pytest.mark.parametrize(
+    "pattern, path, is_dir, expected",
+    [
+        ("*.pyc", "a.pyc", False, True),
+        ("*.pyc", "pkg/sub/a.pyc", False, True),
+        ("*.pyc", "a.py", False, None),
+        ("build/", "build", True, True),
+        ("build/", "build", False, None),
+        ("/build", "build", False, True),
+        ("/build", "src/build", False, None),
+        ("docs/*.md", "docs/a.md", False, True),
+        ("docs/*.md", "docs/sub/a.md", False, None),
+        ("**/logs", "a/b/logs", True, True),
+        ("logs/**", "logs/a/b.txt", False, True),
+        ("a/**/b", "a/b", False, True),
+        ("a/**/b", "a/x/y/b", False, True),
+        ("file?.txt", "file1.txt", False, True),
+        ("file[0-9].txt", "filea.txt", False, None),
+        ("file[!0-9].txt", "filea.txt", False, True),
+        ("\\#notes", "#notes", False, True),
+        ("# comment", "# comment", False, None),
+    ],
+)
+def test_match(pattern, path, is_dir, expected):
+    assert IgnoreRules([pattern]).match(path, is_dir=is_dir) is expected
+
+
+def test_last_matching_rule_wins():
+    rules = IgnoreRules(["*.log", "!keep.log"])
+
+    assert rules.match("debug.log") is True
+    assert rules.match("keep.log") is False
+
+
+def test_rules_relative_to_base():
+    rules = IgnoreRules(["/out"], base="sub")
+
+    assert rules.match("sub/out") is True
+    assert rules.match("out") is None
+
+
+def test_is_ignored_checks_parent_directories():
+    rules = IgnoreRules(["node_modules/"])
+
+    assert rules.is_ignored("web/node_modules/lib/index.js")
+    assert not rules.is_ignored("web/src/index.js")
+
+
+def test_walk_prunes_ignored_directories(tmp_path, monkeypatch):
+    (tmp_path / "app.py").write_text("")
+    (tmp_path / "__pycache__").mkdir()
+    (tmp_path / "__pycache__" / "app.cpython-38.pyc").write_text("")
+    (tmp_path / ".git" / "objects").mkdir(parents=True)
+    (tmp_path / "static").mkdir()
+    (tmp_path / "static" / "app.js").write_text("")
+    (tmp_path / "media").mkdir()
+
+    scanned = []
+    real_scandir = os.scandir
+    monkeypatch.setattr(os, "scandir", lambda path: scanned.append(os.path.basename(path)) or real_scandir(path))
+
+    result = [(relative, is_dir) for relative, _, is_dir in walk(tmp_path, IgnoreRules(DEFAULT_IGNORE_PATTERNS))]
+
+    assert result == [("app.py", False), ("media", True), ("static/app.js", False)]
+    assert "__pycache__" not in scanned
+    assert ".git" not in scanned
+
+
+def test_walk_reads_ignore_files_in_subdirectories(tmp_path):
+    (tmp_path / ".gitignore").write_text("*.log\n")
+    (tmp_path / "a.log").write_text("")
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / ".gitignore").write_text("!keep.log\ntmp/\n")
+    (tmp_path / "sub" / "keep.log").write_text("")
+    (tmp_path / "sub" / "other.log").write_text("")
+    (tmp_path / "sub" / "tmp").mkdir()
+    (tmp_path / "sub" / "tmp" / "x").write_text("")
+
+    result = [relative for relative, _, _ in walk(tmp_path, ignore_file_names=[".gitignore"])]
+
+    assert result == [".gitignore", "sub/.gitignore", "sub/keep.log"]
+
+
+def test_walk_treats_directory_with_only_ignored_entries_as_empty(tmp_path):
+    (tmp_path / "cache").mkdir()
+    (tmp_path / "cache" / "a.pyc").write_text("")
+
+    result = list(walk(tmp_path, IgnoreRules(["*.pyc"])))
+
+    assert result == [("cache", str(tmp_path / "cache"), True)]
+
+
+def test_ignore_tree_reads_ignore_files_of_parent_directories(tmp_path):
+    (tmp_path / ".gitignore").write_text("*.log\nbuild/\n")
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / ".gitignore").write_text("!keep.log\n")
+    tree = IgnoreTree(tmp_path, IgnoreRules(["*.tmp"]), [".gitignore"])
+
+    assert tree.is_ignored("sub/a.log")
+    assert not tree.is_ignored("sub/keep.log")
+    assert tree.is_ignored("build/out/app.js")
+    assert tree.is_ignored("x.tmp")
+    assert not tree.is_ignored("sub/app.py")
+
+    (tmp_path / "sub" / ".gitignore").write_text("")
+    tree.invalidate("sub")
+
+    assert tree.is_ignored("sub/keep.log")
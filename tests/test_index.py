@@ -0,0 +1,127 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from pythonanywhere_core.exceptions import PythonAnywhereApiException
+from pythonanywhere_core.index import RemoteIndex
+
+
+@pytest.fixture
+def clock():
+    class Clock:
+        now = 1000.0
+
+        def __call__(self):
+            return self.now
+
+    return Clock()
+
+
+@pytest.fixture
+def files(mocker):
+    files = mocker.Mock()
+    files.tree_get.return_value = [
+        "/home/u/app/",
+        "/home/u/app/main.py",
+        "/home/u/app/static/",
+        "/home/u/app/static/app.js",
+    ]
+    return files
+
+
+@pytest.fixture
+def index(files, clock):
+    return RemoteIndex(files=files, clock=clock)
+
+
+def test_refresh_returns_added_and_removed_paths(index, files):
+    assert index.refresh("/home/u/app")["added"] == [
+        "/home/u/app/",
+        "/home/u/app/main.py",
+        "/home/u/app/static/",
+        "/home/u/app/static/app.js",
+    ]
+    files.tree_get.return_value = ["/home/u/app/", "/home/u/app/main.py", "/home/u/app/wsgi.py"]
+
+    changes = index.refresh("/home/u/app/")
+
+    assert changes == {
+        "added": ["/home/u/app/wsgi.py"],
+        "removed": ["/home/u/app/static/", "/home/u/app/static/app.js"],
+    }
+
+
+def test_queries_do_not_call_api(index, files):
+    index.refresh("/home/u/app")
+    files.tree_get.reset_mock()
+
+    assert index.exists("/home/u/app/main.py") is True
+    assert index.exists("/home/u/app/static/") is True
+    assert index.exists("/home/u/app/missing.py") is False
+    assert index.exists("/home/u/other/file.py") is None
+    assert index.list("/home/u/app/static") == ["/home/u/app/static/", "/home/u/app/static/app.js"]
+    assert index.glob("/home/u/app/*.js") == ["/home/u/app/static/app.js"]
+    files.tree_get.assert_not_called()
+
+
+def test_truncated_listing_does_not_prove_absence(index, files):
+    files.tree_get.return_value = [f"/home/u/big/{n}" for n in range(1000)]
+
+    index.refresh("/home/u/big")
+
+    assert index.exists("/home/u/big/1001") is None
+
+
+def test_ensure_fresh_refreshes_only_stale_listings(index, files, clock):
+    assert index.ensure_fresh("/home/u/app", max_age=60) is not None
+    clock.now += 30
+    assert index.ensure_fresh("/home/u/app", max_age=60) is None
+    clock.now += 31
+    assert index.ensure_fresh("/home/u/app", max_age=60) == {"added": [], "removed": []}
+
+    assert files.tree_get.call_count == 2
+    assert index.fetched_at("/home/u/app") == datetime.fromtimestamp(1061, timezone.utc)
+
+
+def test_index_persists_between_instances(tmp_path, files, clock):
+    with RemoteIndex(tmp_path / "index.db", files=files, clock=clock) as index:
+        index.refresh("/home/u/app")
+
+    with RemoteIndex(tmp_path / "index.db", files=files, clock=clock) as index:
+        assert index.exists("/home/u/app/main.py") is True
+        assert index.fetched_at("/home/u/app") == datetime.fromtimestamp(1000, timezone.utc)
+
+
+def test_failed_refresh_keeps_indexed_entries(index, files):
+    index.refresh("/home/u/app")
+    files.tree_get.side_effect = PythonAnywhereApiException("nope")
+
+    with pytest.raises(PythonAnywhereApiException):
+        index.refresh("/home/u/app")
+
+    assert index.exists("/home/u/app/main.py") is True
+
+
+def test_truncated_listing_keeps_entries_it_does_not_contain(index, files):
+    files.tree_get.return_value = [f"/home/u/big/{n}" for n in range(501)]
+    index.refresh("/home/u/big")
+    files.tree_get.return_value = ["/home/u/big/"] + [f"/home/u/a{n}" for n in range(999)]
+
+    changes = index.refresh("/home/u")
+
+    assert changes["removed"] == []
+    assert len(changes["added"]) == 1000
+    assert index.exists("/home/u/big/500") is True
+    assert index.exists("/home/u/big/missing") is False
+
+
+def test_refreshing_subdirectory_keeps_its_own_entry(index, files):
+    files.tree_get.return_value = ["/home/u/a/", "/home/u/a/x.py", "/home/u/b.py"]
+    index.refresh("/home/u")
+    files.tree_get.return_value = ["/home/u/a/x.py", "/home/u/a/y.py"]
+
+    changes = index.refresh("/home/u/a")
+
+    assert changes == {"added": ["/home/u/a/y.py"], "removed": []}
+    assert index.exists("/home/u/a") is True
+    assert index.list("/home/u/") == ["/home/u/a/", "/home/u/a/x.py", "/home/u/a/y.py", "/home/u/b.py"]
@@ -0,0 +1,54 @@
+from pythonanywhere_core.journal import OperationJournal
+
+
+def test_records_survive_reopening(tmp_path):
+    path = tmp_path / "job.journal"
+    with OperationJournal(path) as journal:
+        journal.record("a.txt")
+        journal.record(("delete", 42))
+
+    journal = OperationJournal(path)
+
+    assert journal.is_done("a.txt")
+    assert journal.is_done(("delete", 42))
+    assert not journal.is_done("b.txt")
+    assert len(journal) == 2
+
+
+def test_pending_keeps_order_of_not_completed_keys(tmp_path):
+    journal = OperationJournal(tmp_path / "job.journal")
+    journal.record(2)
+
+    assert journal.pending([3, 2, 1]) == [3, 1]
+
+
+def test_ignores_partially_written_last_line(tmp_path):
+    path = tmp_path / "job.journal"
+    path.write_bytes(b'"a.txt"\n"b.t')
+
+    journal = OperationJournal(path)
+    journal.record("c.txt")
+    journal.close()
+
+    assert OperationJournal(path).pending(["a.txt", "b.txt", "c.txt"]) == ["b.txt"]
+
+
+def test_compact_drops_duplicated_and_corrupted_lines(tmp_path):
+    path = tmp_path / "job.journal"
+    path.write_bytes(b'"a.txt"\n"a.txt"\nnot json\n"b.txt"\n')
+    journal = OperationJournal(path)
+
+    journal.compact()
+
+    assert path.read_bytes() == b'"a.txt"\n"b.txt"\n'
+
+
+def test_finish_removes_journal(tmp_path):
+    path = tmp_path / "job.journal"
+    journal = OperationJournal(path)
+    journal.record("a.txt")
+
+    journal.finish()
+
+    assert not path.exists()
+    assert not journal.is_done("a.txt")
@@ -0,0 +1,52 @@
+import sys
+from datetime import date, datetime, timezone
+
+from pythonanywhere_core.models import CPUUsage, ScheduledTask, SSLInfo, TreeEntry, WebappInfo, WebsiteInfo
+
+
+def test_from_dict_ignores_unknown_keys_and_defaults_missing_ones():
+    info = WebappInfo.from_dict({"id": 1, "domain_name": "www.domain.com", "something_new": "ignored"})
+
+    assert info.id == 1
+    assert info.domain_name == "www.domain.com"
+    assert info.python_version is None
+
+
+def test_models_use_slots():
+    info = WebappInfo.from_dict({"id": 1})
+
+    assert not hasattr(info, "__dict__")
+    assert sys.getsizeof(info) < sys.getsizeof({"id": 1, "domain_name": "www.domain.com"})
+
+
+def test_dates_are_decoded_when_accessed():
+    task = ScheduledTask.from_dict({"id": 1, "expiry": "2025-10-16"})
+
+    assert task._expiry == "2025-10-16"
+    assert task.expiry == date(2025, 10, 16)
+
+
+def test_already_decoded_dates_are_returned_as_they_are():
+    not_after = datetime(2018, 8, 24, 17, 16, 23, tzinfo=timezone.utc)
+
+    assert SSLInfo.from_dict({"not_after": not_after}).not_after == not_after
+
+
+def test_cpu_usage_next_reset_time():
+    usage = CPUUsage.from_dict(
+        {"daily_cpu_limit_seconds": 100, "daily_cpu_total_usage_seconds": 5, "next_reset_time": "2025-08-09T03:26:37"}
+    )
+
+    assert usage.next_reset_time == datetime(2025, 8, 9, 3, 26, 37)
+
+
+def test_website_info_command():
+    website = WebsiteInfo.from_dict({"domain_name": "foo.com", "webapp": {"command": "run"}})
+
+    assert website.command == "run"
+
+
+def test_tree_entry():
+    assert TreeEntry("/home/user/foo/").is_dir
+    assert TreeEntry("/home/user/foo/").name == "foo"
+    assert not TreeEntry("/home/user/README.txt").is_dir
@@ -0,0 +1,89 @@
+import getpass
+import io
+import re
+
+import pytest
+import responses
+
+from pythonanywhere_core.base import get_api_endpoint
+from pythonanywhere_core.remote_file import RemoteFile
+
+CONTENT = bytes(range(256)) * 40
+
+
+@pytest.fixture()
+def file_url():
+    return f"{get_api_endpoint(username=getpass.getuser(), flavor='files')}path/home/u/data.bin"
+
+
+@pytest.fixture()
+def ranges(api_responses, file_url):
+    requested = []
+
+    def serve(request):
+        byte_range = request.headers["Range"]
+        requested.append(byte_range)
+        start, end = re.match(r"bytes=(-?\d*)-?(\d*)", byte_range).groups()
+        if start.startswith("-"):
+            start, end = max(len(CONTENT) + int(start), 0), len(CONTENT) - 1
+        else:
+            start, end = int(start), min(int(end) if end else len(CONTENT) - 1, len(CONTENT) - 1)
+        if start >= len(CONTENT):
+            return 416, {"Content-Range": f"bytes */{len(CONTENT)}"}, b""
+        return 206, {"Content-Range": f"bytes {start}-{end}/{len(CONTENT)}"}, CONTENT[start:end + 1]
+
+    api_responses.add_callback(responses.GET, file_url, callback=serve)
+    return requested
+
+
+def test_reads_lazily_in_blocks(api_token, ranges):
+    remote = RemoteFile("/home/u/data.bin", block_size=1000)
+
+    assert remote.read(10) == CONTENT[:10]
+    assert remote.read(1500) == CONTENT[10:1510]
+    assert ranges == ["bytes=0-999", "bytes=1000-1999"]
+
+
+def test_seek_from_end_reads_tail(api_token, ranges):
+    remote = RemoteFile("/home/u/data.bin", block_size=1000)
+
+    remote.seek(-100, io.SEEK_END)
+
+    assert remote.read() == CONTENT[-100:]
+    assert remote.tell() == len(CONTENT)
+    assert remote.read() == b""
+
+
+def test_caches_blocks_in_lru_order(api_token, ranges):
+    remote = RemoteFile("/home/u/data.bin", block_size=1000, cache_blocks=2)
+
+    for offset in (0, 1000, 0, 2000, 0, 1000):
+        remote.seek(offset)
+        assert remote.read(10) == CONTENT[offset:offset + 10]
+
+    assert ranges == ["bytes=0-999", "bytes=1000-1999", "bytes=2000-2999", "bytes=1000-1999"]
+
+
+def test_works_with_io_wrappers(api_token, ranges):
+    remote = io.BufferedReader(RemoteFile("/home/u/data.bin", block_size=4096))
+
+    assert remote.read() == CONTENT
+
+
+def test_reading_past_end_without_content_range_does_not_guess_size(api_token, api_responses, file_url):
+    def serve(request):
+        start, end = map(int, re.match(r"bytes=(\d+)-(\d+)", request.headers["Range"]).groups())
+        if start >= len(CONTENT):
+            return 416, {}, b""
+        return 206, {}, CONTENT[start:end + 1]
+
+    api_responses.add_callback(responses.GET, file_url, callback=serve)
+    remote = RemoteFile("/home/u/data.bin", block_size=4096)
+
+    remote.seek(20000)
+    assert remote.read(10) == b""
+    with pytest.raises(OSError):
+        remote.seek(-100, io.SEEK_END)
+    remote.seek(8190)
+    assert remote.read() == CONTENT[8190:]
+    assert remote.size == len(CONTENT)
@@ -1,11 +1,14 @@
 import getpass
+import time
+from datetime import datetime, timezone
 
 import pytest
 import responses
 
 from pythonanywhere_core.base import get_api_endpoint
-from pythonanywhere_core.resources import CPU
+from pythonanywhere_core.resources import CPU, CPUBudgetScheduler, CPUSampler
 from pythonanywhere_core.exceptions import PythonAnywhereApiException
+from pythonanywhere_core.models import CPUUsage
 
 
 @pytest.fixture
@@ -34,7 +37,21 @@ def test_get_cpu_usage_success(api_responses, api_token, cpu_api, base_url):
 
     result = cpu_api.get_cpu_usage()
 
-    assert result == example_response
+    assert result == {**example_response, 'next_reset_time': datetime(2025, 8, 9, 3, 26, 37)}
+
+
+def test_get_cpu_usage_model(api_responses, api_token, cpu_api, base_url):
+    api_responses.add(
+        responses.GET,
+        base_url,
+        json={'daily_cpu_limit_seconds': 100000, 'next_reset_time': '2025-08-09T03:26:37'},
+        status=200
+    )
+
+    usage = cpu_api.get_cpu_usage_model()
+
+    assert usage == CPUUsage(daily_cpu_limit_seconds=100000, _next_reset_time='2025-08-09T03:26:37')
+    assert usage.next_reset_time == datetime(2025, 8, 9, 3, 26, 37)
 
 
 def test_get_cpu_usage_api_error(api_responses, api_token, cpu_api, base_url):
@@ -48,4 +65,189 @@ def test_get_cpu_usage_api_error(api_responses, api_token, cpu_api, base_url):
     with pytest.raises(PythonAnywhereApiException) as exc_info:
         cpu_api.get_cpu_usage()
     
-    assert "Not found" in str(exc_info.value)
\ No newline at end of file
+    assert "Not found" in str(exc_info.value)
+
+@pytest.fixture
+def sampler(mocker):
+    sampler = CPUSampler(cpu=mocker.Mock(), capacity=4)
+    sampler.limit = 1000
+    sampler.next_reset_time = datetime(2025, 8, 10)
+    return sampler
+
+
+def test_sampler_keeps_only_last_samples_within_capacity(sampler):
+    for second in range(6):
+        sampler.record(second, second * 10)
+
+    assert sampler.samples() == [(2, 20), (3, 30), (4, 40), (5, 50)]
+
+
+def test_sampler_ignores_samples_before_daily_reset(sampler):
+    sampler.record(0, 900)
+    sampler.record(10, 950)
+    sampler.record(20, 5)
+    sampler.record(30, 15)
+
+    assert sampler.samples() == [(20, 5), (30, 15)]
+    assert sampler.burn_rate() == 1
+
+
+def test_sampler_burn_rate_needs_two_samples(sampler):
+    sampler.record(0, 0)
+
+    assert sampler.burn_rate() is None
+    assert sampler.projected_exhaustion() is None
+    assert sampler.percentiles() == {}
+
+
+def test_sampler_burn_rate_within_window(sampler):
+    sampler.record(0, 0)
+    sampler.record(10, 100)
+    sampler.record(20, 110)
+
+    assert sampler.burn_rate() == 5.5
+    assert sampler.burn_rate(window=10) == 1
+
+
+def test_sampler_projects_exhaustion_before_reset(sampler):
+    start = datetime(2025, 8, 9, tzinfo=timezone.utc).timestamp()
+    sampler.record(start, 0)
+    sampler.record(start + 100, 100)
+
+    assert sampler.projected_exhaustion() == datetime(2025, 8, 9, 0, 16, 40, tzinfo=timezone.utc)
+
+
+def test_sampler_does_not_project_exhaustion_after_reset(sampler):
+    start = datetime(2025, 8, 9, tzinfo=timezone.utc).timestamp()
+    sampler.record(start, 0)
+    sampler.record(start + 1000, 1)
+
+    assert sampler.projected_exhaustion() is None
+
+
+def test_sampler_percentiles(sampler):
+    for second, used in [(0, 0), (1, 1), (2, 3), (3, 6)]:
+        sampler.record(second, used)
+
+    assert sampler.percentiles((50, 100)) == {50: 2, 100: 3}
+
+
+def test_sampler_percentiles_use_nearest_rank(sampler):
+    sampler = CPUSampler(cpu=sampler.cpu, capacity=6)
+    for second, used in [(0, 0), (1, 1), (2, 3), (3, 6), (4, 10), (5, 15)]:
+        sampler.record(second, used)
+
+    assert sampler.percentiles((0, 20, 50, 90, 100)) == {0: 1, 20: 1, 50: 3, 90: 5, 100: 5}
+
+
+def test_sampler_samples_in_background(mocker):
+    cpu = mocker.Mock()
+    cpu.get_cpu_usage.return_value = {
+        "daily_cpu_limit_seconds": 100,
+        "daily_cpu_total_usage_seconds": 5,
+        "next_reset_time": datetime(2025, 8, 9, 3, 26, 37),
+    }
+
+    with CPUSampler(cpu=cpu, interval=0.01) as sampler:
+        deadline = time.monotonic() + 5
+        while len(sampler.samples()) < 2 and time.monotonic() < deadline:
+            time.sleep(0.005)
+
+    assert sampler.limit == 100
+    assert sampler.samples()[0][1] == 5
+
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock(datetime(2025, 8, 9, tzinfo=timezone.utc).timestamp())
+
+
+@pytest.fixture
+def budget_cpu(mocker, clock):
+    cpu = mocker.Mock()
+    cpu.get_cpu_usage.return_value = {
+        "daily_cpu_limit_seconds": 100,
+        "daily_cpu_total_usage_seconds": 40,
+        "next_reset_time": datetime(2025, 8, 9, 0, 1),
+    }
+    return cpu
+
+
+@pytest.fixture
+def scheduler(budget_cpu, clock):
+    return CPUBudgetScheduler(cpu=budget_cpu, clock=clock, sleep=clock.sleep, max_delay=30)
+
+
+def test_budget_scheduler_allowed_rate(scheduler):
+    assert scheduler.remaining() == 60
+    assert scheduler.allowed_rate() == 1
+
+
+def test_budget_scheduler_caches_usage(scheduler, budget_cpu, clock):
+    scheduler.remaining()
+    scheduler.remaining()
+    clock.now += 60
+    scheduler.remaining()
+
+    assert budget_cpu.get_cpu_usage.call_count == 2
+
+
+def test_budget_scheduler_runs_by_priority_and_paces_units(scheduler, clock):
+    order = []
+    low = scheduler.submit(order.append, "low", priority=5, cost=10)
+    high = scheduler.submit(order.append, "high", priority=1, cost=10)
+
+    assert scheduler.run_pending() == 2
+
+    assert order == ["high", "low"]
+    assert high.done() and low.done()
+    assert clock.sleeps == [10]
+
+
+def test_budget_scheduler_defers_units_that_would_wait_too_long(scheduler):
+    first = scheduler.submit(lambda: "first", cost=40)
+    second = scheduler.submit(lambda: "second", cost=1)
+
+    assert scheduler.run_pending() == 1
+
+    assert first.result() == "first"
+    assert not second.done()
+    assert len(scheduler) == 1
+
+
+def test_budget_scheduler_defers_units_over_remaining_allowance(scheduler):
+    future = scheduler.submit(lambda: None, cost=61)
+
+    assert scheduler.run_pending() == 0
+    assert not future.done()
+
+
+def test_budget_scheduler_always_runs_critical_units(scheduler):
+    future = scheduler.submit(lambda: "done", priority=0, cost=1000)
+
+    assert scheduler.run_pending() == 1
+    assert future.result() == "done"
+
+
+def test_budget_scheduler_reports_exceptions_through_futures(scheduler):
+    def fail():
+        raise ValueError("boom")
+
+    future = scheduler.submit(fail)
+    scheduler.run_pending()
+
+    with pytest.raises(ValueError):
+        future.result()
@@ -1,11 +1,14 @@
 import getpass
 import json
+from datetime import date
 
 import pytest
 import responses
 
 from pythonanywhere_core.base import get_api_endpoint
 from pythonanywhere_core.exceptions import PythonAnywhereApiException
+from pythonanywhere_core.journal import OperationJournal
+from pythonanywhere_core.models import ScheduledTask
 from pythonanywhere_core.schedule import Schedule
 
 
@@ -83,6 +86,16 @@ def test_creates_hourly_task(
     assert Schedule().create(hourly_task_params) == task_specs
 
 
+def test_create_returns_task_specs_on_other_success_statuses(
+        api_token, api_responses, task_specs, daily_task_params, task_base_url
+):
+    api_responses.add(
+        responses.POST, url=task_base_url, status=200, body=json.dumps(task_specs)
+    )
+
+    assert Schedule().create(daily_task_params) == task_specs
+
+
 def test_raises_because_missing_params(api_token, api_responses, task_base_url):
     body = (
         '{"interval":["This field is required."],"command":["This field is required."],'
@@ -111,6 +124,12 @@ def test_deletes_task(api_token, api_responses, task_base_url):
     assert result is True
 
 
+def test_delete_returns_true_on_other_success_statuses(api_token, api_responses, task_base_url):
+    api_responses.add(responses.DELETE, url=f"{task_base_url}42/", status=200)
+
+    assert Schedule().delete(42) is True
+
+
 def test_raises_because_attempt_to_delete_nonexisting_task(api_token, api_responses, task_base_url):
     body = '{"detail": "Not fount."}'
     api_responses.add(
@@ -137,6 +156,31 @@ def test_returns_spec_dict(api_token, api_responses, task_base_url, task_specs):
     assert Schedule().get_specs(123) == task_specs
 
 
+def test_parses_expiry_date_of_task(api_token, api_responses, task_base_url, task_specs):
+    task_specs["expiry"] = "2025-10-16"
+    api_responses.add(responses.GET, url=task_base_url, status=200, body=json.dumps([task_specs]))
+
+    assert Schedule().get_list()[0]["expiry"] == date(2025, 10, 16)
+
+
+def test_iter_tasks_yields_models(api_token, api_responses, task_base_url, task_specs):
+    api_responses.add(responses.GET, url=task_base_url, status=200, body=json.dumps([task_specs]))
+
+    tasks = list(Schedule().iter_tasks())
+
+    assert tasks == [ScheduledTask.from_dict(task_specs)]
+    assert tasks[0].command == "echo foo"
+
+
+def test_iter_tasks_raises_when_tasks_cannot_be_listed(api_token, api_responses, task_base_url):
+    api_responses.add(responses.GET, url=task_base_url, status=500, body="nope")
+
+    with pytest.raises(PythonAnywhereApiException) as e:
+        list(Schedule().iter_tasks())
+
+    assert "GET to list tasks failed, got nope" in str(e.value)
+
+
 def test_raises_because_attempt_to_get_nonexisting_task(api_token, api_responses, task_base_url):
     body = '{"detail":"Not found."}'
     api_responses.add(
@@ -186,3 +230,149 @@ def test_raises_when_wrong_params(
         Schedule().update(1, {"hour": 23})
 
     assert str(e.value) == f"Could not update task 1. Got <Response [400]>: {body}"
+
+
+@pytest.fixture
+def existing_tasks(task_specs):
+    return [
+        {**task_specs, "id": 1, "command": "echo unchanged", "interval": "daily", "hour": 16, "minute": 0},
+        {**task_specs, "id": 2, "command": "echo changed", "interval": "daily", "hour": 16, "minute": 0},
+        {**task_specs, "id": 3, "command": "echo gone", "interval": "daily", "hour": 16, "minute": 0},
+    ]
+
+
+@pytest.fixture
+def desired_tasks():
+    return [
+        {"command": "echo unchanged", "enabled": True, "interval": "daily", "hour": 16, "minute": 0},
+        {"command": "echo changed", "enabled": True, "interval": "daily", "hour": 3, "minute": 30},
+        {"command": "echo new", "enabled": True, "interval": "hourly", "minute": 5},
+    ]
+
+
+def test_diff_matches_tasks_by_command(api_token, api_responses, task_base_url, existing_tasks, desired_tasks):
+    api_responses.add(responses.GET, url=task_base_url, status=200, body=json.dumps(existing_tasks))
+
+    result = Schedule().diff(desired_tasks)
+
+    assert result == {
+        "create": [desired_tasks[2]],
+        "update": {2: {"hour": 3, "minute": 30}},
+        "delete": [3],
+    }
+
+
+def test_diff_keeps_unmatched_tasks_unless_delete_missing(
+        api_token, api_responses, task_base_url, existing_tasks, desired_tasks
+):
+    api_responses.add(responses.GET, url=task_base_url, status=200, body=json.dumps(existing_tasks))
+
+    assert Schedule().diff(desired_tasks, delete_missing=False)["delete"] == []
+
+
+def test_diff_raises_on_duplicated_commands(api_token):
+    with pytest.raises(ValueError) as e:
+        Schedule().diff([{"command": "echo foo"}, {"command": "echo foo"}])
+
+    assert "echo foo" in str(e.value)
+
+
+def test_sync_dry_run_does_not_change_anything(
+        api_token, api_responses, task_base_url, existing_tasks, desired_tasks
+):
+    api_responses.add(responses.GET, url=task_base_url, status=200, body=json.dumps(existing_tasks))
+
+    result = Schedule().sync(desired_tasks, dry_run=True)
+
+    assert result["failures"] == {}
+    assert len(api_responses.calls) == 1
+
+
+def test_sync_applies_only_needed_changes(
+        api_token, api_responses, task_base_url, task_specs, existing_tasks, desired_tasks
+):
+    api_responses.add(responses.GET, url=task_base_url, status=200, body=json.dumps(existing_tasks))
+    api_responses.add(responses.POST, url=task_base_url, status=201, body=json.dumps(task_specs))
+    api_responses.add(responses.PATCH, url=f"{task_base_url}2/", status=200, body=json.dumps(task_specs))
+    api_responses.add(responses.DELETE, url=f"{task_base_url}3/", status=400, body="nope")
+
+    result = Schedule().sync(desired_tasks)
+
+    assert list(result["failures"]) == [("delete", 3)]
+    assert isinstance(result["failures"][("delete", 3)], PythonAnywhereApiException)
+    patch = [call for call in api_responses.calls if call.request.method == "PATCH"][0]
+    assert json.loads(patch.request.body) == {"hour": 3, "minute": 30}
+    assert len(api_responses.calls) == 4
+
+
+def test_create_many_reports_result_per_task(
+        api_token, api_responses, task_specs, daily_task_params, task_base_url
+):
+    api_responses.add(responses.POST, url=task_base_url, status=201, body=json.dumps(task_specs))
+    api_responses.add(responses.POST, url=task_base_url, status=400, body="nope")
+
+    result = Schedule().create_many([daily_task_params, daily_task_params], max_workers=1)
+
+    assert result[0] == task_specs
+    assert isinstance(result[1], PythonAnywhereApiException)
+
+
+def test_create_many_resumes_from_journal(
+        api_token, api_responses, task_specs, daily_task_params, task_base_url, tmp_path
+):
+    tasks = [daily_task_params, {**daily_task_params, "hour": 17, "expiry": date(2025, 10, 16)}]
+    api_responses.add(responses.POST, url=task_base_url, status=201, body=json.dumps(task_specs))
+    api_responses.add(responses.POST, url=task_base_url, status=400, body="nope")
+    journal = OperationJournal(tmp_path / "create.journal")
+    Schedule().create_many(tasks, max_workers=1, journal=journal)
+    api_responses.replace(responses.POST, url=task_base_url, status=201, body=json.dumps(task_specs))
+
+    result = Schedule().create_many(tasks, max_workers=1, journal=journal)
+    changed = Schedule().create_many([{**daily_task_params, "hour": 18}], journal=journal)
+
+    assert result == {1: task_specs}
+    assert changed == {0: task_specs}
+    assert len(api_responses.calls) == 4
+
+
+def test_set_enabled_many_patches_every_task(api_token, api_responses, task_base_url, task_specs):
+    for task_id in (1, 2):
+        api_responses.add(
+            responses.PATCH, url=f"{task_base_url}{task_id}/", status=200, body=json.dumps(task_specs)
+        )
+    api_responses.add(responses.PATCH, url=f"{task_base_url}3/", status=404, body="nope")
+
+    result = Schedule().set_enabled_many([1, 2, 3], enabled=False)
+
+    assert result[1] == task_specs
+    assert result[2] == task_specs
+    assert isinstance(result[3], PythonAnywhereApiException)
+    assert all(json.loads(call.request.body) == {"enabled": False} for call in api_responses.calls)
+
+
+def test_delete_many_reports_result_per_task(api_token, api_responses, task_base_url):
+    api_responses.add(responses.DELETE, url=f"{task_base_url}1/", status=204)
+    api_responses.add(responses.DELETE, url=f"{task_base_url}2/", status=404, body="nope")
+
+    result = Schedule().delete_many([1, 2])
+
+    assert result[1] is True
+    assert "DELETE via API on task 2 failed" in str(result[2])
+
+
+@pytest.mark.parametrize("expiry", ["2025-10-16", None])
+def test_sync_round_trips_unchanged_tasks_without_patching(
+        api_token, api_responses, task_base_url, existing_tasks, expiry
+):
+    existing_tasks = [{**task, "expiry": "2025-10-16"} for task in existing_tasks]
+    api_responses.add(responses.GET, url=task_base_url, status=200, body=json.dumps(existing_tasks))
+    api_responses.add(responses.GET, url=task_base_url, status=200, body=json.dumps(existing_tasks))
+    fields = ("command", "enabled", "interval", "hour", "minute", "expiry")
+    desired = [{field: task[field] for field in fields} for task in Schedule().get_list()]
+    if expiry is not None:
+        desired = [{**task, "expiry": expiry} for task in desired]
+
+    result = Schedule().sync(desired)
+
+    assert result == {"create": [], "update": {}, "delete": [], "failures": {}}
+    assert len(api_responses.calls) == 2
@@ -0,0 +1,86 @@
+import getpass
+import json
+from datetime import datetime
+
+import pytest
+import responses
+
+from pythonanywhere_core.base import get_api_endpoint
+from pythonanywhere_core.schedule_planner import next_runs, plan_spread, spread_tasks, start_load
+
+
+@pytest.fixture
+def task_base_url():
+    return get_api_endpoint(username=getpass.getuser(), flavor="schedule")
+
+
+def daily(task_id, hour, minute, enabled=True):
+    return {"id": task_id, "interval": "daily", "hour": hour, "minute": minute, "enabled": enabled}
+
+
+def hourly(task_id, minute, enabled=True):
+    return {"id": task_id, "interval": "hourly", "hour": None, "minute": minute, "enabled": enabled}
+
+
+def test_next_runs_of_daily_task():
+    after = datetime(2025, 1, 1, 16, 30)
+
+    assert next_runs(daily(1, 16, 0), after, count=2) == [datetime(2025, 1, 2, 16, 0), datetime(2025, 1, 3, 16, 0)]
+    assert next_runs(daily(1, 17, 0), after) == [datetime(2025, 1, 1, 17, 0)]
+
+
+def test_next_runs_of_hourly_task():
+    after = datetime(2025, 1, 1, 23, 30)
+
+    assert next_runs(hourly(1, 15), after, count=2) == [datetime(2025, 1, 2, 0, 15), datetime(2025, 1, 2, 1, 15)]
+
+
+def test_next_runs_of_disabled_task_is_empty():
+    assert next_runs(daily(1, 16, 0, enabled=False), datetime(2025, 1, 1)) == []
+
+
+def test_start_load_counts_hourly_tasks_every_hour():
+    load = start_load([hourly(1, 0), daily(2, 3, 0), daily(3, 4, 0, enabled=False)])
+
+    assert load[0] == 1
+    assert load[3 * 60] == 2
+    assert load[4 * 60] == 1
+    assert sum(load.values()) == 25
+
+
+def test_plan_spread_spreads_hourly_tasks_over_the_hour():
+    plan = plan_spread([hourly(1, 0), hourly(2, 0), hourly(3, 0), hourly(4, 0)])
+
+    assert plan == {2: {"minute": 15}, 3: {"minute": 30}, 4: {"minute": 45}}
+
+
+def test_plan_spread_spreads_daily_tasks_over_the_day_avoiding_hourly_ones():
+    tasks = [hourly(1, 0)] + [daily(task_id, 0, 0) for task_id in range(2, 6)]
+
+    plan = plan_spread(tasks)
+
+    assert 1 not in plan
+    starts = [(plan.get(task_id, {}).get("hour", 0), plan.get(task_id, {}).get("minute", 0)) for task_id in range(2, 6)]
+    assert all(minute != 0 for _, minute in starts)
+    assert sorted(starts) == [(0, 1), (6, 1), (12, 1), (18, 1)]
+    assert max(start_load(tasks_with_plan(tasks, plan)).values()) == 1
+
+
+def tasks_with_plan(tasks, plan):
+    return [{**task, **plan.get(task["id"], {})} for task in tasks]
+
+
+def test_plan_spread_leaves_already_spread_tasks_alone():
+    assert plan_spread([daily(1, 0, 0), daily(2, 12, 0)]) == {}
+
+
+def test_spread_tasks_applies_plan(api_token, api_responses, task_base_url):
+    api_responses.add(
+        responses.GET, url=task_base_url, status=200, body=json.dumps([hourly(1, 0), hourly(2, 0)])
+    )
+    api_responses.add(responses.PATCH, url=f"{task_base_url}2/", status=200, body=json.dumps(hourly(2, 30)))
+
+    result = spread_tasks(apply=True)
+
+    assert result == {"plan": {2: {"minute": 30}}, "failures": {}}
+    assert json.loads(api_responses.calls[1].request.body) == {"minute": 30}
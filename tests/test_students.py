@@ -2,9 +2,12 @@ import getpass
 import json
 
 import pytest
+import requests
 import responses
 
-from pythonanywhere_core.base import get_api_endpoint
+from pythonanywhere_core.base import _iter_json_list_items, get_api_endpoint
+from pythonanywhere_core.exceptions import PythonAnywhereApiException
+from pythonanywhere_core.journal import OperationJournal
 from pythonanywhere_core.students import StudentsAPI
 
 
@@ -37,6 +40,39 @@ class TestStudentsAPIGet:
         assert StudentsAPI().get() == students
 
 
+class TestStudentsAPIIterStudents:
+    def test_yields_students(self, api_token, api_responses, students_base_url):
+        students = {"students": [{"username": "student1"}, {"username": "student2"}]}
+        api_responses.add(
+            responses.GET, url=students_base_url, status=200, body=json.dumps(students)
+        )
+
+        assert list(StudentsAPI().iter_students(chunk_size=7)) == students["students"]
+
+    def test_yields_nothing_when_there_are_no_students(self, api_token, api_responses, students_base_url):
+        api_responses.add(
+            responses.GET, url=students_base_url, status=200, body=json.dumps({"students": []})
+        )
+
+        assert list(StudentsAPI().iter_students()) == []
+
+    def test_raises_when_get_fails(self, api_token, api_responses, students_base_url):
+        api_responses.add(responses.GET, url=students_base_url, status=500, body="oops")
+
+        with pytest.raises(PythonAnywhereApiException) as e:
+            list(StudentsAPI().iter_students())
+
+        assert str(e.value) == "GET to list students failed, got oops"
+
+
+def test_iter_json_list_items_handles_items_split_across_chunks():
+    students = [{"username": "zo\u00eb", "nested": [1, 2]}, {"username": "b"}]
+    body = json.dumps({"students": students}, ensure_ascii=False).encode()
+    chunks = [body[i:i + 3] for i in range(0, len(body), 3)]
+
+    assert list(_iter_json_list_items(chunks, "students")) == students
+
+
 class TestStudentsAPIDelete:
     def test_returns_204_when_student_deleted(
         self, api_token, api_responses, students_base_url
@@ -61,3 +97,54 @@ class TestStudentsAPIDelete:
             f"DELETE to remove student {username!r} failed, got <Response [404]>"
         )
         assert str(e.value) == expected_error_msg
+
+
+class TestStudentsAPIDeleteMany:
+    def test_returns_result_for_every_student(
+        self, api_token, api_responses, students_base_url
+    ):
+        api_responses.add(responses.DELETE, url=f"{students_base_url}byebye", status=204)
+        api_responses.add(responses.DELETE, url=f"{students_base_url}notyourstudent", status=404)
+
+        result = StudentsAPI().delete_many(["byebye", "notyourstudent"])
+
+        assert result["byebye"] == 204
+        assert isinstance(result["notyourstudent"], PythonAnywhereApiException)
+
+    def test_skips_students_removed_according_to_journal(
+        self, api_token, api_responses, students_base_url, tmp_path
+    ):
+        journal = OperationJournal(tmp_path / "students.journal")
+        journal.record("byebye")
+        api_responses.add(responses.DELETE, url=f"{students_base_url}notyourstudent", status=204)
+
+        result = StudentsAPI().delete_many(["byebye", "notyourstudent"], journal=journal)
+
+        assert result == {"notyourstudent": 204}
+        assert journal.is_done("notyourstudent")
+
+
+def test_iter_json_list_items_skips_other_members_mentioning_key():
+    body = json.dumps({"kind": "students", "tags": ["x"], "count": 12345, "students": [{"username": "a"}, 7]}).encode()
+    chunks = [body[i:i + 2] for i in range(0, len(body), 2)]
+
+    assert list(_iter_json_list_items(chunks, "students")) == [{"username": "a"}, 7]
+
+
+def test_iter_json_list_items_raises_when_stream_is_truncated():
+    body = json.dumps({"students": [{"username": "a"}, {"username": "b"}]}).encode()
+    items = _iter_json_list_items([body[:-10]], "students")
+
+    assert next(items) == {"username": "a"}
+    with pytest.raises(PythonAnywhereApiException, match="ended before the end"):
+        next(items)
+
+
+def test_iter_students_closes_response_when_get_fails(api_token, api_responses, students_base_url, mocker):
+    api_responses.add(responses.GET, url=students_base_url, status=500, body="oops")
+    close = mocker.spy(requests.Response, "close")
+
+    with pytest.raises(PythonAnywhereApiException):
+        list(StudentsAPI().iter_students())
+
+    assert close.call_count == 1
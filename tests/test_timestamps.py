@@ -0,0 +1,36 @@
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from pythonanywhere_core.timestamps import parse_date, parse_datetime, parse_fields
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        ("2025-08-09T03:26:37", datetime(2025, 8, 9, 3, 26, 37)),
+        ("2018-08-24T17:16:23Z", datetime(2018, 8, 24, 17, 16, 23, tzinfo=timezone.utc)),
+        ("20180824T171623Z", datetime(2018, 8, 24, 17, 16, 23, tzinfo=timezone.utc)),
+        ("2018-08-24T17:16:23+02:00", datetime(2018, 8, 24, 17, 16, 23, tzinfo=timezone(timedelta(hours=2)))),
+        ("2018-08-24 17:16:23.123456", datetime(2018, 8, 24, 17, 16, 23, 123456)),
+    ]
+)
+def test_parse_datetime_handles_api_formats(value, expected):
+    assert parse_datetime(value) == expected
+
+
+def test_parse_datetime_falls_back_to_dateutil_for_other_formats():
+    assert parse_datetime("Aug 24 2018 17:16:23 UTC") == datetime(2018, 8, 24, 17, 16, 23, tzinfo=timezone.utc)
+
+
+def test_parse_date():
+    assert parse_date("2025-10-16") == date(2025, 10, 16)
+
+
+def test_parse_fields_leaves_missing_and_empty_fields_alone():
+    data = {"not_after": "2018-08-24T17:16:23Z", "expiry": None}
+
+    result = parse_fields(data, datetimes=["not_after", "other"], dates=["expiry"])
+
+    assert result is data
+    assert data == {"not_after": datetime(2018, 8, 24, 17, 16, 23, tzinfo=timezone.utc), "expiry": None}
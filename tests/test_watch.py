@@ -0,0 +1,103 @@
+import getpass
+import sys
+import threading
+import time
+
+import pytest
+import responses
+
+from pythonanywhere_core.base import get_api_endpoint
+from pythonanywhere_core.ignore import IgnoreRules
+from pythonanywhere_core.watch import InotifyWatcher, PollingWatcher, create_watcher, plan_sync, sync_changes, watch
+
+
+@pytest.fixture()
+def base_url():
+    return get_api_endpoint(username=getpass.getuser(), flavor="files")
+
+
+def test_plan_sync_uploads_files_and_collapses_deletions(tmp_path):
+    (tmp_path / "a.txt").write_text("a")
+    (tmp_path / "kept").mkdir()
+
+    uploads, deletes = plan_sync(
+        tmp_path, {"a.txt", "kept", "gone.txt", "old/deep/x.txt", "old/deep", "old/y.txt", "kept/z.txt"}
+    )
+
+    assert uploads == {"a.txt"}
+    assert deletes == {"gone.txt", "old", "kept/z.txt"}
+
+
+def test_polling_watcher_reports_created_changed_and_deleted_files(tmp_path):
+    (tmp_path / "a.txt").write_text("a")
+    (tmp_path / "b.txt").write_text("b")
+    watcher = PollingWatcher(tmp_path, rules=IgnoreRules(["*.log"]))
+
+    (tmp_path / "a.txt").write_text("changed")
+    (tmp_path / "b.txt").unlink()
+    (tmp_path / "c.txt").write_text("c")
+    (tmp_path / "debug.log").write_text("ignored")
+
+    assert watcher.poll(timeout=0) == {"a.txt", "b.txt", "c.txt"}
+    assert watcher.poll(timeout=0) == set()
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is only available on Linux")
+def test_inotify_watcher_reports_changes_in_new_directories(tmp_path):
+    watcher = InotifyWatcher(tmp_path, rules=IgnoreRules(["__pycache__/"]))
+
+    (tmp_path / "pkg" / "__pycache__").mkdir(parents=True)
+    (tmp_path / "pkg" / "__pycache__" / "m.pyc").write_text("ignored")
+    (tmp_path / "pkg" / "m.py").write_text("x = 1")
+    time.sleep(0.05)
+    changed = watcher.poll(timeout=1)
+    changed |= watcher.poll(timeout=0.1)
+    watcher.close()
+
+    assert changed == {"pkg/m.py"}
+
+
+def test_create_watcher_polls_without_trying_inotify_outside_linux(tmp_path, monkeypatch, mocker):
+    monkeypatch.setattr(sys, "platform", "win32")
+    cdll = mocker.patch("ctypes.CDLL")
+
+    assert isinstance(create_watcher(tmp_path), PollingWatcher)
+    cdll.assert_not_called()
+
+
+def test_sync_changes_mirrors_uploads_and_deletions(api_token, api_responses, base_url, tmp_path):
+    (tmp_path / "a.txt").write_text("a")
+    api_responses.add(responses.POST, url=f"{base_url}path/home/u/app/a.txt", status=200)
+    api_responses.add(responses.DELETE, url=f"{base_url}path/home/u/app/gone", status=204)
+    api_responses.add(responses.DELETE, url=f"{base_url}path/home/u/app/broken.txt", status=500)
+
+    result = sync_changes(tmp_path, "/home/u/app", {"a.txt", "gone/x.txt", "broken.txt"})
+
+    assert result["uploaded"] == ["a.txt"]
+    assert result["deleted"] == ["gone"]
+    assert list(result["failures"]) == [("delete", "broken.txt")]
+
+
+def test_watch_debounces_batches_and_reloads_webapp_once_per_batch(
+    api_token, api_responses, base_url, tmp_path, mocker
+):
+    (tmp_path / "a.txt").write_text("a")
+    (tmp_path / "b.txt").write_text("b")
+    api_responses.add(responses.POST, url=f"{base_url}path/home/u/app/a.txt", status=200)
+    api_responses.add(responses.POST, url=f"{base_url}path/home/u/app/b.txt", status=200)
+    watcher = mocker.Mock()
+    watcher.poll.side_effect = [set(), {"a.txt"}, {"b.txt"}, set(), {"a.txt"}, set()]
+    webapp = mocker.Mock()
+    stop = threading.Event()
+    batches = []
+
+    def on_batch(result):
+        batches.append(result)
+        if len(batches) == 2:
+            stop.set()
+
+    watch(str(tmp_path), "/home/u/app", webapp=webapp, stop_event=stop, on_batch=on_batch, watcher=watcher)
+
+    assert [batch["uploaded"] for batch in batches] == [["a.txt", "b.txt"], ["a.txt"]]
+    assert webapp.reload.call_count == 2
+    watcher.close.assert_called_once()
@@ -1,6 +1,6 @@
 import getpass
 import json
-from datetime import datetime
+from datetime import date, datetime
 from pathlib import Path
 
 import pytest
@@ -10,6 +10,7 @@ from urllib.parse import urlencode
 
 from pythonanywhere_core.base import get_api_endpoint, PYTHON_VERSIONS
 from pythonanywhere_core.exceptions import SanityException, PythonAnywhereApiException, MissingCNAMEException
+from pythonanywhere_core.models import SSLInfo
 from pythonanywhere_core.webapp import Webapp
 
 
@@ -277,20 +278,130 @@ def test_create_static_file_mapping_posts_correctly(api_token, api_responses, do
     }
 
 
+def test_create_static_file_mapping_raises_if_post_does_not_20x(api_token, api_responses, domain_url, webapp):
+    api_responses.add(responses.POST, f"{domain_url}static_files/", status=400, body="bad path")
+
+    with pytest.raises(PythonAnywhereApiException) as e:
+        webapp.create_static_file_mapping("/assets/", "/project/assets")
+
+    assert "POST to create static file mapping /assets/ via API failed" in str(e.value)
+    assert "bad path" in str(e.value)
+
+
+# STATIC FILE MAPPINGS
+## /api/v0/user/{username}/webapps/{domain_name}/static_files/ : GET
+## /api/v0/user/{username}/webapps/{domain_name}/static_files/{id}/ : PATCH, DELETE
+
+def test_get_static_file_mappings_returns_list(api_token, api_responses, domain_url, webapp):
+    mappings = [{"id": 1, "url": "/static/", "path": "/project/static"}]
+    api_responses.add(responses.GET, f"{domain_url}static_files/", status=200, body=json.dumps(mappings))
+
+    assert webapp.get_static_file_mappings() == mappings
+
+
+def test_update_static_file_mapping_patches_mapping_url(api_token, api_responses, domain_url, webapp):
+    mapping = {"id": 1, "url": "/static/", "path": "/new/static"}
+    api_responses.add(responses.PATCH, f"{domain_url}static_files/1/", status=200, body=json.dumps(mapping))
+
+    assert webapp.update_static_file_mapping(1, "/static/", Path("/new/static")) == mapping
+    assert json.loads(api_responses.calls[0].request.body) == {"url": "/static/", "path": "/new/static"}
+
+
+def test_delete_static_file_mapping_raises_if_delete_fails(api_token, api_responses, domain_url, webapp):
+    api_responses.add(responses.DELETE, f"{domain_url}static_files/1/", status=404, body="nope")
+
+    with pytest.raises(PythonAnywhereApiException) as e:
+        webapp.delete_static_file_mapping(1)
+
+    assert "DELETE static file mapping 1 via API failed" in str(e.value)
+
+
+def test_ensure_static_file_mappings_only_applies_differences(api_token, api_responses, domain_url, webapp):
+    static_files_url = f"{domain_url}static_files/"
+    existing = [
+        {"id": 1, "url": "/static/", "path": "/project/static"},
+        {"id": 2, "url": "/media/", "path": "/old/media"},
+        {"id": 3, "url": "/stale/", "path": "/project/stale"},
+    ]
+    api_responses.add(responses.GET, static_files_url, status=200, body=json.dumps(existing))
+    api_responses.add(responses.PATCH, f"{static_files_url}2/", status=200, body=json.dumps({}))
+    api_responses.add(responses.POST, static_files_url, status=201, body=json.dumps({}))
+    api_responses.add(responses.DELETE, f"{static_files_url}3/", status=204)
+
+    result = webapp.ensure_static_file_mappings(
+        {"/static/": Path("/project/static"), "/media/": Path("/project/media"), "/assets/": Path("/project/assets")},
+        prune=True,
+    )
+
+    assert result == {"/static/": "unchanged", "/media/": "updated", "/assets/": "created", "/stale/": "deleted"}
+    assert len(api_responses.calls) == 4
+
+
+def test_ensure_static_file_mappings_deletes_duplicated_mappings(api_token, api_responses, domain_url, webapp):
+    static_files_url = f"{domain_url}static_files/"
+    existing = [
+        {"id": 1, "url": "/static/", "path": "/old/static"},
+        {"id": 2, "url": "/static/", "path": "/project/static"},
+        {"id": 3, "url": "/static/", "path": "/project/static"},
+        {"id": 4, "url": "/media/", "path": "/old/media"},
+        {"id": 5, "url": "/media/", "path": "/older/media"},
+        {"id": 6, "url": "/stale/", "path": "/project/stale"},
+        {"id": 7, "url": "/stale/", "path": "/project/stale"},
+    ]
+    api_responses.add(responses.GET, static_files_url, status=200, body=json.dumps(existing))
+    api_responses.add(responses.PATCH, f"{static_files_url}4/", status=200, body=json.dumps({}))
+    for mapping_id in (1, 3, 5, 6, 7):
+        api_responses.add(responses.DELETE, f"{static_files_url}{mapping_id}/", status=204)
+
+    result = webapp.ensure_static_file_mappings(
+        {"/static/": Path("/project/static"), "/media/": Path("/project/media")}, prune=True
+    )
+
+    assert result == {"/static/": "updated", "/media/": "updated", "/stale/": "deleted"}
+    assert sorted((call.request.method, call.request.url) for call in api_responses.calls[1:]) == [
+        ("DELETE", f"{static_files_url}{mapping_id}/") for mapping_id in (1, 3, 5, 6, 7)
+    ] + [("PATCH", f"{static_files_url}4/")]
+
+
+def test_ensure_static_file_mappings_reports_failures_without_stopping(api_token, api_responses, domain_url, webapp):
+    static_files_url = f"{domain_url}static_files/"
+    api_responses.add(
+        responses.GET,
+        static_files_url,
+        status=200,
+        body=json.dumps([{"id": 2, "url": "/media/", "path": "/old/media"}]),
+    )
+    api_responses.add(responses.PATCH, f"{static_files_url}2/", status=500, body="oops")
+    api_responses.add(responses.POST, static_files_url, status=201, body=json.dumps({}))
+
+    result = webapp.ensure_static_file_mappings({"/static/": "/project/static", "/media/": "/project/media"})
+
+    assert result["/static/"] == "created"
+    assert isinstance(result["/media/"], PythonAnywhereApiException)
+
+
 def test_adds_default_static_files_mappings(mocker, webapp):
-    mock_create = mocker.patch.object(webapp, "create_static_file_mapping")
+    mock_ensure = mocker.patch.object(webapp, "ensure_static_file_mappings")
+    mock_ensure.return_value = {"/static/": "created", "/media/": "unchanged"}
 
     project_path = "/directory/path"
     webapp.add_default_static_files_mappings(project_path)
 
-    mock_create.assert_has_calls(
-        [
-            mocker.call("/static/", Path(project_path) / "static"),
-            mocker.call("/media/", Path(project_path) / "media"),
-        ]
+    mock_ensure.assert_called_once_with(
+        {"/static/": Path(project_path) / "static", "/media/": Path(project_path) / "media"}
     )
 
 
+def test_add_default_static_files_mappings_raises_on_failures(mocker, webapp):
+    mock_ensure = mocker.patch.object(webapp, "ensure_static_file_mappings")
+    mock_ensure.return_value = {"/static/": "created", "/media/": PythonAnywhereApiException("boom")}
+
+    with pytest.raises(PythonAnywhereApiException) as e:
+        webapp.add_default_static_files_mappings("/directory/path")
+
+    assert "/media/: boom" in str(e.value)
+
+
 # RELOAD
 ## /api/v0/user/{username}/webapps/{domain_name}/reload/ : POST
 
@@ -365,6 +476,20 @@ def test_raises_if_post_to_ssl_does_not_20x(api_responses, api_token, ssl_url, w
 # GET SSL INFO
 ## /api/v0/user/{username}/webapps/{domain_name}/ssl/ : GET
 
+def test_get_ssl_info_model_decodes_expiry_when_accessed(api_responses, api_token, ssl_url, webapp):
+    api_responses.add(
+        responses.GET,
+        ssl_url,
+        status=200,
+        body=json.dumps({"not_after": "20180824T171623Z", "issuer_name": "Let's Encrypt"}),
+    )
+
+    info = webapp.get_ssl_info_model()
+
+    assert info == SSLInfo(issuer_name="Let's Encrypt", _not_after="20180824T171623Z")
+    assert info.not_after == datetime(2018, 8, 24, 17, 16, 23, tzinfo=tzutc())
+
+
 def test_returns_json_from_server_having_parsed_expiry_with_z_for_utc_and_no_separators(
     api_responses, api_token, ssl_url, webapp
 ):
@@ -537,6 +662,14 @@ def test_list_webapps_returns_list(api_responses, api_token, base_url):
     assert result == webapps_data
 
 
+def test_list_webapps_passes_timeout(api_responses, api_token, base_url):
+    api_responses.add(responses.GET, base_url, status=200, body="[]")
+
+    Webapp.list_webapps(timeout=(2, 7))
+
+    assert api_responses.calls[0].request.req_kwargs["timeout"] == (2, 7)
+
+
 def test_list_webapps_raises_on_error(api_responses, api_token, base_url):
     api_responses.add(
         responses.GET,
@@ -550,6 +683,15 @@ def test_list_webapps_raises_on_error(api_responses, api_token, base_url):
     assert "server error" in str(e.value)
 
 
+def test_iter_webapps_yields_models(api_responses, api_token, base_url, webapp_info):
+    api_responses.add(responses.GET, base_url, status=200, body=json.dumps([webapp_info]))
+
+    webapps = list(Webapp.iter_webapps())
+
+    assert [info.domain_name for info in webapps] == [webapp_info["domain_name"]]
+    assert webapps[0].expiry == date(2025, 10, 16)
+
+
 # GET
 ## /api/v0/user/{username}/webapps/{domain_name}/
 
@@ -1,5 +1,6 @@
 import getpass
 import json
+from datetime import datetime, timezone
 
 import pytest
 import responses
@@ -64,14 +65,14 @@ def test_create_returns_json_with_created_website_info(
     api_responses.add(
         responses.POST, url=websites_base_url, status=201, body=json.dumps(website_info)
     )
-    expected_request_body = json.dumps(
-        {"domain_name": domain_name, "enabled": True, "webapp": {"command": command}}
-    ).encode()
+    expected_request_body = {"domain_name": domain_name, "enabled": True, "webapp": {"command": command}}
 
     result = Website().create(domain_name=domain_name, command=command)
 
     assert result == website_info
-    assert api_responses.calls[0].request.body == expected_request_body, (
+    request = api_responses.calls[0].request
+    assert request.headers["Content-Type"] == "application/json"
+    assert json.loads(request.body) == expected_request_body, (
         "POST to create needs the payload to be passed as json field"
     )
 
@@ -133,6 +134,20 @@ def test_list_returns_json_with_info_for_all_websites(api_responses, websites_ba
     assert Website().list() == [website_info]
 
 
+def test_iter_websites_yields_models(api_responses, websites_base_url, website_info, command):
+    api_responses.add(
+        responses.GET,
+        url=websites_base_url,
+        status=200,
+        body=json.dumps([website_info])
+    )
+
+    websites = list(Website().iter_websites())
+
+    assert [website.id for website in websites] == [42]
+    assert websites[0].command == command
+
+
 def test_reloads_website(api_responses, domain_name, websites_base_url):
     api_responses.add(
         responses.POST,
@@ -170,6 +185,20 @@ def test_sets_lets_encrypt_cert(api_responses, domain_name, domains_base_url):
     }
 
 
+def test_raises_if_lets_encrypt_cert_does_not_20x(api_responses, domain_name, domains_base_url):
+    api_responses.add(
+        responses.POST,
+        url=f"{domains_base_url}{domain_name}/ssl/",
+        status=400, body="nope"
+    )
+
+    with pytest.raises(PythonAnywhereApiException) as e:
+        Website().auto_ssl(domain_name=domain_name)
+
+    assert "POST to apply Let's Encrypt certificate via API failed, got" in str(e.value)
+    assert "nope" in str(e.value)
+
+
 def test_returns_ssl_info(api_responses, domain_name, domains_base_url):
     api_responses.add(
         responses.GET,
@@ -181,6 +210,33 @@ def test_returns_ssl_info(api_responses, domain_name, domains_base_url):
     assert Website().get_ssl_info(domain_name=domain_name) == {"status": "OK"}
 
 
+def test_returns_ssl_info_having_parsed_expiry(api_responses, domain_name, domains_base_url):
+    api_responses.add(
+        responses.GET,
+        url=f"{domains_base_url}{domain_name}/ssl/",
+        body=json.dumps({"not_after": "2018-08-24T17:16:23Z"}),
+        status=200
+    )
+
+    assert Website().get_ssl_info(domain_name=domain_name) == {
+        "not_after": datetime(2018, 8, 24, 17, 16, 23, tzinfo=timezone.utc)
+    }
+
+
+def test_returns_ssl_info_model(api_responses, domain_name, domains_base_url):
+    api_responses.add(
+        responses.GET,
+        url=f"{domains_base_url}{domain_name}/ssl/",
+        body=json.dumps({"not_after": "20180824T171623Z", "cert_type": "letsencrypt-auto-renew"}),
+        status=200
+    )
+
+    info = Website().get_ssl_info_model(domain_name=domain_name)
+
+    assert info.cert_type == "letsencrypt-auto-renew"
+    assert info.not_after == datetime(2018, 8, 24, 17, 16, 23, tzinfo=timezone.utc)
+
+
 def test_raises_if_ssl_info_does_not_return_200(api_responses, domain_name, domains_base_url):
     api_responses.add(
         responses.GET,